@@ -1,27 +1,29 @@
 # backend/app.py
 from datetime import datetime, timezone
-from flask_limiter.util import get_remote_address
-from flask_limiter import Limiter
 from flask_cors import CORS
 from flask import Flask, jsonify
+import logging
 import os
 import sys
+import time
 
 # Add the project root to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 sys.path.insert(0, project_root)
 
-
-try:
-    from config import settings
-    print("✅ Config imported successfully!")
-except ImportError as e:
-    print(f"❌ Config import failed: {e}")
-    sys.exit(1)
+logger = logging.getLogger(__name__)
 
 
 def create_app():
+    started = time.perf_counter()
+    try:
+        from config import get_settings
+        settings = get_settings()
+    except ImportError as e:
+        logger.critical(f"Config import failed: {e}")
+        sys.exit(1)
+
     app = Flask(__name__)
     app.config['SECRET_KEY'] = settings.SECRET_KEY
 
@@ -34,21 +36,21 @@ def create_app():
          methods=["GET", "POST", "OPTIONS"]
          )
 
-    # Rate limiting
-    limiter = Limiter(
-        get_remote_address,
-        app=app,
-        default_limits=["200 per day", "50 per hour"],
-        storage_uri="memory://"
-    )
+    # Rate limiting (one subsystem for every route, see backend/rate_limit.py)
+    from backend import rate_limit
+    rate_limit.init_app(app)
+
+    from src.utils.process_pool import configure_process_pool
+    configure_process_pool(settings.PROCESS_POOL_WORKERS)
 
-    # Import and register blueprints
+    # Import and register blueprints (services load on first request)
     try:
         from backend.routes.analytics import analytics_bp
         app.register_blueprint(analytics_bp, url_prefix='/api/v1/analytics')
-        print("✅ Analytics routes registered!")
+        from backend.routes.webhooks import webhooks_bp
+        app.register_blueprint(webhooks_bp, url_prefix='/api/v1/webhooks')
     except ImportError as e:
-        print(f"⚠️  Could not register analytics routes: {e}")
+        logger.warning(f"Could not register analytics routes: {e}")
 
     # Add CORS headers to all responses
     # @app.after_request
@@ -71,20 +73,64 @@ def create_app():
             "endpoints": {
                 "health": "/health",
                 "user_analysis": "/api/v1/analytics/profile/<username>",
-                "compare_users": "/api/v1/analytics/compare"
+                "compare_users": "/api/v1/analytics/compare",
+                "leaderboard": "/api/v1/analytics/leaderboard?metric=<metric>&language=<language>",
+                "user_rankings": "/api/v1/analytics/rankings/<username>",
+                "activity_heatmap": "/api/v1/analytics/heatmap/<username>?days=<days>"
             }
         })
 
     @app.route('/health')
-    @limiter.exempt
+    @rate_limit.exempt
     def health():
-        return jsonify({"status": "healthy", "service": "github-analytics"})
+        status = {"status": "healthy", "service": "github-analytics"}
+        # Only report the circuit once the analytics services have loaded
+        state = sys.modules.get("backend.state")
+        if state is not None:
+            status["github"] = state.circuit_breaker.snapshot()
+            status["scheduler"] = state.request_scheduler.snapshot()
+            if status["github"]["state"] != "closed":
+                status["status"] = "degraded"
+        from backend.sharding import get_cluster
+        if get_cluster().enabled:
+            status["cluster"] = get_cluster().snapshot()
+        return jsonify(status)
 
-    app.limiter = limiter
+    app.config['STARTUP_SECONDS'] = time.perf_counter() - started
+    logger.info(f"App created in {app.config['STARTUP_SECONDS'] * 1000:.0f} ms")
 
     return app
 
 
+def warm_up():
+    """Import the analytics services and shared state ahead of the first request
+
+    create_app() leaves them to be loaded lazily to keep cold starts short;
+    a preloading server master can call this once so forked workers inherit
+    everything already imported.
+    """
+    from backend.routes import handlers  # noqa: F401
+    from backend.state import ranking_index  # noqa: F401
+
+
+def init_worker():
+    """Per-process setup for a freshly forked server worker (gunicorn post_fork)"""
+    from config import settings
+    from src.utils.process_pool import configure_process_pool, reset_process_pool
+
+    reset_process_pool()
+    configure_process_pool(settings.PROCESS_POOL_WORKERS)
+
+
+def shutdown_worker():
+    """Release per-process resources when a server worker exits"""
+    from src.utils.process_pool import shutdown_process_pool
+
+    shutdown_process_pool()
+    from backend.state import ranking_index
+    ranking_index.save()
+
+
 # if __name__ == '__main__':
 #     print("🚀 Starting GitHub Analytics Pro API...")
 #     print("📍 API URL: http://localhost:5000")
@@ -0,0 +1,273 @@
+# backend/asgi.py
+"""
+ASGI entry point serving the analytics API with native async handlers
+
+    uvicorn backend.asgi:app --host 0.0.0.0 --port 5000
+
+Unlike the Flask app, which starts a fresh event loop per request, this
+app keeps one event loop, one pooled HTTP client and the shared caches
+for the lifetime of the process, so a single worker can keep hundreds
+of GitHub-bound analyses in flight at once.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+from backend import http_cache  # noqa: E402
+from backend.rate_limit import COMPARE_LIMIT, PROFILE_LIMIT, check_limits  # noqa: E402
+from backend.routes import handlers  # noqa: E402
+from backend.sharding import get_cluster  # noqa: E402
+from backend.state import circuit_breaker, new_client, ranking_index, request_scheduler  # noqa: E402
+from config import settings  # noqa: E402
+from src.client.github_client import create_http_pool  # noqa: E402
+
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/analytics"
+
+ALLOWED_ORIGINS = {"http://localhost:5173",
+                   "http://127.0.0.1:5173", "http://localhost:3000"}
+
+
+class Request:
+    """The parts of an ASGI HTTP scope the handlers need"""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes,
+                 path_params: Dict[str, str]):
+        self.scope = scope
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        self.headers = {k.decode().lower(): v.decode()
+                        for k, v in scope.get("headers", [])}
+        self.body = body
+        self.path_params = path_params
+
+    def json(self) -> Any:
+        try:
+            return json.loads(self.body or b"null")
+        except ValueError:
+            return None
+
+
+Route = Tuple[str, "re.Pattern[str]", Callable[["AnalyticsASGI", Request], Any],
+              Optional[List[str]], Optional[int]]
+
+
+class AnalyticsASGI:
+    """Minimal ASGI application mirroring backend.app.create_app routes"""
+
+    def __init__(self):
+        self.client = None
+        self.routes: List[Route] = []
+        self._add("GET", "/", self.home)
+        self._add("GET", "/health", self.health, limits=None)
+        self._add("GET", API_PREFIX + "/profile/<username>",
+                  lambda app, r: handlers.analyze_profile(
+                      r.path_params["username"], app.github(), r.args, background=True),
+                  limits=[PROFILE_LIMIT], max_age=http_cache.PROFILE_MAX_AGE)
+        self._add("POST", API_PREFIX + "/compare",
+                  lambda app, r: handlers.compare_users(r.json(), app.github()),
+                  limits=[COMPARE_LIMIT])
+        self._add("GET", API_PREFIX + "/leaderboard",
+                  lambda app, r: handlers.leaderboard(r.args),
+                  max_age=settings.RANKINGS_CACHE_TTL)
+        self._add("GET", API_PREFIX + "/rankings/<username>",
+                  lambda app, r: handlers.user_rankings(r.path_params["username"]),
+                  max_age=settings.RANKINGS_CACHE_TTL)
+        self._add("GET", API_PREFIX + "/heatmap/<username>",
+                  lambda app, r: handlers.activity_heatmap(
+                      r.path_params["username"], app.github(), r.args),
+                  limits=[PROFILE_LIMIT], max_age=settings.ACTIVITY_REFRESH_SECONDS)
+        self._add("POST", "/api/v1/webhooks/github",
+                  lambda app, r: handlers.github_webhook(r.headers, r.body), limits=None)
+        self._add("GET", API_PREFIX + "/minimal/<username>",
+                  lambda app, r: handlers.minimal_test(r.path_params["username"], app.github()))
+
+    def _add(self, method: str, path: str, handler,
+             limits: Optional[List[str]] = (), max_age: Optional[int] = None) -> None:
+        """Register a route; `limits` of None exempts it from rate limiting
+
+        `max_age` makes successful responses cacheable (ETag, 304s and
+        Cache-Control); without it they are sent with no-store.
+        """
+        pattern = re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path)
+        self.routes.append((method, re.compile(f"^{pattern}$"), handler,
+                            None if limits is None else list(limits), max_age))
+
+    def github(self):
+        """Client bound to the process-wide connection pool"""
+        if self.client is None:
+            self.client = new_client(http_client=create_http_pool(
+                settings.GITHUB_MAX_CONNECTIONS))
+        return self.client
+
+    async def startup(self) -> None:
+        self.github()
+        logger.info("ASGI analytics app started")
+
+    async def shutdown(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        ranking_index.save()
+
+    def home(self, app, request):
+        return {
+            "message": "GitHub Analytics Pro API 🚀",
+            "version": "1.0.0",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "endpoints": {
+                "health": "/health",
+                "user_analysis": API_PREFIX + "/profile/<username>",
+                "compare_users": API_PREFIX + "/compare",
+                "leaderboard": API_PREFIX + "/leaderboard?metric=<metric>&language=<language>",
+                "user_rankings": API_PREFIX + "/rankings/<username>",
+                "activity_heatmap": API_PREFIX + "/heatmap/<username>?days=<days>"
+            }
+        }, 200
+
+    def health(self, app, request):
+        github = circuit_breaker.snapshot()
+        status = {"status": "healthy" if github["state"] == "closed" else "degraded",
+                  "service": "github-analytics", "github": github,
+                  "scheduler": request_scheduler.snapshot()}
+        if get_cluster().enabled:
+            status["cluster"] = get_cluster().snapshot()
+        return status, 200
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send) -> None:
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        origin = dict(scope.get("headers", [])).get(b"origin", b"").decode()
+        if scope["method"] == "OPTIONS":
+            await self._send(send, None, 204, origin)
+            return
+        head = scope["method"] == "HEAD"
+
+        route, params, allowed = self._match(scope["method"], scope["path"])
+        if route is None:
+            status = 405 if allowed else 404
+            error = "Method not allowed" if allowed else "Not found"
+            await self._send(send, {"error": error}, status, origin, head=head)
+            return
+        _, pattern, handler, limits, max_age = route
+
+        request = Request(scope, body, params)
+        headers = request.headers
+        cluster = get_cluster()
+        extra_headers: Dict[str, str] = {}
+        if limits is not None and not cluster.is_forwarded(headers):
+            client_id = (scope.get("client") or ("127.0.0.1", 0))[0]
+            # The shared counters may be a Redis round trip away
+            permitted, extra_headers = await asyncio.to_thread(
+                check_limits, client_id, pattern.pattern, limits)
+            if not permitted:
+                await self._send(send, {"error": "Rate limit exceeded, try again later"},
+                                 429, origin, extra_headers, head=head)
+                return
+
+        owner = cluster.remote_owner(scope["path"], headers)
+        if owner is not None:
+            query = scope.get("query_string", b"").decode()
+            proxied = await cluster.aproxy(
+                owner, scope["path"] + (f"?{query}" if query else ""), headers)
+            if proxied is not None:
+                status, response_headers, response_body = proxied
+                await self._send_body(send, status, {**response_headers, **extra_headers},
+                                      response_body, origin, head=head)
+                return
+
+        try:
+            result = handler(self, request)
+            if inspect.isawaitable(result):
+                result = await result
+            payload, status, *version = result
+        except Exception as e:
+            logger.exception(f"Unhandled error for {scope['path']}: {e}")
+            payload, status, version = {"error": "Internal server error"}, 500, []
+        await self._send(send, payload, status, origin, extra_headers,
+                         request_headers=headers, max_age=max_age, head=head,
+                         version=version[0] if version else None)
+
+    def _match(self, method: str, path: str):
+        allowed = False
+        for route in self.routes:
+            route_method, pattern = route[0], route[1]
+            match = pattern.match(path)
+            if match:
+                if route_method == method or (method == "HEAD" and route_method == "GET"):
+                    return route, match.groupdict(), True
+                allowed = True
+        return None, {}, allowed
+
+    async def _send(self, send, payload: Optional[Any], status: int,
+                    origin: str = "", extra_headers: Optional[Dict[str, str]] = None,
+                    request_headers: Optional[Dict[str, str]] = None,
+                    max_age: Optional[int] = None, head: bool = False,
+                    version: Optional[str] = None) -> None:
+        if payload is None:
+            body, response_headers = b"", {"Content-Type": "application/json"}
+        else:
+            status, response_headers, body = http_cache.build_response(
+                payload, status, request_headers or {}, max_age, version)
+        await self._send_body(send, status, {**response_headers, **(extra_headers or {})},
+                              body, origin, head)
+
+    async def _send_body(self, send, status: int, response_headers: Dict[str, str],
+                         body: bytes, origin: str = "", head: bool = False) -> None:
+        """Send a response; HEAD gets the GET headers (length included) but no body"""
+        headers = [(b"content-length", str(len(body)).encode())]
+        headers += [(k.lower().encode(), v.encode())
+                    for k, v in response_headers.items()]
+        if origin in ALLOWED_ORIGINS:
+            headers += [
+                (b"access-control-allow-origin", origin.encode()),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-allow-headers", b"Content-Type, Authorization"),
+                (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+            ]
+        await send({"type": "http.response.start", "status": status,
+                    "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+def create_asgi_app() -> AnalyticsASGI:
+    return AnalyticsASGI()
+
+
+app = create_asgi_app()
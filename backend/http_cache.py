@@ -0,0 +1,184 @@
+# backend/http_cache.py
+"""
+Validators, Cache-Control and compression shared by the Flask and ASGI apps
+
+Bodies are serialised deterministically so the same analysis always
+yields the same bytes and therefore the same strong ETag; routes that
+know their payload's version derive the ETag from it instead and answer
+revalidations without serialising anything. Each encoding
+is its own representation with its own ETag, and compressed bodies of
+cacheable responses are kept in a small LRU keyed by that ETag so a hot
+profile is compressed once rather than on every hit.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+# Smaller bodies are not worth the CPU (or the extra header bytes)
+MIN_COMPRESS_BYTES = 1024
+
+_COMPRESSORS = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6),
+}
+if brotli is not None:
+    _COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+# Server preference when the client accepts several with equal weight
+_PREFERENCE = ("br", "gzip")
+
+# Profiles change on webhooks and `?since=` polls must reach the server, so
+# clients keep them but revalidate every time (a 304 costs no serialising)
+PROFILE_MAX_AGE = 0
+
+
+def serialize(payload: Any) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+
+def strong_etag(body: bytes, encoding: Optional[str] = None) -> str:
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported content-coding from Accept-Encoding, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    best, best_weight = None, 0.0
+    for coding in _PREFERENCE:
+        if coding not in _COMPRESSORS:
+            continue
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by representation ETag, bounded in bytes"""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, etag: str, body: bytes, encoding: str) -> bytes:
+        with self._lock:
+            cached = self._bodies.get(etag)
+            if cached is not None:
+                self._bodies.move_to_end(etag)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        compressed = _COMPRESSORS[encoding](body)
+        if len(compressed) > self.max_bytes:
+            return compressed
+        with self._lock:
+            if etag not in self._bodies:
+                self._bodies[etag] = compressed
+                self._size += len(compressed)
+                while self._size > self.max_bytes:
+                    _, evicted = self._bodies.popitem(last=False)
+                    self._size -= len(evicted)
+        return compressed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._bodies), "bytes": self._size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def _not_modified(headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+    return 304, {k: headers[k] for k in ("ETag", "Cache-Control", "Vary")}, b""
+
+
+def build_response(payload: Any, status: int, request_headers: Mapping[str, str],
+                   max_age: Optional[int] = None,
+                   version: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Status, headers and body for a JSON payload
+
+    `max_age` marks the route as cacheable: successful responses get an
+    ETag and `Cache-Control: public, max-age=...`, and a matching
+    If-None-Match turns into an empty 304. A `max_age` of 0 (and any
+    stale, degraded payload) is sent as `no-cache`: stored, but
+    revalidated on every use. Errors and non-cacheable routes are never
+    stored.
+
+    A `version` that identifies the payload (e.g. the stored version of a
+    profile plus the request options that shape it) stands in for the
+    body in the ETag, so revalidating costs neither serialisation nor
+    hashing. Whether the body would be compressed is not known before
+    serialising, so a validator for either representation is accepted.
+    """
+    headers = {"Content-Type": "application/json", "Vary": "Accept-Encoding"}
+    cacheable = max_age is not None and status == 200
+    stale = isinstance(payload, dict) and payload.get("stale")
+    cache_control = "no-cache" if stale or not max_age else f"public, max-age={max_age}"
+
+    if cacheable and version is not None:
+        if_none_match = request_headers.get("if-none-match")
+        for candidate in (negotiate_encoding(request_headers.get("accept-encoding")), None):
+            etag = strong_etag(version.encode(), candidate)
+            if etag_matches(if_none_match, etag):
+                return _not_modified({**headers, "ETag": etag, "Cache-Control": cache_control})
+
+    body = serialize(payload)
+    encoding = None
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+
+    if cacheable:
+        etag = strong_etag(version.encode() if version is not None else body, encoding)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = cache_control
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            return _not_modified(headers)
+    else:
+        headers["Cache-Control"] = "no-store"
+
+    if encoding:
+        if cacheable:
+            body = compressed_bodies.get_or_compress(headers["ETag"], body, encoding)
+        else:
+            body = _COMPRESSORS[encoding](body)
+        headers["Content-Encoding"] = encoding
+
+    return status, headers, body
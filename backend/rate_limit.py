@@ -0,0 +1,110 @@
+# backend/rate_limit.py
+"""The API's single rate-limiting subsystem
+
+Every worker shares counters through the configured storage
+(RATE_LIMIT_BACKEND=redis uses REDIS_URL) and keeps a local token lease
+in front of it. All endpoints get RATE_LIMIT_PER_HOUR per client unless
+marked exempt; routes can add tighter limits with @limit.
+"""
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from flask import jsonify, request
+
+from backend.sharding import get_cluster
+from src.utils.rate_limiter import RateLimiter, create_rate_limit_storage
+
+
+# Per-route limits, applied on top of RATE_LIMIT_PER_HOUR
+PROFILE_LIMIT = "10 per minute"
+COMPARE_LIMIT = "5 per minute"
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> RateLimiter:
+    from config import settings
+
+    return RateLimiter(create_rate_limit_storage(
+        settings.RATE_LIMIT_BACKEND, settings.REDIS_URL))
+
+
+@lru_cache(maxsize=None)
+def default_limit() -> str:
+    from config import settings
+
+    return f"{settings.RATE_LIMIT_PER_HOUR} per hour"
+
+
+def check_limits(client_id: str, scope: str,
+                 specs: List[str]) -> Tuple[bool, Dict[str, str]]:
+    """Apply the default limit plus `specs`; returns (allowed, headers)"""
+    headers: Dict[str, str] = {}
+    checks = [("global", default_limit())] + [(scope, spec) for spec in specs]
+    limiter = get_rate_limiter()
+    tightest = None
+    for check_scope, spec in checks:
+        result = limiter.hit(f"{check_scope}:{client_id}", spec)
+        if not result.allowed:
+            return False, {
+                "Retry-After": str(int(result.reset_after) + 1),
+                "X-RateLimit-Limit": str(result.limit),
+                "X-RateLimit-Remaining": "0",
+            }
+        if tightest is None or result.remaining < tightest.remaining:
+            tightest = result
+    if tightest:
+        headers = {
+            "X-RateLimit-Limit": str(tightest.limit),
+            "X-RateLimit-Remaining": str(tightest.remaining),
+        }
+    return True, headers
+
+
+def _client_id() -> str:
+    return request.remote_addr or "127.0.0.1"
+
+
+def _too_many(headers: Dict[str, str]):
+    response = jsonify({"error": "Rate limit exceeded, try again later"})
+    response.status_code = 429
+    response.headers.update(headers)
+    return response
+
+
+def limit(*specs: str):
+    """Add per-route limits (e.g. "10 per minute") on top of the default"""
+    def decorator(view):
+        view._rate_limits = list(specs)
+        return view
+    return decorator
+
+
+def exempt(view):
+    """Skip rate limiting for a route"""
+    view._rate_limit_exempt = True
+    return view
+
+
+def init_app(app) -> None:
+    """Enforce limits for every request handled by `app`"""
+
+    @app.before_request
+    def _enforce():
+        view = app.view_functions.get(request.endpoint)
+        if view is None or getattr(view, "_rate_limit_exempt", False):
+            return None
+        if get_cluster().is_forwarded(request.headers):
+            return None  # already limited by the node that forwarded it
+        allowed, headers = check_limits(
+            _client_id(), request.endpoint, getattr(view, "_rate_limits", []))
+        request.rate_limit_headers = headers
+        if not allowed:
+            return _too_many(headers)
+        return None
+
+    @app.after_request
+    def _headers(response):
+        response.headers.update(getattr(request, "rate_limit_headers", {}))
+        return response
+
+    app.limiter = get_rate_limiter
@@ -1,153 +1,92 @@
 import asyncio
 import logging
-import traceback
-from flask import Blueprint, jsonify, request
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+from flask import Blueprint, Response, request
 
-
-# Import services
-try:
-    from src.client.github_client import AsyncGitHubClient
-    from src.services.advanced_analytics import AdvancedAnalyticsService
-    from src.services.working_analytics_service import WorkingAnalyticsService as AnalyticsService
-    # from src.services.simple_service import SimpleAnalyticsService as AnalyticsService
-    # from src.services.analytics_service import AnalyticsService
-    from src.utils.validators import validate_username
-except ImportError as e:
-    print(f"Warning: Could not import analytics modules: {e}")
+from backend import http_cache, rate_limit
+from backend.sharding import get_cluster
+from config import get_settings
 
 
 logger = logging.getLogger(__name__)
 analytics_bp = Blueprint('analytics', __name__)
 
-# Initialize limiter for this blueprint
-analytics_limiter = Limiter(
-    get_remote_address,
-    default_limits=["10 per minute"],
-    storage_uri="memory://"
-)
+
+def _handlers():
+    """Services, client and shared state load on the first analytics request"""
+    from backend.routes import handlers
+    return handlers
+
+
+def _client():
+    from backend.state import new_client
+    return new_client()
+
+
+@analytics_bp.before_request
+def _route_to_owner():
+    """Proxy per-user routes to the node owning the user (see backend/sharding.py)"""
+    cluster = get_cluster()
+    owner = cluster.remote_owner(request.path, request.headers)
+    if owner is None:
+        return None
+    query = request.query_string.decode()
+    proxied = cluster.proxy(owner, request.path + (f"?{query}" if query else ""),
+                            request.headers)
+    if proxied is None:
+        return None
+    status, headers, body = proxied
+    return Response(body, status=status, headers=headers)
+
+
+def _respond(result, max_age=None):
+    """JSON response with ETag/304, Cache-Control and negotiated compression"""
+    payload, status, *version = result
+    status, headers, body = http_cache.build_response(
+        payload, status, request.headers, max_age, *version)
+    return Response(body, status=status, headers=headers)
 
 
 @analytics_bp.route('/profile/<username>')
-@analytics_limiter.limit("10 per minute")
+@rate_limit.limit(rate_limit.PROFILE_LIMIT)
 def analyze_profile(username):
     """Analyze a GitHub user profile with the working service"""
-    print(f"🎯 Backend: Starting WORKING analysis for {username}")
-
-    # Input validation
-    if not username or len(username) > 39:
-        return jsonify({"error": "Invalid username"}), 400
-
-    try:
-        async def perform_analysis():
-            print(
-                f"🔍 Backend: Creating client and WORKING service for {username}")
-            client = AsyncGitHubClient()
-            service = AnalyticsService(client)
-            print(
-                f"🚀 Backend: Starting WORKING analysis service for {username}")
-            result = await service.get_comprehensive_analysis(username)
-            print(f"✅ Backend: WORKING analysis completed for {username}")
-            return result
-
-        print(f"🔄 Backend: Running async analysis for {username}")
-        analysis = asyncio.run(perform_analysis())
-        print(f"📦 Backend: Analysis result ready for {username}")
-
-        return jsonify({
-            "success": True,
-            "data": analysis.dict()
-        })
-
-    except Exception as e:
-        print(f"💥 Backend: ERROR in WORKING analysis for {username}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-
-        error_message = str(e)
-        if "not found" in error_message.lower():
-            return jsonify({"error": f"GitHub user '{username}' not found"}), 404
-        elif "rate limit" in error_message.lower():
-            return jsonify({"error": "GitHub API rate limit exceeded"}), 429
-        else:
-            return jsonify({"error": f"Analysis failed: {error_message}"}), 500
+    return _respond(asyncio.run(
+        _handlers().analyze_profile(username, _client(), request.args)),
+        max_age=http_cache.PROFILE_MAX_AGE)
 
 
 @analytics_bp.route('/compare', methods=["POST"])
-@analytics_limiter.limit("5 per minute")
+@rate_limit.limit(rate_limit.COMPARE_LIMIT)
 def compare_users():
     """Compare multiple GitHub users"""
-    data = request.get_json()
-
-    if not data or 'usernames' not in data:
-        return jsonify({"error": "Missing 'usernames' array in request body"}), 400
-
-    usernames = data['usernames']
-    if len(usernames) > 5:
-        return jsonify({"error": "Maximum 5 users can be compared"}), 400
-    if len(usernames) < 2:
-        return jsonify({"error": "At least 2 usernames required"}), 400
-
-    try:
-        async def compare_all():
-            client = AsyncGitHubClient()
-            service = AnalyticsService(client)
-
-            # Analyse all users concurrently
-            tasks = [service.analyze_single_repository(
-                username) for username in usernames]
-            return await asyncio.gather(*tasks, return_exceptions=True)
-
-        comparisons = asyncio.run(compare_all())
-
-        comparison_data = []
-        for i, result in enumerate(comparisons):
-            if isinstance(result, Exception):
-                comparison_data.append({
-                    "username": usernames[i],
-                    "success": False,
-                    "error": str(result)
-                })
-            else:
-                comparison_data.append({
-                    "username": usernames[i],
-                    "success": True,
-                    "data": result.model_dump()
-                })
-
-        return jsonify({
-            "success": True,
-            "comparisons": comparison_data
-        })
-    except Exception as e:
-        logger.error(f"Error comparing users: {e}")
-        return jsonify({"error": "Comparison failed"}), 500
-
-
-# Add this to backend/routes/analytics.py
+    data = request.get_json(silent=True)
+    return _respond(asyncio.run(_handlers().compare_users(data, _client())))
+
+
+@analytics_bp.route('/leaderboard')
+def leaderboard():
+    """Top users for a score, globally or within a primary language"""
+    return _respond(_handlers().leaderboard(request.args),
+                    max_age=get_settings().RANKINGS_CACHE_TTL)
+
+
+@analytics_bp.route('/rankings/<username>')
+def user_rankings(username):
+    """Percentile of every score for an already analysed user"""
+    return _respond(_handlers().user_rankings(username),
+                    max_age=get_settings().RANKINGS_CACHE_TTL)
+
+
+@analytics_bp.route('/heatmap/<username>')
+@rate_limit.limit(rate_limit.PROFILE_LIMIT)
+def activity_heatmap(username):
+    """Contribution heatmap built from the user's public events"""
+    return _respond(asyncio.run(
+        _handlers().activity_heatmap(username, _client(), request.args)),
+        max_age=get_settings().ACTIVITY_REFRESH_SECONDS)
+
+
 @analytics_bp.route('/minimal/<username>')
 def minimal_test(username):
     """Minimal test that should definitely work"""
-    print(f"🧪 MINIMAL TEST for {username}")
-
-    try:
-        async def minimal_analysis():
-            client = AsyncGitHubClient()
-
-            # Just test basic GitHub API calls
-            user_data = await client.get_user_profile(username)
-            return {
-                "success": True,
-                "username": user_data.get('login'),
-                "name": user_data.get('name'),
-                "followers": user_data.get('followers'),
-                "public_repos": user_data.get('public_repos')
-            }
-
-        result = asyncio.run(minimal_analysis())
-        return jsonify(result)
-
-    except Exception as e:
-        print(f"💥 MINIMAL TEST failed: {e}")
-        return jsonify({"error": f"Minimal test failed: {str(e)}"}), 500
+    return _respond(asyncio.run(_handlers().minimal_test(username, _client())))
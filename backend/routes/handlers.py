@@ -0,0 +1,346 @@
+# backend/routes/handlers.py
+"""Framework-independent analytics handlers
+
+Each handler takes already-parsed request data plus an AsyncGitHubClient
+and returns a (payload, status) tuple, or (payload, status, version) when
+a version string identifies the payload and can stand in for the body in
+its ETag. The Flask blueprint runs them with asyncio.run per request; the
+ASGI app awaits them on its own loop with a client that lives for the
+whole process.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple, Union
+
+from backend.sharding import get_cluster
+from backend.state import (activity_cache, github_cache, missing_users, profile_cache,
+                           profile_versions, ranking_index, stale_profile_cache)
+from config import settings
+from src.client.scheduler import Priority, request_priority
+from src.exceptions import CircuitOpenError, RateLimitExceeded, RepositoryNotFound, UserNotFound
+from src.services.activity_heatmap import HEATMAP_DAYS, EventIngestor
+from src.services.comparison_service import (
+    FULL_SECTIONS, ComparisonService, cache_profile, get_cached_entry, profile_cache_key)
+from src.services.ranking_index import RANKED_METRICS
+from src.services.webhooks import WebhookProcessor, verify_signature
+from src.services.working_analytics_service import WorkingAnalyticsService as AnalyticsService
+from src.services.working_analytics_service import (
+    ANALYSIS_DEPTHS, resolve_sections, select_sections)
+from src.utils.validators import validate_username
+
+
+logger = logging.getLogger(__name__)
+
+Response = Union[Tuple[Dict[str, Any], int], Tuple[Dict[str, Any], int, str]]
+
+
+def _int_arg(args: Mapping[str, str], name: str, default: int) -> int:
+    try:
+        return int(args.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _analytics_service(client, enrichment_budget: int = None) -> AnalyticsService:
+    return AnalyticsService(
+        client,
+        enrichment_budget=(settings.ENRICHMENT_BUDGET if enrichment_budget is None
+                           else enrichment_budget),
+        enrichment_candidates=settings.ENRICHMENT_CANDIDATES,
+    )
+
+
+# Strong references so background enrichment is not garbage collected mid-flight
+_background_tasks = set()
+
+
+async def _enrich_later(username: str, client, sections: FrozenSet[str]) -> None:
+    """Finish the repositories the request budget deferred and refresh the cache"""
+    try:
+        service = _analytics_service(client, settings.ENRICHMENT_CANDIDATES)
+        with request_priority(Priority.PREFETCH):
+            result = await service.get_comprehensive_analysis(username, sections)
+        await remember_profile(username, result.model_dump(mode="json"), sections)
+        logger.info(f"Lazy enrichment finished for {username}")
+    except Exception as e:
+        logger.warning(f"Lazy enrichment failed for {username}: {e}")
+
+
+def _sections_arg(args: Mapping[str, Any]) -> FrozenSet[str]:
+    """`fields=languages,repositories` or `depth=summary|standard|full`"""
+    return resolve_sections(args.get('depth'), args.get('fields'))
+
+
+async def remember_profile(username: str, data: Dict[str, Any],
+                           sections: FrozenSet[str] = FULL_SECTIONS) -> str:
+    """Store a fresh analysis in the caches and the ranking index; returns its version"""
+    key = profile_cache_key(username, sections)
+    version = await cache_profile(profile_cache, username, sections, data,
+                                  ttl=settings.PROFILE_CACHE_TTL)
+    await profile_versions.record(key, data, version)
+    await stale_profile_cache.set(key, {
+        "data": data,
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+    }, ttl=settings.STALE_PROFILE_TTL)
+    ranking_index.record(data)
+    return version
+
+
+def _profile_response(delta: Dict[str, Any], sections: FrozenSet[str]) -> Response:
+    """The profile payload plus the version its ETag is derived from"""
+    fields = sorted(sections)
+    etag_version = f"{delta['version']}:{'+'.join(fields)}:{delta.get('base', '')}"
+    return {"success": True, **delta, "fields": fields}, 200, etag_version
+
+
+async def _degraded(username: str, error: Exception,
+                    sections: FrozenSet[str] = FULL_SECTIONS) -> Optional[Response]:
+    """Last known good analysis, marked stale, when GitHub cannot be reached"""
+    if isinstance(error, (UserNotFound, RepositoryNotFound)):
+        return None
+    entry = await stale_profile_cache.get(profile_cache_key(username, sections))
+    if not entry and sections != FULL_SECTIONS:
+        entry = await stale_profile_cache.get(profile_cache_key(username))
+    if not entry:
+        return None
+    logger.warning(f"Serving stale analysis for {username}: {error}")
+    return {
+        "success": True,
+        "data": select_sections(entry["data"], sections),
+        "stale": True,
+        "cached_at": entry["cached_at"],
+        "degraded_reason": str(error),
+    }, 200
+
+
+async def analyze_profile(username: str, client, args: Mapping[str, str] = None,
+                          background: bool = False) -> Response:
+    """Analyze a GitHub user profile with the working service
+
+    Every response carries the profile's `version`. A client that sends
+    the last version it saw as `since` gets `patch`, a JSON Patch against
+    that version, instead of `data` while the version is still retained.
+
+    With `background` (the event loop outlives the request), repositories
+    beyond the enrichment budget are fetched afterwards and the cached
+    profile is refreshed; otherwise later requests pick them up, since
+    already cached languages do not count against the budget.
+    """
+    logger.debug(f"Profile requested for {username}")
+
+    # Input validation: malformed names never reach the caches or GitHub
+    error = validate_username(username)
+    if error:
+        return {"error": error}, 400
+    try:
+        sections = _sections_arg(args or {})
+    except ValueError as e:
+        return {"error": str(e), "depths": list(ANALYSIS_DEPTHS)}, 400
+
+    since = (args or {}).get('since')
+    versions_key = profile_cache_key(username, sections)
+
+    try:
+        cached = await get_cached_entry(profile_cache, username, sections)
+        if cached:
+            logger.debug(f"Serving cached analysis for {username}")
+            delta = await profile_versions.delta(
+                versions_key, cached["data"], since, cached["version"])
+            return _profile_response(delta, sections)
+
+        service = _analytics_service(client)
+        result = await service.get_comprehensive_analysis(username, sections)
+        logger.info(f"Analysis completed for {username}")
+        data = result.model_dump(mode="json")
+        version = await remember_profile(username, data, sections)
+
+        if background and data["metrics"].get("enrichment", {}).get("deferred"):
+            task = asyncio.create_task(_enrich_later(username, client, sections))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+        delta = await profile_versions.delta(versions_key, data, since, version)
+        return _profile_response(delta, sections)
+
+    except Exception as e:
+        if isinstance(e, (UserNotFound, RepositoryNotFound)):
+            # Routine (often scraper) traffic: no traceback
+            logger.info(f"Analysis of {username}: {e}")
+        elif isinstance(e, (CircuitOpenError, RateLimitExceeded)):
+            logger.warning(f"Analysis failed for {username}: {e}")
+        else:
+            logger.exception(f"Analysis failed for {username}: {e}")
+
+        degraded = await _degraded(username, e, sections)
+        if degraded:
+            return degraded
+
+        error_message = str(e)
+        if isinstance(e, CircuitOpenError):
+            return {"error": error_message}, 503
+        elif "not found" in error_message.lower():
+            return {"error": f"GitHub user '{username}' not found"}, 404
+        elif "rate limit" in error_message.lower():
+            return {"error": "GitHub API rate limit exceeded"}, 429
+        else:
+            return {"error": f"Analysis failed: {error_message}"}, 500
+
+
+async def compare_users(data: Any, client) -> Response:
+    """Compare multiple GitHub users"""
+    if not isinstance(data, dict) or not isinstance(data.get('usernames'), list):
+        return {"error": "Missing 'usernames' array in request body"}, 400
+
+    usernames = data['usernames']
+    if len(usernames) > settings.COMPARE_MAX_USERS:
+        return {"error": f"Maximum {settings.COMPARE_MAX_USERS} users can be compared"}, 400
+    if len(usernames) < 2:
+        return {"error": "At least 2 usernames required"}, 400
+
+    for username in usernames:
+        error = validate_username(username) if isinstance(
+            username, str) else "Username must be a string"
+        if error:
+            return {"error": f"{error}: {username!r}"}, 400
+    try:
+        sections = _sections_arg(data)
+    except ValueError as e:
+        return {"error": str(e), "depths": list(ANALYSIS_DEPTHS)}, 400
+
+    cluster = get_cluster()
+    try:
+        comparison = ComparisonService(
+            _analytics_service(client),
+            profile_cache,
+            concurrency=settings.COMPARE_CONCURRENCY,
+            user_timeout=settings.COMPARE_USER_TIMEOUT,
+            request_timeout=settings.COMPARE_REQUEST_TIMEOUT,
+            cache_ttl=settings.PROFILE_CACHE_TTL,
+            ranking_index=ranking_index,
+            process_threshold=settings.COMPARE_PROCESS_THRESHOLD,
+            stale_cache=stale_profile_cache,
+            stale_ttl=settings.STALE_PROFILE_TTL,
+            sections=sections,
+            remote_profile=cluster.remote_profile if cluster.enabled else None,
+            profile_versions=profile_versions,
+        )
+        with request_priority(Priority.COMPARE):
+            result = await comparison.compare(usernames)
+        return {"success": True, **result}, 200
+    except Exception as e:
+        logger.error(f"Error comparing users: {e}")
+        return {"error": "Comparison failed"}, 500
+
+
+def _ranking_scope() -> Dict[str, Any]:
+    """With sharding on, each node ranks only the users it owns"""
+    cluster = get_cluster()
+    if not cluster.enabled:
+        return {}
+    return {"scope": "shard", "shard": cluster.self_url,
+            "shards": len(cluster.ring.nodes)}
+
+
+def leaderboard(args: Mapping[str, str]) -> Response:
+    """Top users for a score, globally or within a primary language"""
+    metric = args.get('metric', 'community_impact')
+    language = args.get('language') or None
+    limit = _int_arg(args, 'limit', 10)
+
+    if metric not in RANKED_METRICS:
+        return {"error": f"Unknown metric '{metric}'",
+                "metrics": list(RANKED_METRICS)}, 400
+    if not 1 <= limit <= 100:
+        return {"error": "limit must be between 1 and 100"}, 400
+
+    return {
+        "success": True,
+        "metric": metric,
+        "language": language,
+        "total": ranking_index.size(language),
+        "leaderboard": ranking_index.leaderboard(metric, language, limit),
+        **_ranking_scope(),
+    }, 200
+
+
+def user_rankings(username: str) -> Response:
+    """Percentile of every score for an already analysed user"""
+    rankings = ranking_index.rankings(username)
+    if rankings is None:
+        return {"error": f"'{username}' has not been analysed yet"}, 404
+
+    return {"success": True, "data": rankings, **_ranking_scope()}, 200
+
+
+async def activity_heatmap(username: str, client, args: Mapping[str, str]) -> Response:
+    """Daily contribution counts from the user's public GitHub events"""
+    error = validate_username(username)
+    if error:
+        return {"error": error}, 400
+    days = _int_arg(args, 'days', 365)
+    if not 1 <= days <= HEATMAP_DAYS:
+        return {"error": f"days must be between 1 and {HEATMAP_DAYS}"}, 400
+    event_types = [t for t in args.get('types', '').split(',') if t] or None
+
+    ingestor = EventIngestor(client, activity_cache,
+                             ttl=settings.ACTIVITY_RETENTION,
+                             refresh_seconds=settings.ACTIVITY_REFRESH_SECONDS)
+    try:
+        buckets = await ingestor.ingest(username)
+    except UserNotFound:
+        return {"error": f"GitHub user '{username}' not found"}, 404
+    except RateLimitExceeded:
+        return {"error": "GitHub API rate limit exceeded"}, 429
+    except CircuitOpenError as e:
+        return {"error": str(e)}, 503
+    except Exception as e:
+        logger.error(f"Error ingesting events for {username}: {e}")
+        return {"error": f"Heatmap failed: {e}"}, 500
+
+    return {"success": True, "username": username,
+            "data": buckets.heatmap(days, event_types)}, 200
+
+
+async def github_webhook(headers: Mapping[str, str], body: bytes) -> Response:
+    """Apply a GitHub webhook delivery to the cached payloads and profiles"""
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        return {"error": "Webhooks are not configured"}, 503
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body,
+                            headers.get('x-hub-signature-256')):
+        return {"error": "Invalid signature"}, 401
+
+    event = headers.get('x-github-event', '')
+    try:
+        payload = json.loads(body or b"null")
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        return {"error": "Webhook body must be a JSON object"}, 400
+
+    processor = WebhookProcessor(github_cache, profile_cache, missing_users)
+    result = await processor.handle(event, payload)
+    return {"success": True, "delivery": headers.get('x-github-delivery'), **result}, 200
+
+
+async def minimal_test(username: str, client) -> Response:
+    """Minimal test that should definitely work"""
+    error = validate_username(username)
+    if error:
+        return {"error": error}, 400
+
+    try:
+        # Just test basic GitHub API calls
+        user_data = await client.get_user_profile(username)
+        return {
+            "success": True,
+            "username": user_data.get('login'),
+            "name": user_data.get('name'),
+            "followers": user_data.get('followers'),
+            "public_repos": user_data.get('public_repos')
+        }, 200
+
+    except Exception as e:
+        logger.warning(f"Minimal test failed for {username}: {e}")
+        return {"error": f"Minimal test failed: {str(e)}"}, 500
@@ -0,0 +1,19 @@
+import asyncio
+from flask import Blueprint, Response, request
+
+from backend import http_cache, rate_limit
+
+
+webhooks_bp = Blueprint('webhooks', __name__)
+
+
+@webhooks_bp.route('/github', methods=["POST"])
+@rate_limit.exempt
+def github_webhook():
+    """GitHub webhook deliveries (push, star, fork, repository)"""
+    from backend.routes import handlers
+
+    payload, status = asyncio.run(
+        handlers.github_webhook(request.headers, request.get_data()))
+    status, headers, body = http_cache.build_response(payload, status, request.headers)
+    return Response(body, status=status, headers=headers)
@@ -0,0 +1,216 @@
+# backend/sharding.py
+"""
+Username sharding across API nodes
+
+With CLUSTER_NODES listing the base URL of every node (this one included,
+as CLUSTER_SELF), each username belongs to one owner node on a consistent
+hash ring. Per-user routes that arrive anywhere else are proxied to the
+owner, and comparisons load other nodes' users from their owners, so every
+user is fetched from GitHub and cached by a single node.
+
+Forwarded requests carry a token derived from SECRET_KEY, which all nodes
+share. The receiving node serves them itself whatever its own view of the
+ring, so nodes that briefly disagree during a membership change cannot
+bounce a request around, and it skips the rate limits the forwarding node
+has already applied. If the owner cannot be reached the request is served
+locally. CLUSTER_NODES_FILE (one URL per line) changes membership without
+a restart; only the users on the joining or leaving node's arcs move.
+"""
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from src.exceptions import UserNotFound
+from src.utils.hash_ring import HashRing
+
+
+logger = logging.getLogger(__name__)
+
+# Routes whose work and caches belong to the user in the path
+SHARDED_PATH = re.compile(
+    r"^/api/v1/analytics/(?:profile|heatmap|rankings)/(?P<username>[^/]+)$")
+
+FORWARDED_HEADER = "X-Shard-Forwarded"
+SERVED_BY_HEADER = "X-Served-By"
+
+# Request headers passed to the owner, and response headers passed back
+_REQUEST_HEADERS = ("accept", "accept-encoding", "if-none-match")
+_RESPONSE_HEADERS = ("content-type", "content-encoding", "etag", "cache-control", "vary")
+
+ProxiedResponse = Tuple[int, Dict[str, str], bytes]
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    # Flask headers are case-insensitive, the ASGI app lowercases its keys
+    return headers.get(name) or headers.get(name.lower())
+
+
+def _parse_nodes(nodes: Iterable[str]) -> List[str]:
+    return [node.strip().rstrip("/") for node in nodes if node.strip()]
+
+
+class Cluster:
+    """This node's view of the ring and the forwarding to other owners"""
+
+    def __init__(self, self_url: str = "", nodes: Iterable[str] = (), vnodes: int = 160,
+                 secret: str = "", timeout: float = 30.0, nodes_file: Optional[str] = None):
+        self.self_url = self_url.rstrip("/")
+        self.ring = HashRing(_parse_nodes(nodes), vnodes)
+        self.token = hmac.new(secret.encode(), b"shard-forward", hashlib.sha256).hexdigest()
+        self.timeout = timeout
+        self.nodes_file = nodes_file
+        self._nodes_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.proxied = 0
+        self.proxy_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        self._reload()
+        return bool(self.self_url) and len(self.ring.nodes) > 1
+
+    def set_nodes(self, nodes: Iterable[str]) -> None:
+        """Join new nodes and drop missing ones, keeping every other point"""
+        wanted = _parse_nodes(nodes)
+        with self._lock:
+            for node in self.ring.nodes:
+                if node not in wanted:
+                    self.ring.remove(node)
+            for node in wanted:
+                self.ring.add(node)
+        logger.info(f"Cluster membership: {', '.join(wanted)}")
+
+    def _reload(self) -> None:
+        """Pick up CLUSTER_NODES_FILE edits, checking its mtime at most once a second"""
+        if not self.nodes_file or time.monotonic() - self._checked_at < 1.0:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.path.getmtime(self.nodes_file)
+            if mtime == self._nodes_mtime:
+                return
+            with open(self.nodes_file) as f:
+                nodes = [line for line in f if not line.lstrip().startswith("#")]
+        except OSError as e:
+            logger.warning(f"Cannot read {self.nodes_file}: {e}")
+            return
+        self._nodes_mtime = mtime
+        self.set_nodes(nodes)
+
+    def owner(self, username: str) -> Optional[str]:
+        with self._lock:
+            return self.ring.owner(username.lower())
+
+    def is_forwarded(self, headers: Mapping[str, str]) -> bool:
+        token = _header(headers, FORWARDED_HEADER)
+        return bool(token) and hmac.compare_digest(token, self.token)
+
+    def remote_owner(self, path: str, headers: Mapping[str, str]) -> Optional[str]:
+        """Owner to proxy this request to, or None to serve it here"""
+        if not self.enabled or self.is_forwarded(headers):
+            return None
+        match = SHARDED_PATH.match(path)
+        if not match:
+            return None
+        owner = self.owner(unquote(match.group("username")))
+        return owner if owner != self.self_url else None
+
+    def _forward_headers(self, headers: Mapping[str, str]) -> Dict[str, str]:
+        forwarded = {name: _header(headers, name) for name in _REQUEST_HEADERS}
+        forwarded = {name: value for name, value in forwarded.items() if value}
+        forwarded[FORWARDED_HEADER] = self.token
+        return forwarded
+
+    def _proxied(self, owner: str, status: int, headers, body: bytes) -> ProxiedResponse:
+        self.proxied += 1
+        passed = {name: headers[name] for name in _RESPONSE_HEADERS if name in headers}
+        passed[SERVED_BY_HEADER] = owner
+        return status, passed, body
+
+    def proxy(self, owner: str, path_qs: str,
+              headers: Mapping[str, str]) -> Optional[ProxiedResponse]:
+        """Relay a request to `owner` unchanged (body still compressed); None on failure"""
+        import httpx
+
+        try:
+            with httpx.stream("GET", owner + path_qs, headers=self._forward_headers(headers),
+                              timeout=self.timeout) as response:
+                body = b"".join(response.iter_raw())
+        except httpx.HTTPError as e:
+            self.proxy_failures += 1
+            logger.warning(f"Owner {owner} unreachable, serving {path_qs} locally: {e}")
+            return None
+        return self._proxied(owner, response.status_code, response.headers, body)
+
+    async def aproxy(self, owner: str, path_qs: str,
+                     headers: Mapping[str, str]) -> Optional[ProxiedResponse]:
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with client.stream("GET", owner + path_qs,
+                                         headers=self._forward_headers(headers)) as response:
+                    body = b"".join([chunk async for chunk in response.aiter_raw()])
+        except httpx.HTTPError as e:
+            self.proxy_failures += 1
+            logger.warning(f"Owner {owner} unreachable, serving {path_qs} locally: {e}")
+            return None
+        return self._proxied(owner, response.status_code, response.headers, body)
+
+    async def remote_profile(self, username: str,
+                             sections: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+        """A profile from its owner node; None if this node owns it or the owner fails"""
+        if not self.enabled:
+            return None
+        owner = self.owner(username)
+        if owner == self.self_url:
+            return None
+        import httpx
+
+        query = {"fields": ",".join(sorted(sections))} if sections else {"depth": "summary"}
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(
+                    f"{owner}/api/v1/analytics/profile/{quote(username)}", params=query,
+                    headers={FORWARDED_HEADER: self.token})
+        except httpx.HTTPError as e:
+            self.proxy_failures += 1
+            logger.warning(f"Owner {owner} unreachable, analysing {username} locally: {e}")
+            return None
+        if response.status_code == 404:
+            raise UserNotFound(f"GitHub user '{username}' not found")
+        if response.status_code != 200:
+            self.proxy_failures += 1
+            return None
+        self.proxied += 1
+        return response.json().get("data")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "self": self.self_url,
+            "nodes": self.ring.nodes,
+            "proxied": self.proxied,
+            "proxy_failures": self.proxy_failures,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_cluster() -> Cluster:
+    from config import settings
+
+    return Cluster(
+        self_url=settings.CLUSTER_SELF,
+        nodes=settings.CLUSTER_NODES.split(","),
+        vnodes=settings.CLUSTER_VNODES,
+        secret=settings.SECRET_KEY,
+        timeout=settings.CLUSTER_PROXY_TIMEOUT,
+        nodes_file=settings.CLUSTER_NODES_FILE or None,
+    )
@@ -0,0 +1,84 @@
+# backend/state.py
+"""Process-wide shared state used by both the Flask and ASGI entry points"""
+from config import settings
+from src.client.circuit_breaker import CircuitBreaker
+from src.client.github_client import AsyncGitHubClient
+from src.client.resilience import RetryPolicy
+from src.client.scheduler import RequestScheduler
+from src.services.profile_versions import ProfileVersions
+from src.services.ranking_index import RankingIndex
+from src.utils.cache import create_cache
+from src.utils.negative_cache import NegativeCache
+
+
+# Computed profiles and raw GitHub payloads shared across requests (and
+# across worker processes when CACHE_BACKEND=redis)
+profile_cache = create_cache(
+    "profiles", settings.CACHE_BACKEND, settings.REDIS_URL)
+github_cache = create_cache("github", settings.CACHE_BACKEND, settings.REDIS_URL)
+
+# Last known good profile per user, kept long after profile_cache expires,
+# served with a staleness marker while GitHub is unavailable
+stale_profile_cache = create_cache(
+    "profiles-stale", settings.CACHE_BACKEND, settings.REDIS_URL)
+
+# Last few versions of each computed profile, to answer `?since=` with a patch
+profile_versions = ProfileVersions(
+    create_cache("profile-versions", settings.CACHE_BACKEND, settings.REDIS_URL),
+    window=settings.PROFILE_VERSION_WINDOW, ttl=settings.PROFILE_VERSION_TTL)
+
+# Per-user day buckets of GitHub events, merged on every ingestion
+activity_cache = create_cache("activity", settings.CACHE_BACKEND, settings.REDIS_URL)
+
+# Usernames that do not exist on GitHub, so repeat lookups cost no quota;
+# shared like the caches above when CACHE_BACKEND=redis
+missing_users = NegativeCache(
+    ttl=settings.NEGATIVE_CACHE_TTL, max_entries=settings.NEGATIVE_CACHE_SIZE,
+    store=create_cache("missing-users", settings.CACHE_BACKEND, settings.REDIS_URL)
+    if settings.CACHE_BACKEND == "redis" else None)
+
+# Score distributions of every analysed user, for percentiles and leaderboards
+ranking_index = RankingIndex(settings.RANKING_INDEX_PATH or None)
+
+
+def _probe_github() -> bool:
+    """Cheap recovery check: /rate_limit does not count against the quota"""
+    import httpx
+
+    headers = {"User-Agent": "GitHub-Analytics-Pro/1.0"}
+    if settings.GITHUB_TOKEN:
+        headers["Authorization"] = f"Token {settings.GITHUB_TOKEN}"
+    response = httpx.get(f"{settings.GITHUB_BASE_URL}/rate_limit",
+                         headers=headers, timeout=5.0)
+    if response.status_code != 200:
+        return False
+    return response.json()["resources"]["core"]["remaining"] > 0
+
+
+circuit_breaker = CircuitBreaker(
+    failure_rate=settings.CIRCUIT_FAILURE_RATE,
+    slow_call_seconds=settings.CIRCUIT_SLOW_CALL_SECONDS,
+    open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+    probe=_probe_github,
+)
+
+# One queue for every client in the process: interactive requests go ahead
+# of comparisons, crawls and prefetching for both quota and connections
+request_scheduler = RequestScheduler(
+    max_concurrency=settings.GITHUB_MAX_CONNECTIONS,
+    latency_slo=settings.GITHUB_INTERACTIVE_SLO,
+    low_priority_share=settings.GITHUB_LOW_PRIORITY_SHARE,
+)
+
+
+def new_client(http_client=None) -> AsyncGitHubClient:
+    """GitHub client wired to the shared payload cache"""
+    return AsyncGitHubClient(token=settings.GITHUB_TOKEN, cache=github_cache,
+                             http_client=http_client,
+                             retry_policy=RetryPolicy(
+                                 max_retries=settings.GITHUB_MAX_RETRIES),
+                             hedge=settings.GITHUB_HEDGE_REQUESTS,
+                             breaker=circuit_breaker,
+                             cache_ttl=settings.GITHUB_CACHE_TTL,
+                             negative_cache=missing_users,
+                             scheduler=request_scheduler)
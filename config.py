@@ -1,10 +1,8 @@
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from dotenv import load_dotenv
-
-load_dotenv()
 
 
 class Settings(BaseSettings):
@@ -17,14 +15,82 @@ class Settings(BaseSettings):
     # GitHub API
     GITHUB_BASE_URL: str = "https://api.github.com"
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
+    # Retries for transient GitHub failures, and optional request hedging
+    GITHUB_MAX_RETRIES: int = int(os.getenv("GITHUB_MAX_RETRIES", 2))
+    GITHUB_HEDGE_REQUESTS: bool = os.getenv(
+        "GITHUB_HEDGE_REQUESTS", "False").lower() == "true"
+    # Circuit breaker around GitHub calls
+    CIRCUIT_FAILURE_RATE: float = float(os.getenv("CIRCUIT_FAILURE_RATE", 0.5))
+    CIRCUIT_SLOW_CALL_SECONDS: float = float(
+        os.getenv("CIRCUIT_SLOW_CALL_SECONDS", 10.0))
+    CIRCUIT_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_OPEN_SECONDS", 30.0))
+    # Pooled connections per process for the ASGI app
+    GITHUB_MAX_CONNECTIONS: int = int(os.getenv("GITHUB_MAX_CONNECTIONS", 100))
+    # Request scheduler: p95 latency (queue wait + response) interactive GitHub
+    # calls should stay under, and the share of slots bulk/prefetch work may hold
+    GITHUB_INTERACTIVE_SLO: float = float(os.getenv("GITHUB_INTERACTIVE_SLO", 2.0))
+    GITHUB_LOW_PRIORITY_SHARE: float = float(
+        os.getenv("GITHUB_LOW_PRIORITY_SHARE", 0.5))
+
+    # Username sharding: base URLs of every API node (comma separated) and the
+    # one this process answers on; empty disables it. CLUSTER_NODES_FILE, one
+    # URL per line, overrides CLUSTER_NODES and is re-read when it changes
+    CLUSTER_NODES: str = os.getenv("CLUSTER_NODES", "")
+    CLUSTER_SELF: str = os.getenv("CLUSTER_SELF", "")
+    CLUSTER_NODES_FILE: str = os.getenv("CLUSTER_NODES_FILE", "")
+    CLUSTER_VNODES: int = int(os.getenv("CLUSTER_VNODES", 160))
+    CLUSTER_PROXY_TIMEOUT: float = float(os.getenv("CLUSTER_PROXY_TIMEOUT", 30.0))
 
     # Redis for caching and rate limiting
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # "memory" (per process) or "redis" (shared by all workers)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    # "memory" (per process) or "redis" (limits shared by all workers)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+
+    # CPU-bound analytics (0 runs them inline in the web worker)
+    PROCESS_POOL_WORKERS: int = int(os.getenv("PROCESS_POOL_WORKERS", 0))
 
     # Security
     CORS_ORIGINS: list = ["http://localhost:5173", "http://127.0.0.1:5173"]
     RATE_LIMIT_PER_HOUR: int = int(os.getenv("RATE_LIMIT_PER_HOUR", 100))
 
+    # User comparison
+    COMPARE_MAX_USERS: int = int(os.getenv("COMPARE_MAX_USERS", 100))
+    COMPARE_CONCURRENCY: int = int(os.getenv("COMPARE_CONCURRENCY", 10))
+    COMPARE_USER_TIMEOUT: float = float(
+        os.getenv("COMPARE_USER_TIMEOUT", 20.0))
+    # Whole comparison, queueing included; keep it under GUNICORN_TIMEOUT
+    COMPARE_REQUEST_TIMEOUT: float = float(
+        os.getenv("COMPARE_REQUEST_TIMEOUT", 45.0))
+    PROFILE_CACHE_TTL: int = int(os.getenv("PROFILE_CACHE_TTL", 300))
+    # Recent versions kept per profile so polling clients can be sent deltas
+    PROFILE_VERSION_WINDOW: int = int(os.getenv("PROFILE_VERSION_WINDOW", 5))
+    PROFILE_VERSION_TTL: int = int(os.getenv("PROFILE_VERSION_TTL", 24 * 3600))
+    # Raw GitHub payloads; with webhooks configured both TTLs can be hours
+    GITHUB_CACHE_TTL: int = int(os.getenv("GITHUB_CACHE_TTL", 300))
+    # Usernames GitHub answered 404 for: how long and how many to remember
+    NEGATIVE_CACHE_TTL: int = int(os.getenv("NEGATIVE_CACHE_TTL", 600))
+    NEGATIVE_CACHE_SIZE: int = int(os.getenv("NEGATIVE_CACHE_SIZE", 10000))
+    GITHUB_WEBHOOK_SECRET: str = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+    # Browser cache lifetime for leaderboard and rankings responses
+    RANKINGS_CACHE_TTL: int = int(os.getenv("RANKINGS_CACHE_TTL", 60))
+    # Contribution heatmaps: how often events are re-read and how long buckets are kept
+    ACTIVITY_REFRESH_SECONDS: int = int(os.getenv("ACTIVITY_REFRESH_SECONDS", 300))
+    ACTIVITY_RETENTION: int = int(os.getenv("ACTIVITY_RETENTION", 400 * 24 * 3600))
+    # /languages calls per analysis, spent on the most relevant repositories
+    ENRICHMENT_BUDGET: int = int(os.getenv("ENRICHMENT_BUDGET", 10))
+    ENRICHMENT_CANDIDATES: int = int(os.getenv("ENRICHMENT_CANDIDATES", 30))
+    # How long a profile can be served stale while GitHub is unavailable
+    STALE_PROFILE_TTL: int = int(os.getenv("STALE_PROFILE_TTL", 7 * 24 * 3600))
+    # Comparisons with at least this many users build the matrix in the process pool
+    COMPARE_PROCESS_THRESHOLD: int = int(
+        os.getenv("COMPARE_PROCESS_THRESHOLD", 20))
+
+    # Percentile rankings (empty path keeps the index in memory only)
+    RANKING_INDEX_PATH: str = os.getenv(
+        "RANKING_INDEX_PATH", "data/ranking_index.json")
+
     # Sentry for error tracking
     SENTRY_DSN: Optional[str] = os.getenv("SENTRY_DSN")
 
@@ -38,4 +104,18 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load .env and validate settings once, on first use"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings()
+
+
+def __getattr__(name):
+    # `from config import settings` keeps working, but nothing is read or
+    # validated until a module actually asks for it
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module 'config' has no attribute {name!r}")
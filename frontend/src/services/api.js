@@ -44,13 +44,58 @@ api.interceptors.response.use(
   }
 );
 
+// Last profile version received per user, so repeat fetches only download a patch
+const profileVersions = new Map();
+
+const unescapePointer = (token) =>
+  token.replace(/~1/g, "/").replace(/~0/g, "~");
+
+// Apply the JSON Patch (add / remove / replace) the API sends against `since`
+const applyPatch = (document, patch) => {
+  let result = structuredClone(document);
+  for (const op of patch) {
+    if (op.path === "") {
+      result = structuredClone(op.value);
+      continue;
+    }
+    const tokens = op.path.split("/").slice(1).map(unescapePointer);
+    const last = tokens.pop();
+    const target = tokens.reduce((node, token) => node[token], result);
+    if (Array.isArray(target)) {
+      const index = last === "-" ? target.length : Number(last);
+      if (op.op === "add") target.splice(index, 0, structuredClone(op.value));
+      else if (op.op === "remove") target.splice(index, 1);
+      else target[index] = structuredClone(op.value);
+    } else if (op.op === "remove") {
+      delete target[last];
+    } else {
+      target[last] = structuredClone(op.value);
+    }
+  }
+  return result;
+};
+
 export const githubAnalyticsAPI = {
   // Get user profile analysis
   getUserProfile: async (username) => {
     try {
       console.log(`🔍 Fetching profile for: ${username}`);
-      const response = await api.get(`/api/v1/analytics/profile/${username}`);
-      return response.data;
+      const known = profileVersions.get(username.toLowerCase());
+      const response = await api.get(`/api/v1/analytics/profile/${username}`, {
+        params: known ? { since: known.version } : undefined,
+      });
+      const result = response.data;
+      if (result.patch && known && result.base === known.version) {
+        result.data = applyPatch(known.data, result.patch);
+        delete result.patch;
+      }
+      if (result.version && result.data) {
+        profileVersions.set(username.toLowerCase(), {
+          version: result.version,
+          data: result.data,
+        });
+      }
+      return result;
     } catch (error) {
       console.error(`❌ Error fetching profile for ${username}:`, error);
       throw error;
@@ -0,0 +1,56 @@
+# gunicorn.conf.py - production serving
+#
+#   gunicorn -c gunicorn.conf.py "backend.app:create_app()"
+#
+# Set CACHE_BACKEND=redis and RATE_LIMIT_BACKEND=redis (both use REDIS_URL)
+# so every worker shares cached analyses and rate-limit counters.
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+
+# One worker per core; threads cover the time spent waiting on GitHub
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Import the app (config, routes, services) once in the master, then fork
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth of in-process caches
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+# Each worker gets a small pool for CPU-heavy bulk analytics
+os.environ.setdefault("PROCESS_POOL_WORKERS", "1")
+
+
+def when_ready(server):
+    # The app is preloaded in the master: finish its lazy imports once here
+    # so forked workers start with them instead of paying on first request
+    from backend.app import warm_up
+    warm_up()
+
+    if workers > 1 and os.getenv("CACHE_BACKEND", "memory") != "redis":
+        server.log.warning(
+            "CACHE_BACKEND is not redis: caches are per worker and not shared")
+    if workers > 1 and os.getenv("RATE_LIMIT_BACKEND", "memory") != "redis":
+        server.log.warning(
+            "RATE_LIMIT_BACKEND is not redis: rate limits are per worker")
+
+
+def post_fork(server, worker):
+    from backend.app import init_worker
+    init_worker()
+
+
+def worker_exit(server, worker):
+    from backend.app import shutdown_worker
+    shutdown_worker()
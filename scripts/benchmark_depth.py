@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+GitHub quota and latency spent per analysis depth
+
+    python scripts/benchmark_depth.py --users 20 --repos 30 --latency-ms 120
+
+Runs the analytics service against a simulated GitHub API (each call
+sleeps for --latency-ms, with jitter) and prints, per depth level, the
+upstream requests used, wall time and response size per profile, and
+how much each saves compared with a full analysis.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.client.github_client import AsyncGitHubClient  # noqa: E402
+from src.services.working_analytics_service import (  # noqa: E402
+    ANALYSIS_DEPTHS, WorkingAnalyticsService)
+from src.utils.cache import MemoryCache  # noqa: E402
+
+LANGUAGES = ["Python", "Go", "Rust", "TypeScript", "C++", "Shell"]
+
+
+def fake_github(repos: int, latency: float):
+    """Mock transport answering /users, /repos and /languages with fixed data"""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(latency * random.uniform(0.8, 1.2))
+        parts = request.url.path.strip("/").split("/")
+        if parts[0] == "users" and len(parts) == 2:
+            return httpx.Response(200, json={
+                "login": parts[1], "name": parts[1].title(), "avatar_url": None,
+                "created_at": "2015-01-01T00:00:00Z", "public_repos": repos,
+                "followers": 120, "following": 4})
+        if parts[0] == "users" and parts[2] == "repos":
+            rng = random.Random(parts[1])
+            return httpx.Response(200, json=[{
+                "name": f"repo-{i}", "stargazers_count": rng.randint(0, 300),
+                "forks_count": rng.randint(0, 40), "language": rng.choice(LANGUAGES),
+                "updated_at": "2026-06-01T00:00:00Z", "has_issues": True,
+                "has_wiki": False, "fork": False, "size": rng.randint(10, 20000),
+            } for i in range(repos)])
+        if parts[0] == "repos" and parts[-1] == "languages":
+            rng = random.Random(request.url.path)
+            return httpx.Response(200, json={
+                lang: rng.randint(1000, 200000) for lang in rng.sample(LANGUAGES, 3)})
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    return httpx.MockTransport(handler), calls
+
+
+async def measure(depth: str, args) -> dict:
+    transport, calls = fake_github(args.repos, args.latency_ms / 1000)
+    client = AsyncGitHubClient(
+        token=None, cache=MemoryCache(),
+        http_client=httpx.AsyncClient(transport=transport))
+    service = WorkingAnalyticsService(client)
+    timings, sizes = [], []
+    try:
+        for i in range(args.users):
+            start = time.perf_counter()
+            profile = await service.get_comprehensive_analysis(
+                f"user{i}", ANALYSIS_DEPTHS[depth])
+            timings.append(time.perf_counter() - start)
+            sizes.append(len(json.dumps(profile.model_dump(mode="json"))))
+    finally:
+        await client.aclose()
+    return {
+        "requests": len(calls) / args.users,
+        "ms": statistics.mean(timings) * 1000,
+        "kb": statistics.mean(sizes) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--repos", type=int, default=30,
+                        help="repositories per simulated user")
+    parser.add_argument("--latency-ms", type=float, default=120.0,
+                        help="simulated GitHub response time per call")
+    args = parser.parse_args()
+
+    # The service narrates every step; keep the table readable
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        results = {depth: asyncio.run(measure(depth, args)) for depth in ANALYSIS_DEPTHS}
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    full = results["full"]
+    print(f"{'depth':>9} {'requests':>9} {'quota saved':>12} {'ms':>8} "
+          f"{'time saved':>11} {'KB':>7}")
+    for depth, result in results.items():
+        print(f"{depth:>9} {result['requests']:>9.1f} "
+              f"{1 - result['requests'] / full['requests']:>12.0%} {result['ms']:>8.0f} "
+              f"{1 - result['ms'] / full['ms']:>11.0%} {result['kb']:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
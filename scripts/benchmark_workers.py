@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the gunicorn serving mode across worker counts
+
+    python scripts/benchmark_workers.py --workers 1 2 4 --requests 2000
+
+Each worker count gets a fresh gunicorn server started from
+gunicorn.conf.py; requests are fired from a thread pool and the
+throughput and latency percentiles are printed as a table.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def run_load(url: str, total: int, concurrency: int, method: str, body: str):
+    latencies = []
+    errors = 0
+
+    with httpx.Client(timeout=30.0) as client:
+        def one(_):
+            start = time.perf_counter()
+            if method == "POST":
+                response = client.post(url, content=body, headers={
+                                       "Content-Type": "application/json"})
+            else:
+                response = client.get(url)
+            return time.perf_counter() - start, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency, status in pool.map(one, range(total)):
+                latencies.append(latency)
+                if status >= 400:
+                    errors += 1
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def benchmark(workers: int, args) -> dict:
+    port = args.port
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers),
+               BIND=f"127.0.0.1:{port}")
+    env.setdefault("SECRET_KEY", "benchmark-secret-key-0000")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+         "--access-logfile", "/dev/null", "backend.app:create_app()"],
+        cwd=PROJECT_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        wait_until_ready(f"{base}/health")
+        run_load(base + args.path, min(200, args.requests),
+                 args.concurrency, args.method, args.body)  # warm-up
+        return run_load(base + args.path, args.requests,
+                        args.concurrency, args.method, args.body)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--path", default="/health",
+                        help="endpoint to hit (must not be rate limited)")
+    parser.add_argument("--method", default="GET", choices=["GET", "POST"])
+    parser.add_argument("--body", default="")
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for workers in args.workers:
+        result = benchmark(workers, args)
+        print(f"{workers:>8} {result['rps']:>10.1f} {result['p50_ms']:>8.1f} "
+              f"{result['p99_ms']:>8.1f} {result['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
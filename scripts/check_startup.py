@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget check for the Flask app
+
+    python scripts/check_startup.py --budget-ms 1000
+
+Imports backend.app and calls create_app() in fresh interpreters, takes
+the best of several runs, and exits non-zero if the import + boot time is
+over budget or if any module that should load lazily was imported during
+startup. tests/test_startup.py runs the same checks under pytest.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on the first analytics request, never at boot
+LAZY_MODULES = (
+    "httpx",
+    "redis",
+    "backend.state",
+    "backend.routes.handlers",
+    "src.client.github_client",
+    "src.services.working_analytics_service",
+    "src.services.advanced_analytics",
+    "src.services.comparison_service",
+    "src.services.ranking_index",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from backend.app import create_app
+imported = time.perf_counter()
+create_app()
+booted = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "boot_ms": (booted - imported) * 1000,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def measure() -> dict:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "startup-check-secret-key")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("STARTUP_BUDGET_MS", 1000)))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r["import_ms"] + r["boot_ms"])
+    total = best["import_ms"] + best["boot_ms"]
+    print(f"import {best['import_ms']:.0f} ms + create_app {best['boot_ms']:.0f} ms "
+          f"= {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if total > args.budget_ms:
+        print("❌ Startup is over budget")
+        failed = True
+
+    eager = [m for m in LAZY_MODULES if m in best["modules"]]
+    if eager:
+        print(f"❌ Imported during startup but should be lazy: {', '.join(eager)}")
+        failed = True
+
+    if not failed:
+        print("✅ Startup within budget")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Analyse every public member of a GitHub organization
+
+    python scripts/crawl_org.py my-org --concurrency 8 --depth standard
+
+Results stream to data/crawls/<org>.jsonl (one user per line) and
+progress to data/crawls/<org>.checkpoint.json. Run the same command
+again after an interruption and it continues where it stopped; users
+that failed transiently are retried. Analysed users also feed the
+ranking index, so they show up in leaderboards.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.state import new_client, ranking_index  # noqa: E402
+from config import settings  # noqa: E402
+from src.client.github_client import create_http_pool  # noqa: E402
+from src.services.org_crawler import OrgCrawler, QuotaPacer  # noqa: E402
+from src.services.working_analytics_service import (  # noqa: E402
+    ANALYSIS_DEPTHS, WorkingAnalyticsService)
+
+
+async def crawl(args) -> dict:
+    client = new_client(http_client=create_http_pool(args.concurrency * 4))
+    sections = ANALYSIS_DEPTHS[args.depth]
+    budget = settings.ENRICHMENT_BUDGET if "languages" in sections else 0
+    service = WorkingAnalyticsService(
+        client, enrichment_budget=budget,
+        enrichment_candidates=settings.ENRICHMENT_CANDIDATES,
+        repository_pages=args.repo_pages)
+    out_dir = os.path.join(PROJECT_ROOT, "data", "crawls")
+    crawler = OrgCrawler(
+        client, service,
+        checkpoint_path=args.checkpoint or os.path.join(out_dir, f"{args.org}.checkpoint.json"),
+        export_path=args.output or os.path.join(out_dir, f"{args.org}.jsonl"),
+        concurrency=args.concurrency,
+        pacer=QuotaPacer(client, cost_per_user=1 + args.repo_pages + budget,
+                         reserve=args.reserve),
+        ranking_index=ranking_index,
+        sections=sections,
+    )
+    try:
+        return await crawler.run(args.org, limit=args.limit)
+    finally:
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("org")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--depth", default="standard", choices=list(ANALYSIS_DEPTHS))
+    parser.add_argument("--repo-pages", type=int, default=3,
+                        help="pages of 100 repositories to read per member")
+    parser.add_argument("--reserve", type=int, default=200,
+                        help="GitHub requests to leave for the live API")
+    parser.add_argument("--limit", type=int, help="stop after this many members")
+    parser.add_argument("--output", help="JSONL export path")
+    parser.add_argument("--checkpoint", help="checkpoint path")
+    parser.add_argument("--verbose", action="store_true",
+                        help="log every GitHub request (debug level)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(message)s")
+    if not args.verbose:
+        # httpx logs each request at info level; too noisy for thousands of users
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        summary = asyncio.run(crawl(args))
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume")
+        sys.exit(130)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded GitHub webhook delivery against the API
+
+    python scripts/replay_webhook.py push                  # in-process Flask app
+    python scripts/replay_webhook.py star --url http://localhost:5000
+
+Payloads live in scripts/webhook_payloads/<event>.json (or pass a path).
+The body is signed with GITHUB_WEBHOOK_SECRET exactly as GitHub signs
+it, so the receiver's signature check is exercised too.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import uuid
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOAD_DIR = os.path.join(PROJECT_ROOT, "scripts", "webhook_payloads")
+sys.path.insert(0, PROJECT_ROOT)
+
+WEBHOOK_PATH = "/api/v1/webhooks/github"
+
+
+def load_payload(name: str) -> bytes:
+    path = name if os.path.exists(name) else os.path.join(PAYLOAD_DIR, f"{name}.json")
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def signed_headers(event: str, body: bytes, secret: str) -> dict:
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return {
+        "Content-Type": "application/json",
+        "X-GitHub-Event": event,
+        "X-GitHub-Delivery": str(uuid.uuid4()),
+        "X-Hub-Signature-256": f"sha256={signature}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("payload", help="recorded payload name (push, star, fork, "
+                                        "repository, ping) or a JSON file")
+    parser.add_argument("--event", help="X-GitHub-Event (defaults to the payload name)")
+    parser.add_argument("--url", help="running server; omit to use an in-process app")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET", ""))
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error("set GITHUB_WEBHOOK_SECRET or pass --secret")
+    event = args.event or os.path.splitext(os.path.basename(args.payload))[0]
+    body = load_payload(args.payload)
+    headers = signed_headers(event, body, args.secret)
+
+    if args.url:
+        import httpx
+
+        response = httpx.post(args.url.rstrip("/") + WEBHOOK_PATH, content=body,
+                              headers=headers, timeout=10.0)
+        status, result = response.status_code, response.json()
+    else:
+        os.environ["GITHUB_WEBHOOK_SECRET"] = args.secret
+        from backend.app import create_app
+
+        response = create_app().test_client().post(WEBHOOK_PATH, data=body, headers=headers)
+        status, result = response.status_code, response.get_json()
+
+    print(status)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
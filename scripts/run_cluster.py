@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Run a username-sharded cluster of API nodes on this machine
+
+    python scripts/run_cluster.py --nodes 3            # ASGI nodes on ports 5101-5103
+    python scripts/run_cluster.py --report             # key spread and movement only
+
+Every node gets the same SECRET_KEY and reads membership from
+data/cluster/nodes.txt. While the cluster runs, type `add` to start one
+more node and put it on the ring, `remove <url>` to take one off (the
+process keeps running so in-flight requests finish), or `quit`. Any node
+answers any user; `X-Served-By` on a response names the owner that
+computed it when it was proxied.
+"""
+import argparse
+import os
+import secrets
+import subprocess
+import sys
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLUSTER_DIR = os.path.join(PROJECT_ROOT, "data", "cluster")
+NODES_FILE = os.path.join(CLUSTER_DIR, "nodes.txt")
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.hash_ring import HashRing  # noqa: E402
+
+
+def node_url(port: int) -> str:
+    return f"http://127.0.0.1:{port}"
+
+
+def write_nodes(nodes) -> None:
+    tmp = NODES_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        f.write("\n".join(nodes) + "\n")
+    os.replace(tmp, NODES_FILE)
+
+
+def start_node(port: int, env: dict) -> subprocess.Popen:
+    node_env = {**env, "CLUSTER_SELF": node_url(port)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.asgi:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=node_env)
+
+
+def report(nodes: int, vnodes: int, keys: int = 100_000) -> None:
+    """How evenly users spread, and how many move when a node joins or leaves"""
+    users = [f"user{i}" for i in range(keys)]
+    urls = [node_url(5101 + i) for i in range(nodes)]
+    ring = HashRing(urls, vnodes)
+    before = {u: ring.owner(u) for u in users}
+
+    spread = Counter(before.values())
+    print(f"{nodes} nodes, {vnodes} virtual nodes each, {keys} users")
+    for url in urls:
+        print(f"  {url}  {spread[url] / keys:6.1%}")
+
+    ring.add(node_url(5101 + nodes))
+    moved = sum(1 for u in users if ring.owner(u) != before[u])
+    print(f"adding a node moves {moved / keys:.1%} of users "
+          f"(ideal {1 / (nodes + 1):.1%}), all onto the new node")
+
+    ring.remove(node_url(5101 + nodes))
+    ring.remove(urls[0])
+    moved = sum(1 for u in users if ring.owner(u) != before[u])
+    print(f"removing a node moves {moved / keys:.1%} of users "
+          f"(ideal {1 / nodes:.1%}), all off the removed node")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--base-port", type=int, default=5101)
+    parser.add_argument("--vnodes", type=int, default=160)
+    parser.add_argument("--report", action="store_true",
+                        help="print the ring's balance and rebalancing cost, start nothing")
+    args = parser.parse_args()
+
+    if args.report:
+        report(args.nodes, args.vnodes)
+        return
+
+    os.makedirs(CLUSTER_DIR, exist_ok=True)
+    ports = [args.base_port + i for i in range(args.nodes)]
+    members = [node_url(port) for port in ports]
+    write_nodes(members)
+    env = {
+        **os.environ,
+        "SECRET_KEY": os.environ.get("SECRET_KEY") or secrets.token_hex(16),
+        "CLUSTER_NODES": ",".join(members),
+        "CLUSTER_NODES_FILE": NODES_FILE,
+        "CLUSTER_VNODES": str(args.vnodes),
+    }
+    processes = {port: start_node(port, env) for port in ports}
+    print(f"Cluster up: {', '.join(members)}  (membership in {NODES_FILE})")
+
+    try:
+        for line in sys.stdin:
+            command, _, value = line.strip().partition(" ")
+            if command == "add":
+                port = max(processes) + 1
+                processes[port] = start_node(port, env)
+                members.append(node_url(port))
+                write_nodes(members)
+                print(f"Added {node_url(port)}")
+            elif command == "remove" and value.rstrip("/") in members:
+                members.remove(value.rstrip("/"))
+                write_nodes(members)
+                print(f"Removed {value} from the ring")
+            elif command == "quit":
+                break
+            elif command:
+                print("commands: add | remove <url> | quit")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from src.exceptions import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling GitHub while it is failing or too slow
+
+    Outcomes of recent calls are kept in a rolling window. The circuit
+    opens when the share of failures (errors, rate limits and calls slower
+    than `slow_call_seconds`) reaches `failure_rate` over at least
+    `min_calls` calls, or after `consecutive_failures` in a row. While open,
+    calls fail immediately with CircuitOpenError. Recovery is checked by
+    `probe`, a cheap request run in a background thread after
+    `open_seconds`. Without a probe, the first call after the cool-down is
+    let through as a half-open trial.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 10,
+                 consecutive_failures: int = 5, slow_call_seconds: float = 10.0,
+                 open_seconds: float = 30.0, window: int = 50,
+                 probe: Optional[Callable[[], bool]] = None):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.consecutive_failures = consecutive_failures
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.probe = probe
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self._outcomes = deque(maxlen=window)
+        self._consecutive = 0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.time()
+            # A trial that never reported back (e.g. cancelled) is abandoned
+            trial_lost = now - self._trial_started > self.open_seconds
+            if (self.state != CLOSED and self.probe is None and now >= self.open_until
+                    and (not self._trial_in_flight or trial_lost)):
+                self.state = HALF_OPEN
+                self._trial_in_flight = True
+                self._trial_started = now
+                return
+            retry_in = max(0.0, self.open_until - now)
+        raise CircuitOpenError(
+            f"GitHub API temporarily unavailable (circuit open, retry in {retry_in:.0f}s)")
+
+    def record_success(self, seconds: float = 0.0) -> None:
+        if seconds >= self.slow_call_seconds:
+            self.record_failure(f"slow call ({seconds:.1f}s)")
+            return
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive = 0
+            if self.state == HALF_OPEN:
+                self._close()
+
+    def record_failure(self, reason: str, retry_after: Optional[float] = None,
+                       trip: bool = False) -> None:
+        """Count a failed call; `trip` opens the circuit at once (quota exhausted)"""
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive += 1
+            self.last_error = reason
+            if self.state == HALF_OPEN:
+                self._open(retry_after)
+            elif self.state == CLOSED and (trip or self._should_trip()):
+                self._open(retry_after)
+
+    def _should_trip(self) -> bool:
+        if self._consecutive >= self.consecutive_failures:
+            return True
+        if len(self._outcomes) < self.min_calls:
+            return False
+        failures = self._outcomes.count(False)
+        return failures / len(self._outcomes) >= self.failure_rate
+
+    def _open(self, retry_after: Optional[float]) -> None:
+        now = time.time()
+        self.state = OPEN
+        self.opened_at = now
+        self.open_until = now + max(self.open_seconds, retry_after or 0)
+        self._trial_in_flight = False
+        logger.warning(f"GitHub circuit opened: {self.last_error}")
+        if self.probe is not None and not self._probing:
+            self._probing = True
+            threading.Thread(target=self._probe_loop, name="github-circuit-probe",
+                             daemon=True).start()
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._consecutive = 0
+        self._trial_in_flight = False
+        logger.info("GitHub circuit closed")
+
+    def _probe_loop(self) -> None:
+        """Probe until GitHub answers again, then close the circuit"""
+        while True:
+            with self._lock:
+                wait = self.open_until - time.time()
+            if wait > 0:
+                time.sleep(min(wait, self.open_seconds))
+                continue
+            try:
+                healthy = self.probe()
+            except Exception as e:
+                healthy = False
+                self.last_error = f"probe failed: {e}"
+            with self._lock:
+                if healthy:
+                    self._close()
+                    self._probing = False
+                    return
+                self.open_until = time.time() + self.open_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "last_error": self.last_error,
+                "retry_in": round(max(0.0, self.open_until - time.time()), 1)
+                if self.state != CLOSED else 0,
+            }
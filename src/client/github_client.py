@@ -1,24 +1,123 @@
+import asyncio
+import contextlib
 import hashlib
 import logging
+import re
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 
-from src.exceptions import GitHubAPIError, RateLimitExceeded, UserNotFound
+from src.client.circuit_breaker import CircuitBreaker
+from src.client.resilience import (LatencyTracker, RetryBudget, RetryPolicy,
+                                   default_latency_tracker, default_retry_budget,
+                                   endpoint_class, parse_retry_after)
+from src.client.scheduler import RequestScheduler
+from src.exceptions import (AuthenticationError, GitHubAPIError, NetworkError,
+                            RateLimitExceeded, RepositoryNotFound, UserNotFound)
 from src.utils.cache import MemoryCache
+from src.utils.negative_cache import NegativeCache
 
 
 logger = logging.getLogger(__name__)
 
+LANGUAGES_CACHE_TTL = 24 * 3600
+
+# A 404 on any of these means the user itself does not exist
+_USER_PATH = re.compile(r"^/?users/([^/?]+)")
+
+
+def github_cache_key(endpoint: str) -> str:
+    """Cache key for a GitHub endpoint (paths are case-insensitive, so keys are too)"""
+    return f"github:{hashlib.md5(endpoint.lower().encode()).hexdigest()}"
+
+
+def user_endpoint(username: str) -> str:
+    return f"/users/{username}"
+
+
+def user_repos_endpoint(username: str, page: int = 1) -> str:
+    endpoint = f"/users/{username}/repos?sort=updated&per_page=100"
+    return endpoint + f"&page={page}" if page > 1 else endpoint
+
+
+def languages_endpoint(owner: str, repo: str) -> str:
+    return f"/repos/{owner}/{repo}/languages"
+
+
+def create_http_pool(max_connections: int = 100) -> httpx.AsyncClient:
+    """Connection pool meant to be shared by every request of a process"""
+    return httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections // 2),
+    )
+
+
+class _Borrowed:
+    """Use a shared httpx client in `async with` without closing it"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        return self.client
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class _Transient(Exception):
+    """A failed attempt that may succeed if retried
+
+    `trip` marks an exhausted quota: nothing will succeed before the reset,
+    so the circuit opens at once instead of counting one more failure.
+    """
+
+    def __init__(self, error: GitHubAPIError, retry_after: Optional[float] = None,
+                 trip: bool = False):
+        super().__init__(str(error))
+        self.error = error
+        self.retry_after = retry_after
+        self.trip = trip
+
 
 class AsyncGitHubClient:
-    """Async GitHub API client with caching"""
+    """Async GitHub API client with caching, retries and adaptive timeouts"""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, cache=None,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 hedge: bool = False,
+                 latency_tracker: Optional[LatencyTracker] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 cache_ttl: int = 300,
+                 negative_cache: Optional[NegativeCache] = None,
+                 scheduler: Optional[RequestScheduler] = None):
         self.base_url = 'https://api.github.com'
         self.token = token
-        self.cache = MemoryCache()
+        self.cache = cache if cache is not None else MemoryCache()
+        self.cache_ttl = cache_ttl
+        # Users GitHub recently said do not exist, answered without a request
+        self.negative_cache = negative_cache
+        # A long-lived pool supplied by the caller; without one, each
+        # request opens (and closes) its own connection
+        self.http_client = http_client
+
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Send a duplicate GET when the first exceeds the endpoint's p95
+        self.hedge = hedge
+        self.latency = latency_tracker or default_latency_tracker
+        self.retry_budget = retry_budget or default_retry_budget
+        # Shared across clients so every request sees GitHub's health
+        self.breaker = breaker
+        # Orders requests by priority class when several clients share the
+        # quota and connection pool; the class comes from request_priority()
+        self.scheduler = scheduler
+        # Last X-RateLimit-* values seen, for callers that pace themselves
+        self.quota_remaining: Optional[int] = None
+        self.quota_reset: Optional[float] = None
 
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
@@ -29,76 +128,222 @@ class AsyncGitHubClient:
             self.headers["Authorization"] = f"Token {self.token}"
 
     def _get_cache_key(self, endpoint: str) -> str:
-        return f"github:{hashlib.md5(endpoint.encode()).hexdigest()}"
+        return github_cache_key(endpoint)
 
-    async def _make_request(self, endpoint: str, use_cache: bool = True) -> Dict[str, Any]:
+    async def _make_request(self, endpoint: str, use_cache: bool = True,
+                            cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         cache_key = self._get_cache_key(endpoint)
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         # Try cache first
         if use_cache and self.cache:
             cached_data = await self.cache.get(cache_key)
-            if cached_data:
+            if cached_data is not None:
                 logger.debug(f"Cache hit for {endpoint}")
                 return cached_data
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        # Only paid when GitHub would otherwise be asked
+        missing_user = _USER_PATH.match(endpoint) if self.negative_cache else None
+        if missing_user and await self.negative_cache.is_missing(missing_user.group(1)):
+            raise UserNotFound(f"GitHub user not found: {endpoint}")
+
+        key = endpoint_class(endpoint)
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
             try:
-                print(f"🌐 Making request to GitHub API:: {url}")
-                # logger.info(f"Fetching from GitHub API: {endpoint}")
-                response = await client.get(url, headers=self.headers)
-
-                # Check rate limits
-                remaining = int(response.headers.get(
-                    'X-RateLimit-Remaining', 1))
-                limit = int(response.headers.get('X-RateLimit-Limit', 60))
-                print(
-                    f"📊 GitHub API Rate Limits: {remaining}/{remaining} remaining")
-
-                if remaining == 0:
-                    reset_time = int(response.headers.get(
-                        'X-RateLimit-Reset', 0))
-                    wait_time = max(0, reset_time - time.time())
-                    raise Exception(
-                        f"GitHub API rate limit exceeded.  Resets in {wait_time:.0f} seconds")
-
-                # Handle rate limiting
-                if response.status_code == 403 and 'rate limit' in response.text.lower():
-                    raise RateLimitExceeded("GitHub API rate limit exceeded")
-
-                if response.status_code == 404:
-                    if 'users' in endpoint:
-                        raise Exception(
-                            f"GitHub user not found: {endpoint}")
-                    else:
-                        raise Exception(f"Resource not found: {endpoint}")
-
-                if response.status_code == 401:
-                    raise Exception(
-                        "GitHub API authentication failed - check token")
-
-                if response.status_code != 200:
-                    raise Exception(
-                        f"GitHub API error {response.status_code}: {response.text}")
-
-                data = response.json()
-
-                # Cache successful response (5 minutes)
-                if use_cache and response.status_code == 200:
-                    await self.cache.set(cache_key, data, ttl=300)
-
-                return data
-
-            except httpx.TimeoutException:
-                raise Exception("GitHub API request timeout")
-            except httpx.NetworkError:
-                raise Exception("Network error connecting to GitHub API")
+                data = await self._fetch(url, endpoint, key)
+                break
+            except UserNotFound:
+                if missing_user:
+                    await self.negative_cache.add(missing_user.group(1))
+                raise
+            except _Transient as failure:
+                attempt += 1
+                delay = self.retry_policy.delay(attempt, failure.retry_after)
+                if delay is None or not self.retry_budget.withdraw():
+                    raise failure.error
+                logger.warning(
+                    f"Retrying {endpoint} in {delay:.2f}s (attempt {attempt}): {failure}")
+                await asyncio.sleep(delay)
+
+        # Cache successful response (self.cache_ttl unless the caller says otherwise)
+        if use_cache:
+            await self.cache.set(cache_key, data, ttl=cache_ttl or self.cache_ttl)
+
+        return data
+
+    async def _fetch(self, url: str, endpoint: str, key: str) -> Any:
+        """One logical GET, hedged with a second copy if it runs past p95"""
+        hedge_after = self.latency.percentile(key, 95) if self.hedge else None
+        if hedge_after is None:
+            return await self._send(url, endpoint, key)
+
+        first = asyncio.ensure_future(self._send(url, endpoint, key))
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done or not self.retry_budget.withdraw():
+            return await first
+
+        logger.debug(f"Hedging {endpoint} after {hedge_after:.2f}s")
+        pending = {first, asyncio.ensure_future(self._send(url, endpoint, key))}
+        failure: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    failure = task.exception()
+            raise failure
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _send(self, url: str, endpoint: str, key: str) -> Any:
+        """A single HTTP attempt, timed against the endpoint's latency estimate"""
+        timeout = self.latency.timeout_for(key)
+        async with self._slot():
+            # Checked once a slot is ours: the circuit may have opened (or a
+            # half-open trial started) while this request was queued
+            if self.breaker:
+                self.breaker.before_call()
+            async with self._http() as client:
+                started = time.monotonic()
+                try:
+                    logger.debug(f"GET {url}")
+                    response = await client.get(url, headers=self.headers, timeout=timeout)
+                except httpx.TimeoutException:
+                    self.latency.record(key, time.monotonic() - started)
+                    self._record_failure(f"timeout after {timeout:.1f}s")
+                    raise _Transient(NetworkError(
+                        f"GitHub API request timeout after {timeout:.1f}s"))
+                except httpx.NetworkError as e:
+                    self._record_failure(f"network error: {e}")
+                    raise _Transient(NetworkError(
+                        "Network error connecting to GitHub API"))
+                elapsed = time.monotonic() - started
+        self.latency.record(key, elapsed)
+
+        try:
+            data = self._handle_response(response, endpoint)
+        except _Transient as failure:
+            self._record_failure(str(failure), failure.retry_after, trip=failure.trip)
+            raise
+        except RateLimitExceeded as e:
+            retry_after = e.reset_time - time.time() if e.reset_time else None
+            self._record_failure(str(e), retry_after, trip=True)
+            raise
+        except GitHubAPIError:
+            # 404s and auth errors mean GitHub itself is answering fine
+            self._record_success(elapsed)
+            raise
+        self._record_success(elapsed)
+        return data
+
+    def _record_success(self, seconds: float) -> None:
+        if self.breaker:
+            self.breaker.record_success(seconds)
+
+    def _record_failure(self, reason: str, retry_after: Optional[float] = None,
+                        trip: bool = False) -> None:
+        if self.breaker:
+            self.breaker.record_failure(reason, retry_after, trip)
+
+    def _handle_response(self, response: httpx.Response, endpoint: str) -> Any:
+        remaining = int(response.headers.get('X-RateLimit-Remaining', 1))
+        limit = int(response.headers.get('X-RateLimit-Limit', 60))
+        logger.debug(f"GitHub rate limit: {remaining}/{limit} remaining")
+        if 'X-RateLimit-Remaining' in response.headers:
+            self.quota_remaining = remaining
+            self.quota_reset = float(response.headers.get('X-RateLimit-Reset', 0)) or None
+            if self.scheduler:
+                self.scheduler.update_quota(remaining, limit, self.quota_reset)
+
+        if response.status_code == 200:
+            return response.json()
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+        # Primary (remaining == 0) and secondary (Retry-After) rate limits
+        if response.status_code in (403, 429) and (
+                remaining == 0 or retry_after is not None
+                or 'rate limit' in response.text.lower()):
+            reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+            if retry_after is None and reset_time:
+                retry_after = max(0.0, reset_time - time.time())
+            error = RateLimitExceeded(reset_time or None)
+            if retry_after is not None:
+                raise _Transient(error, retry_after, trip=remaining == 0)
+            raise error
+
+        if response.status_code == 404:
+            if endpoint.lstrip('/').startswith('users'):
+                raise UserNotFound(f"GitHub user not found: {endpoint}")
+            raise RepositoryNotFound(f"Resource not found: {endpoint}")
+
+        if response.status_code == 401:
+            raise AuthenticationError(
+                "GitHub API authentication failed - check token")
+
+        error = GitHubAPIError(
+            f"GitHub API error {response.status_code}: {response.text}")
+        if response.status_code >= 500:
+            raise _Transient(error, retry_after)
+        raise error
+
+    def _slot(self):
+        if self.scheduler is not None:
+            return self.scheduler.slot()
+        return contextlib.nullcontext()
+
+    def _http(self):
+        if self.http_client is not None:
+            return _Borrowed(self.http_client)
+        return httpx.AsyncClient(timeout=30.0)
+
+    async def aclose(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
 
     async def get_user_profile(self, username: str) -> Dict[str, Any]:
-        return await self._make_request(f"/users/{username}")
+        return await self._make_request(user_endpoint(username))
+
+    async def get_user_repositories(self, username: str, max_pages: int = 1) -> List[Dict[str, Any]]:
+        """Repositories, most recently updated first, up to `max_pages` pages of 100"""
+        repos = []
+        for page in range(1, max(1, max_pages) + 1):
+            batch = await self._make_request(user_repos_endpoint(username, page))
+            repos.extend(batch)
+            if len(batch) < 100:
+                break
+        return repos
+
+    async def iter_user_events(self, username: str, max_pages: int = 3) -> AsyncIterator[Dict[str, Any]]:
+        """Public events, newest first, fetched a page at a time as they are consumed
 
-    async def get_user_repositories(self, username: str) -> List[Dict[str, Any]]:
-        return await self._make_request(f"/users/{username}/repos?sort=updated&per_page=100")
+        GitHub only keeps the last 300 events (90 days), i.e. three pages.
+        Events are not cached: callers keep their own high-water mark.
+        """
+        for page in range(1, max(1, max_pages) + 1):
+            batch = await self._make_request(
+                f"/users/{username}/events/public?per_page=100&page={page}", use_cache=False)
+            for event in batch:
+                yield event
+            if len(batch) < 100:
+                return
+
+    async def get_org_members(self, org: str, page: int = 1) -> List[Dict[str, Any]]:
+        """One page (up to 100) of an organization's public members"""
+        return await self._make_request(f"/orgs/{org}/members?per_page=100&page={page}")
 
     async def get_repository_languages(self, username: str, repo: str) -> Dict[str, Any]:
-        return await self._make_request(f"/repos/{username}/{repo}/languages")
+        # Language mixes change slowly, so enrichment keeps paying off across analyses
+        return await self._make_request(languages_endpoint(username, repo),
+                                        cache_ttl=LANGUAGES_CACHE_TTL)
+
+    async def cached_repository_languages(self, username: str, repo: str) -> Optional[Dict[str, Any]]:
+        """Languages from the cache only, without spending an API call"""
+        return await self.cache.get(
+            self._get_cache_key(languages_endpoint(username, repo)))
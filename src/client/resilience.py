@@ -0,0 +1,150 @@
+import random
+import re
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional
+
+
+# Endpoint families that share latency statistics
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"^users/[^/]+$"), "users/:user"),
+    (re.compile(r"^users/[^/]+/repos$"), "users/:user/repos"),
+    (re.compile(r"^users/[^/]+/events(/public)?$"), "users/:user/events"),
+    (re.compile(r"^orgs/[^/]+/members$"), "orgs/:org/members"),
+    (re.compile(r"^repos/[^/]+/[^/]+/languages$"), "repos/:repo/languages"),
+    (re.compile(r"^repos/[^/]+/[^/]+$"), "repos/:repo"),
+)
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Collapse an endpoint to its route template, e.g. users/:user/repos"""
+    path = endpoint.split("?", 1)[0].strip("/")
+    for pattern, name in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return name
+    return path.split("/", 1)[0] or "root"
+
+
+class LatencyTracker:
+    """Rolling latency samples per endpoint class
+
+    Timeouts follow the observed p99 (with headroom) instead of a flat
+    value, and p95 is the point after which a hedged request is sent.
+    Until enough samples exist the conservative maximum is used.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20,
+                 min_timeout: float = 2.0, max_timeout: float = 30.0,
+                 headroom: float = 2.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def timeout_for(self, key: str) -> float:
+        p99 = self.percentile(key, 99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.headroom))
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            key: {
+                "samples": len(self._samples[key]),
+                "p50": self.percentile(key, 50),
+                "p95": self.percentile(key, 95),
+                "p99": self.percentile(key, 99),
+                "timeout": self.timeout_for(key),
+            }
+            for key in keys
+        }
+
+
+class RetryBudget:
+    """Caps retries and hedges to a fraction of regular traffic
+
+    Every request deposits `ratio` tokens and every retry or hedge spends
+    one, so extra load on GitHub (and our quota) stays bounded at roughly
+    `ratio` of the base request rate even during an incident.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 5.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honours Retry-After"""
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5,
+                 max_delay: float = 8.0, max_retry_after: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before retry number `attempt` (1-based), or None to give up"""
+        if attempt > self.max_retries:
+            return None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return max(0.0, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared by every client in the process, so estimates survive the
+# per-request clients the Flask views create
+default_latency_tracker = LatencyTracker()
+default_retry_budget = RetryBudget()
@@ -0,0 +1,262 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """Who a GitHub request is for, most urgent first"""
+    INTERACTIVE = 0
+    COMPARE = 1
+    BULK = 2
+    PREFETCH = 3
+
+
+@dataclass(frozen=True)
+class ClassPolicy:
+    # Share of dispatches when several classes are waiting
+    weight: float
+    # Fraction of the hourly quota this class may not touch, i.e. kept
+    # back for the classes above it
+    quota_floor: float
+
+
+DEFAULT_POLICIES = {
+    Priority.INTERACTIVE: ClassPolicy(weight=8, quota_floor=0.0),
+    Priority.COMPARE: ClassPolicy(weight=4, quota_floor=0.10),
+    Priority.BULK: ClassPolicy(weight=2, quota_floor=0.25),
+    Priority.PREFETCH: ClassPolicy(weight=1, quota_floor=0.40),
+}
+
+# Classes held back while interactive latency is at risk
+PREEMPTIBLE = (Priority.BULK, Priority.PREFETCH)
+
+current_priority: ContextVar[Priority] = ContextVar(
+    "github_request_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run GitHub calls made in this block (and tasks it spawns) at `priority`"""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "enqueued", "granted", "quota_blocked", "preempted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.enqueued = time.monotonic()
+        self.granted = False
+        # Whether this request has been counted as held back, so the
+        # counters are per request rather than per dispatch attempt
+        self.quota_blocked = False
+        self.preempted = False
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _mark(queue: Deque[_Waiter], flag: str) -> int:
+    """Flag every waiter in `queue` not flagged yet, returning how many
+
+    Waiters join at the tail, so the flagged ones are always a prefix and
+    the walk from the tail stops at the first one already counted.
+    """
+    marked = 0
+    for waiter in reversed(queue):
+        if getattr(waiter, flag):
+            break
+        setattr(waiter, flag, True)
+        marked += 1
+    return marked
+
+
+def _percentile(values, q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))], 4)
+
+
+class RequestScheduler:
+    """Orders GitHub requests from every client of the process by priority
+
+    Each request takes one of `max_concurrency` slots (matching the HTTP
+    connection pool) before it is sent. When requests are queued, slots go
+    to the waiting classes by weighted fair queuing (stride scheduling on
+    the policy weights), so lower classes are slowed down but never starved
+    while they are eligible. A class is not eligible when:
+
+      * the remaining GitHub quota is at or below its `quota_floor`, which
+        leaves the rest to the classes above it; or
+      * it is BULK or PREFETCH and interactive latency is at risk, i.e.
+        recent interactive requests (queue wait + response) are over the SLO
+        at p95 or an interactive request has been queued for half of it.
+        Preemptible classes are also capped at `low_priority_share` of the
+        slots so interactive requests always find one free.
+
+    The state is guarded by a thread lock and waiters are woken on their
+    own event loop, so one scheduler serves Flask's per-request loops as
+    well as the single ASGI loop.
+    """
+
+    def __init__(self, max_concurrency: int = 100,
+                 policies: Optional[Dict[Priority, ClassPolicy]] = None,
+                 latency_slo: float = 2.0, low_priority_share: float = 0.5,
+                 recheck_interval: float = 1.0, sample_window: float = 30.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.policies = policies or DEFAULT_POLICIES
+        self.latency_slo = latency_slo
+        self.low_priority_slots = max(1, int(self.max_concurrency * low_priority_share))
+        self.recheck_interval = recheck_interval
+        self.sample_window = sample_window
+
+        self._lock = threading.Lock()
+        self._queues: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in Priority}
+        self._virtual: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._clock = 0.0
+        self._in_flight: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._dispatched: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._preempted: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._quota_blocked: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._waits: Dict[Priority, Deque[float]] = {p: deque(maxlen=200) for p in Priority}
+        self._interactive: Deque[Tuple[float, float]] = deque(maxlen=200)
+
+        self.quota_remaining: Optional[int] = None
+        self.quota_limit: Optional[int] = None
+        self.quota_reset: Optional[float] = None
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None):
+        """Hold a request slot for the duration of one HTTP attempt"""
+        priority = current_priority.get() if priority is None else priority
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority, time.monotonic() - queued_at)
+
+    def update_quota(self, remaining: int, limit: int, reset: Optional[float]) -> None:
+        with self._lock:
+            self.quota_remaining, self.quota_limit, self.quota_reset = remaining, limit, reset
+            self._dispatch()
+
+    async def _acquire(self, priority: Priority) -> None:
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            queue = self._queues[priority]
+            if not queue and not self._in_flight[priority]:
+                # Back from idle: no credit for the time spent away
+                self._virtual[priority] = max(self._virtual[priority], self._clock)
+            queue.append(waiter)
+            self._dispatch()
+        try:
+            while True:
+                done, _ = await asyncio.wait({waiter.future}, timeout=self.recheck_interval)
+                if done:
+                    return
+                # Quota windows reset and latency recovers without any release
+                with self._lock:
+                    self._dispatch()
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight[priority] -= 1
+                    self._dispatch()
+                else:
+                    self._queues[priority].remove(waiter)
+            raise
+
+    def _release(self, priority: Priority, seconds: float) -> None:
+        with self._lock:
+            self._in_flight[priority] -= 1
+            if priority == Priority.INTERACTIVE:
+                self._interactive.append((time.monotonic(), seconds))
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters; call with the lock held"""
+        while sum(self._in_flight.values()) < self.max_concurrency:
+            priority = self._next_class()
+            if priority is None:
+                return
+            waiter = self._queues[priority].popleft()
+            waiter.granted = True
+            self._in_flight[priority] += 1
+            self._dispatched[priority] += 1
+            self._waits[priority].append(time.monotonic() - waiter.enqueued)
+            self._clock = self._virtual[priority]
+            self._virtual[priority] += 1 / self.policies[priority].weight
+            waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+
+    def _next_class(self) -> Optional[Priority]:
+        at_risk = self._interactive_at_risk()
+        low_in_flight = sum(self._in_flight[p] for p in PREEMPTIBLE)
+        best = None
+        for priority, queue in self._queues.items():
+            if not queue:
+                continue
+            if not self._quota_allows(priority):
+                self._quota_blocked[priority] += _mark(queue, "quota_blocked")
+                continue
+            if priority in PREEMPTIBLE and (at_risk or low_in_flight >= self.low_priority_slots):
+                if at_risk:
+                    self._preempted[priority] += _mark(queue, "preempted")
+                continue
+            if best is None or self._virtual[priority] < self._virtual[best]:
+                best = priority
+        return best
+
+    def _quota_allows(self, priority: Priority) -> bool:
+        floor = self.policies[priority].quota_floor
+        if not floor or self.quota_remaining is None or not self.quota_limit:
+            return True
+        if self.quota_reset and time.time() >= self.quota_reset:
+            return True  # a new window has started since the last response
+        return self.quota_remaining > floor * self.quota_limit
+
+    def _interactive_at_risk(self) -> bool:
+        queue = self._queues[Priority.INTERACTIVE]
+        now = time.monotonic()
+        if queue and now - queue[0].enqueued > self.latency_slo / 2:
+            return True
+        recent = [seconds for at, seconds in self._interactive
+                  if now - at <= self.sample_window]
+        return len(recent) >= 5 and _percentile(recent, 95) > self.latency_slo
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            at_risk = self._interactive_at_risk()
+            return {
+                "slots": self.max_concurrency,
+                "interactive_at_risk": at_risk,
+                "quota_remaining": self.quota_remaining,
+                "classes": {
+                    priority.name.lower(): {
+                        "queued": len(self._queues[priority]),
+                        "in_flight": self._in_flight[priority],
+                        "dispatched": self._dispatched[priority],
+                        "wait_p50": _percentile(self._waits[priority], 50),
+                        "wait_p95": _percentile(self._waits[priority], 95),
+                        "oldest_wait": round(time.monotonic() - self._queues[priority][0].enqueued, 3)
+                        if self._queues[priority] else 0.0,
+                        "preempted": self._preempted[priority],
+                        "quota_blocked": self._quota_blocked[priority],
+                    }
+                    for priority in Priority
+                },
+            }
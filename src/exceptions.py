@@ -20,4 +20,8 @@ class AuthenticationError(GitHubAPIError):
     pass
 
 class NetworkError(GitHubAPIError):
-    pass
\ No newline at end of file
+    pass
+
+class CircuitOpenError(GitHubAPIError):
+    """GitHub calls are short-circuited while the API is failing"""
+    pass
@@ -0,0 +1,184 @@
+# src/services/activity_heatmap.py
+import time
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+# 53 weeks, enough for a full year-view contribution calendar
+HEATMAP_DAYS = 371
+
+
+def activity_cache_key(username: str) -> str:
+    return f"activity:{username.lower()}"
+
+
+def event_day(created_at: str) -> int:
+    """Proleptic ordinal (UTC) of an event's creation date"""
+    return datetime.fromisoformat(created_at.replace('Z', '+00:00')).astimezone(
+        timezone.utc).date().toordinal()
+
+
+def _today() -> int:
+    return datetime.now(timezone.utc).date().toordinal()
+
+
+class ActivityBuckets:
+    """Event counts per type in a fixed window of day buckets
+
+    Each event type owns one array of `days` unsigned ints; the last slot is
+    `end_day` and the first is `end_day - days + 1`. Moving the window
+    forward shifts the arrays, so memory stays constant however many
+    events are ingested, and reading a heatmap is O(days) per type.
+    `last_event_id` is the newest event already counted, so re-ingesting
+    GitHub's overlapping event feed never counts an event twice.
+    """
+
+    def __init__(self, days: int = HEATMAP_DAYS, end_day: Optional[int] = None):
+        self.days = days
+        self.end_day = end_day if end_day is not None else _today()
+        self.counts: Dict[str, array] = {}
+        self.last_event_id = 0
+
+    def _empty(self) -> array:
+        return array('I', bytes(4 * self.days))
+
+    def advance(self, end_day: int) -> None:
+        """Move the window so it ends on `end_day`, dropping older buckets"""
+        shift = end_day - self.end_day
+        if shift <= 0:
+            return
+        for event_type, counts in self.counts.items():
+            if shift >= self.days:
+                self.counts[event_type] = self._empty()
+            else:
+                self.counts[event_type] = counts[shift:] + array('I', bytes(4 * shift))
+        self.end_day = end_day
+
+    def add(self, event_type: str, day: int, count: int = 1) -> None:
+        if day > self.end_day:
+            self.advance(day)
+        index = self.days - 1 - (self.end_day - day)
+        if index < 0:
+            return  # older than the window
+        counts = self.counts.get(event_type)
+        if counts is None:
+            counts = self.counts[event_type] = self._empty()
+        counts[index] += count
+
+    def merge(self, other: "ActivityBuckets") -> "ActivityBuckets":
+        """Fold another set of buckets (e.g. a fresh ingestion) into this one"""
+        self.advance(other.end_day)
+        offset = self.end_day - other.end_day
+        for event_type, counts in other.counts.items():
+            target = self.counts.get(event_type)
+            if target is None:
+                target = self.counts[event_type] = self._empty()
+            for index in range(other.days):
+                day_index = index - offset - (other.days - self.days)
+                if 0 <= day_index < self.days and counts[index]:
+                    target[day_index] += counts[index]
+        self.last_event_id = max(self.last_event_id, other.last_event_id)
+        return self
+
+    def heatmap(self, days: int = 365, event_types: Optional[Iterable[str]] = None,
+                today: Optional[int] = None) -> Dict[str, Any]:
+        """Daily totals for the last `days` days, oldest first"""
+        days = max(1, min(days, self.days))
+        end_day = max(self.end_day, today or _today())
+        # Days between the last ingested event and today are simply empty
+        gap = min(days, end_day - self.end_day)
+        wanted = set(event_types) if event_types else None
+
+        totals = [0] * days
+        by_type = {}
+        for event_type, counts in self.counts.items():
+            if wanted is not None and event_type not in wanted:
+                continue
+            window = counts[self.days - (days - gap):]
+            type_total = 0
+            for index, count in enumerate(window):
+                totals[index] += count
+                type_total += count
+            if type_total:
+                by_type[event_type] = type_total
+
+        start = date.fromordinal(end_day - days + 1)
+        active_days = sum(1 for count in totals if count)
+        current_streak = 0
+        for count in reversed(totals):
+            if not count:
+                break
+            current_streak += 1
+        longest_streak = run = 0
+        for count in totals:
+            run = run + 1 if count else 0
+            longest_streak = max(longest_streak, run)
+
+        return {
+            "start": start.isoformat(),
+            "end": (start + timedelta(days=days - 1)).isoformat(),
+            "days": totals,
+            "total": sum(totals),
+            "max": max(totals),
+            "active_days": active_days,
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+            "by_type": dict(sorted(by_type.items(), key=lambda item: item[1], reverse=True)),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "days": self.days,
+            "end_day": self.end_day,
+            "last_event_id": self.last_event_id,
+            "counts": {event_type: counts.tolist()
+                       for event_type, counts in self.counts.items() if any(counts)},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ActivityBuckets":
+        buckets = cls(data["days"], data["end_day"])
+        buckets.last_event_id = data.get("last_event_id", 0)
+        buckets.counts = {event_type: array('I', counts)
+                          for event_type, counts in data.get("counts", {}).items()}
+        return buckets
+
+
+class EventIngestor:
+    """Streams a user's public events into their stored day buckets
+
+    Pages are read newest first and ingestion stops at the first event
+    already counted, so a refresh usually costs a single request. The
+    stored buckets are refreshed at most every `refresh_seconds`.
+    """
+
+    def __init__(self, client, store, ttl: int = 400 * 24 * 3600,
+                 refresh_seconds: int = 300, max_pages: int = 3):
+        self.client = client
+        self.store = store
+        self.ttl = ttl
+        self.refresh_seconds = refresh_seconds
+        self.max_pages = max_pages
+
+    async def ingest(self, username: str, force: bool = False) -> ActivityBuckets:
+        key = activity_cache_key(username)
+        stored = await self.store.get(key)
+        if stored:
+            buckets = ActivityBuckets.from_dict(stored["buckets"])
+            if not force and time.time() - stored["ingested_at"] < self.refresh_seconds:
+                return buckets
+        else:
+            buckets = ActivityBuckets()
+
+        fresh = ActivityBuckets(buckets.days, buckets.end_day)
+        async for event in self.client.iter_user_events(username, self.max_pages):
+            event_id = int(event["id"])
+            if event_id <= buckets.last_event_id:
+                break
+            fresh.add(event["type"], event_day(event["created_at"]))
+            fresh.last_event_id = max(fresh.last_event_id, event_id)
+
+        buckets.merge(fresh)
+        await self.store.set(key, {"buckets": buckets.to_dict(),
+                                   "ingested_at": time.time()}, ttl=self.ttl)
+        return buckets
@@ -0,0 +1,323 @@
+# src/services/comparison_service.py
+import asyncio
+import logging
+from itertools import combinations
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ..exceptions import RepositoryNotFound, UserNotFound
+from ..utils.cache import MemoryCache
+from ..utils.process_pool import run_cpu_bound
+from .profile_versions import profile_version
+from .working_analytics_service import (
+    ANALYSIS_DEPTHS, ANALYSIS_SECTIONS, DEFAULT_DEPTH, select_sections)
+
+
+logger = logging.getLogger(__name__)
+
+# Headline numbers compared between users, in output order
+COMPARISON_METRICS = (
+    "followers",
+    "public_repos",
+    "total_stars",
+    "total_forks",
+    "average_stars",
+    "languages_used",
+    "activity_score",
+    "community_impact",
+)
+
+
+FULL_SECTIONS = ANALYSIS_DEPTHS[DEFAULT_DEPTH]
+
+
+def profile_cache_key(username: str, sections: FrozenSet[str] = FULL_SECTIONS) -> str:
+    """Full analyses keep the plain key; partial ones are keyed by their sections"""
+    if sections == FULL_SECTIONS:
+        return f"profile:{username.lower()}"
+    return f"profile:{username.lower()}:{'+'.join(sorted(sections)) or 'summary'}"
+
+
+def profile_cache_keys(username: str) -> List[str]:
+    """Every key a computed profile of `username` can be cached under"""
+    return [profile_cache_key(username, frozenset(sections))
+            for size in range(len(ANALYSIS_SECTIONS) + 1)
+            for sections in combinations(ANALYSIS_SECTIONS, size)]
+
+
+async def cache_profile(cache: MemoryCache, username: str, sections: FrozenSet[str],
+                        data: Dict[str, Any], ttl: int) -> str:
+    """Store a computed analysis together with its version; returns the version
+
+    Keeping both in one entry means a reader never pairs a profile with
+    the version of another, so the version can stand in for the content
+    (ETags, deltas) without hashing the profile on every hit.
+    """
+    version = profile_version(data)
+    await cache.set(profile_cache_key(username, sections),
+                    {"version": version, "data": data}, ttl=ttl)
+    return version
+
+
+async def get_cached_entry(cache: MemoryCache, username: str,
+                           sections: FrozenSet[str] = FULL_SECTIONS) -> Optional[Dict[str, Any]]:
+    """Cached `{"version", "data"}` with at least `sections`, trimmed down to them
+
+    A profile trimmed from a fuller analysis has no stored version.
+    """
+    entry = await cache.get(profile_cache_key(username, sections))
+    if entry or sections == FULL_SECTIONS:
+        return entry
+    entry = await cache.get(profile_cache_key(username))
+    return {"version": None, "data": select_sections(entry["data"], sections)} if entry else None
+
+
+async def get_cached_profile(cache: MemoryCache, username: str,
+                             sections: FrozenSet[str] = FULL_SECTIONS) -> Optional[Dict[str, Any]]:
+    """A cached analysis with at least `sections`, trimmed down to them"""
+    entry = await get_cached_entry(cache, username, sections)
+    return entry["data"] if entry else None
+
+
+class _DeadlineExceeded(Exception):
+    """The comparison as a whole ran out of time before this user was loaded"""
+
+
+class ComparisonService:
+    """Compare many users using cached profiles and a pairwise matrix
+
+    Each analysis is bounded by `user_timeout` once it holds one of the
+    `concurrency` slots, and the whole comparison, queueing included, by
+    `request_timeout`: users still waiting or loading at the deadline get
+    their stale profile, if any, or an error entry.
+    """
+
+    def __init__(self, service, profile_cache: MemoryCache,
+                 concurrency: int = 10, user_timeout: float = 20.0,
+                 request_timeout: float = 45.0,
+                 cache_ttl: int = 300, ranking_index=None,
+                 process_threshold: int = 20, stale_cache: MemoryCache = None,
+                 stale_ttl: int = 7 * 24 * 3600, sections: FrozenSet[str] = FULL_SECTIONS,
+                 remote_profile=None, profile_versions=None):
+        self.service = service
+        self.profile_versions = profile_versions
+        # Async (username, sections) -> profile from the node owning the user,
+        # or None when this node owns it (or the owner is unreachable)
+        self.remote_profile = remote_profile
+        self.sections = sections
+        self.profile_cache = profile_cache
+        self.stale_cache = stale_cache
+        self.stale_ttl = stale_ttl
+        self.ranking_index = ranking_index
+        self.concurrency = max(1, concurrency)
+        self.user_timeout = user_timeout
+        self.request_timeout = request_timeout
+        self.cache_ttl = cache_ttl
+        self.process_threshold = process_threshold
+
+    async def compare(self, usernames: List[str]) -> Dict[str, Any]:
+        """Load every profile (cache first) and build the comparison matrix"""
+        usernames = self._dedupe(usernames)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        stale_users = set()
+
+        async def fall_back(username: str, error: Exception) -> Dict[str, Any]:
+            stale = await self._stale(username)
+            if stale is None:
+                raise error
+            stale_users.add(username)
+            return stale
+
+        async def load(username: str) -> Dict[str, Any]:
+            cached = await get_cached_profile(self.profile_cache, username, self.sections)
+            if cached:
+                return cached
+            if self.remote_profile is not None:
+                try:
+                    async with semaphore:
+                        remote = await asyncio.wait_for(
+                            self.remote_profile(username, self.sections),
+                            timeout=self.user_timeout)
+                except asyncio.TimeoutError as e:
+                    # The owner used up the user's budget; analysing here would double it
+                    return await fall_back(username, e)
+                if remote is not None:
+                    return remote
+            try:
+                async with semaphore:
+                    profile = await asyncio.wait_for(
+                        self.service.get_comprehensive_analysis(username, self.sections),
+                        timeout=self.user_timeout)
+            except (UserNotFound, RepositoryNotFound):
+                raise
+            except Exception as e:
+                return await fall_back(username, e)
+            data = profile.model_dump(mode="json")
+            key = profile_cache_key(username, self.sections)
+            version = await cache_profile(self.profile_cache, username, self.sections,
+                                          data, ttl=self.cache_ttl)
+            if self.profile_versions is not None:
+                await self.profile_versions.record(key, data, version)
+            if self.stale_cache is not None:
+                await self.stale_cache.set(key, {
+                    "data": data,
+                    "cached_at": datetime.now(timezone.utc).isoformat(),
+                }, ttl=self.stale_ttl)
+            if self.ranking_index is not None:
+                self.ranking_index.record(data)
+            return data
+
+        results = await self._load_all(usernames, load)
+        for index, username in enumerate(usernames):
+            if isinstance(results[index], _DeadlineExceeded):
+                stale = await self._stale(username)
+                if stale is not None:
+                    stale_users.add(username)
+                    results[index] = stale
+
+        comparisons = []
+        profiles = []
+        for username, result in zip(usernames, results):
+            if username in stale_users:
+                comparisons.append(
+                    {"username": username, "success": True, "stale": True, "data": result})
+                profiles.append(result)
+            elif isinstance(result, BaseException):
+                if isinstance(result, asyncio.TimeoutError):
+                    error = f"Analysis timed out after {self.user_timeout:.0f}s"
+                else:
+                    error = str(result)
+                logger.warning(f"Comparison: {username} failed: {error}")
+                comparisons.append(
+                    {"username": username, "success": False, "error": error})
+            else:
+                comparisons.append(
+                    {"username": username, "success": True, "data": result})
+                profiles.append(result)
+
+        if len(profiles) >= self.process_threshold:
+            matrix = await run_cpu_bound(build_comparison_matrix, profiles)
+        else:
+            matrix = build_comparison_matrix(profiles)
+
+        return {
+            "comparisons": comparisons,
+            "matrix": matrix,
+        }
+
+    async def _load_all(self, usernames: List[str], load) -> List[Any]:
+        """Result or exception per user; unfinished loads are cancelled at the deadline"""
+        tasks = [asyncio.ensure_future(load(u)) for u in usernames]
+        if not tasks:
+            return []
+        _, pending = await asyncio.wait(tasks, timeout=self.request_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        deadline = _DeadlineExceeded(
+            f"Comparison deadline of {self.request_timeout:.0f}s reached first")
+        return [deadline if task in pending else task.exception() or task.result()
+                for task in tasks]
+
+    async def _stale(self, username: str) -> Optional[Dict[str, Any]]:
+        if self.stale_cache is None:
+            return None
+        entry = await self.stale_cache.get(profile_cache_key(username, self.sections))
+        if not entry and self.sections != FULL_SECTIONS:
+            entry = await self.stale_cache.get(profile_cache_key(username))
+        return select_sections(entry["data"], self.sections) if entry else None
+
+    @staticmethod
+    def _dedupe(usernames: List[str]) -> List[str]:
+        seen = set()
+        unique = []
+        for username in usernames:
+            key = username.lower()
+            if key not in seen:
+                seen.add(key)
+                unique.append(username)
+        return unique
+
+
+def _metric_vector(profiles: List[Dict[str, Any]], metric: str) -> List[float]:
+    """Pull one metric out of every profile as a column"""
+    vector = []
+    for profile in profiles:
+        value = profile.get(metric)
+        if value is None:
+            value = profile.get("metrics", {}).get(metric, 0)
+        vector.append(float(value or 0))
+    return vector
+
+
+def _rank(vector: List[float]) -> List[int]:
+    """Competition ranking (1 = highest, ties share a rank)"""
+    order = sorted(range(len(vector)), key=lambda i: vector[i], reverse=True)
+    ranks = [0] * len(vector)
+    previous: Optional[float] = None
+    rank = 0
+    for position, index in enumerate(order, start=1):
+        if vector[index] != previous:
+            rank = position
+            previous = vector[index]
+        ranks[index] = rank
+    return ranks
+
+
+def _language_masks(profiles: List[Dict[str, Any]]) -> Tuple[List[str], List[int]]:
+    """Encode each user's languages as a bitmask over a shared vocabulary"""
+    vocabulary: Dict[str, int] = {}
+    masks = []
+    for profile in profiles:
+        mask = 0
+        for language in profile.get("primary_languages", []):
+            bit = vocabulary.setdefault(language, len(vocabulary))
+            mask |= 1 << bit
+        masks.append(mask)
+    return list(vocabulary), masks
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+def _language_overlap(masks: List[int]) -> Tuple[List[List[int]], List[List[float]]]:
+    """n×n shared-language counts and Jaccard indices, computed once per pair"""
+    n = len(masks)
+    counts = [_popcount(mask) for mask in masks]
+    shared = [[0] * n for _ in range(n)]
+    jaccard = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        shared[i][i] = counts[i]
+        jaccard[i][i] = 1.0 if counts[i] else 0.0
+        for j in range(i + 1, n):
+            both = _popcount(masks[i] & masks[j])
+            union = counts[i] + counts[j] - both
+            shared[i][j] = shared[j][i] = both
+            jaccard[i][j] = jaccard[j][i] = round(both / union, 3) if union else 0.0
+    return shared, jaccard
+
+
+def build_comparison_matrix(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-metric columns and ranks plus n×n language overlap matrices
+
+    Everything is indexed like `users`. Pairwise metric deltas are not
+    sent: `values[metric][j] - values[metric][i]` gives them, and sending
+    them for every pair grew the response quadratically (over 1 MB of
+    JSON for 100 users). Row i of `shared_languages` and
+    `language_jaccard` compares user i with every user.
+    """
+    usernames = [p["username"] for p in profiles]
+    columns = {m: _metric_vector(profiles, m) for m in COMPARISON_METRICS}
+    _, masks = _language_masks(profiles)
+    shared, jaccard = _language_overlap(masks)
+
+    return {
+        "users": usernames,
+        "metrics": list(COMPARISON_METRICS),
+        "values": columns,
+        "ranks": {metric: _rank(vector) for metric, vector in columns.items()},
+        "shared_languages": shared,
+        "language_jaccard": jaccard,
+    }
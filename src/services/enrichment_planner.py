@@ -0,0 +1,74 @@
+# src/services/enrichment_planner.py
+import heapq
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Collection, Dict, List, Optional
+
+# Days after which recency counts half as much
+RECENCY_HALF_LIFE_DAYS = 180
+# Forks rarely say much about their owner
+FORK_PENALTY = 0.3
+
+
+def repository_relevance(repo: Dict[str, Any], now: Optional[datetime] = None) -> float:
+    """Cheap score from fields already in the /repos listing (no extra calls)"""
+    now = now or datetime.now(timezone.utc)
+    score = (3.0 * math.log1p(repo.get('stargazers_count', 0))
+             + 2.0 * math.log1p(repo.get('forks_count', 0))
+             + 0.5 * math.log1p(repo.get('size', 0)))
+
+    touched = repo.get('pushed_at') or repo.get('updated_at')
+    if touched:
+        age_days = max(0.0, (now - datetime.fromisoformat(
+            touched.replace('Z', '+00:00'))).total_seconds() / 86400)
+        score += 3.0 * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    if repo.get('fork'):
+        score *= FORK_PENALTY
+    return score
+
+
+@dataclass
+class EnrichmentPlan:
+    """Which repositories get a /languages call now and which wait"""
+    ranked: List[Dict[str, Any]] = field(default_factory=list)
+    fetch: List[Dict[str, Any]] = field(default_factory=list)
+    cached: List[Dict[str, Any]] = field(default_factory=list)
+    deferred: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self, budget: int) -> Dict[str, int]:
+        return {
+            "budget": budget,
+            "fetched": len(self.fetch),
+            "cached": len(self.cached),
+            "deferred": len(self.deferred),
+        }
+
+
+def rank_repositories(repos: List[Dict[str, Any]], limit: int,
+                      now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """The `limit` most relevant repositories, best first (heap top-K)"""
+    now = now or datetime.now(timezone.utc)
+    return heapq.nlargest(limit, repos, key=lambda repo: repository_relevance(repo, now))
+
+
+def plan_enrichment(repos: List[Dict[str, Any]], budget: int, candidates: int,
+                    cached: Collection[str] = ()) -> EnrichmentPlan:
+    """Spend `budget` API calls on the most relevant of the top `candidates`
+
+    Repositories whose languages are already `cached` (by name) cost
+    nothing and are always used; the rest are fetched in relevance order
+    until the budget runs out and deferred after that.
+    """
+    plan = EnrichmentPlan(ranked=rank_repositories(repos, candidates))
+    remaining = budget
+    for repo in plan.ranked:
+        if repo['name'] in cached:
+            plan.cached.append(repo)
+        elif remaining > 0:
+            plan.fetch.append(repo)
+            remaining -= 1
+        else:
+            plan.deferred.append(repo)
+    return plan
@@ -0,0 +1,66 @@
+# src/services/language_aggregation.py
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+
+def language_percentages(byte_counts: Dict[str, int]) -> Dict[str, float]:
+    """Turn a /languages byte-count response into percentages (largest first)"""
+    total = sum(byte_counts.values())
+    if not total:
+        return {}
+    return {
+        language: round(count / total * 100, 2)
+        for language, count in sorted(byte_counts.items(), key=lambda item: item[1], reverse=True)
+    }
+
+
+def estimate_code_ratio(repos_data: List[Dict[str, Any]],
+                        repo_languages: Dict[str, Dict[str, int]]) -> float:
+    """Bytes of code per byte of repository `size`, from the repos we fetched
+
+    `size` includes history and assets, so it overstates code volume; this
+    ratio scales it down to the same units as /languages byte counts.
+    """
+    code_bytes = 0
+    size_bytes = 0
+    for repo in repos_data:
+        languages = repo_languages.get(repo['name'])
+        if languages and repo.get('size'):
+            code_bytes += sum(languages.values())
+            size_bytes += repo['size'] * 1024
+    return code_bytes / size_bytes if size_bytes else 1.0
+
+
+class LanguageAggregate:
+    """Byte totals per language over one user's repositories"""
+
+    def __init__(self):
+        self.bytes = Counter()
+
+    def add_repository(self, byte_counts: Optional[Dict[str, int]],
+                       language: Optional[str] = None, estimated_bytes: int = 0) -> None:
+        """Add one repository's /languages response
+
+        Repositories we did not fetch languages for fall back to their
+        `language` field weighted by `estimated_bytes`, so they still count
+        without spending an extra API call.
+        """
+        if not byte_counts:
+            if not language:
+                return
+            byte_counts = {language: max(int(estimated_bytes), 1)}
+
+        for lang, count in byte_counts.items():
+            if count > 0:
+                self.bytes[lang] += count
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.bytes.values())
+
+    def shares(self, limit: Optional[int] = None) -> Dict[str, float]:
+        """Percentage of all bytes per language, largest first"""
+        return dict(list(language_percentages(self.bytes).items())[:limit])
+
+    def top(self, n: int = 5) -> List[str]:
+        return [language for language, _ in self.bytes.most_common(n)]
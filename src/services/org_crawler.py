@@ -0,0 +1,270 @@
+# src/services/org_crawler.py
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from ..client.scheduler import Priority, request_priority
+from ..exceptions import CircuitOpenError, RateLimitExceeded, UserNotFound
+from .working_analytics_service import ANALYSIS_DEPTHS, DEFAULT_DEPTH
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaPacer:
+    """Spreads work over what is left of GitHub's rate-limit window
+
+    Users start roughly `window / users left in quota` apart, so a crawl
+    never burns the whole quota early and then stalls. Once only `reserve`
+    requests remain it sleeps until the window resets, leaving headroom
+    for the interactive API sharing the same token.
+
+    The spacing is one slot shared by every worker: each wait() takes the
+    next start time and moves it on by delay(), so the crawl as a whole
+    keeps the pace however many workers it runs.
+    """
+
+    def __init__(self, client, cost_per_user: int = 12, reserve: int = 200,
+                 max_delay: float = 60.0):
+        self.client = client
+        self.cost_per_user = max(1, cost_per_user)
+        self.reserve = reserve
+        self.max_delay = max_delay
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    def delay(self, now: Optional[float] = None) -> float:
+        remaining, reset = self.client.quota_remaining, self.client.quota_reset
+        if remaining is None or not reset:
+            return 0.0
+        now = now or time.time()
+        window = max(0.0, reset - now)
+        spendable = remaining - self.reserve
+        if spendable < self.cost_per_user:
+            return window + 1
+        return min(self.max_delay, window * self.cost_per_user / spendable)
+
+    async def wait(self) -> None:
+        async with self._lock:
+            pause = self._next_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            delay = self.delay()
+            if delay > self.max_delay:
+                logger.info(f"GitHub quota nearly spent, pausing {delay:.0f}s until reset")
+                await asyncio.sleep(delay)
+                delay = 0.0
+            self._next_at = time.monotonic() + delay
+
+
+class CrawlCheckpoint:
+    """Crawl progress on disk: enumerated members and who is finished
+
+    Written atomically (temp file + rename) so an interrupted crawl always
+    finds a consistent file to resume from.
+    """
+
+    def __init__(self, path: str, org: str):
+        self.path = path
+        self.org = org
+        self.members: List[str] = []
+        self.members_complete = False
+        self.next_member_page = 1
+        self.done: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: str, org: str) -> "CrawlCheckpoint":
+        checkpoint = cls(path, org)
+        if not os.path.exists(path):
+            return checkpoint
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("org", "").lower() != org.lower():
+            raise ValueError(
+                f"Checkpoint {path} belongs to organization '{data.get('org')}'")
+        checkpoint.members = data.get("members", [])
+        checkpoint.members_complete = data.get("members_complete", False)
+        checkpoint.next_member_page = data.get("next_member_page", 1)
+        checkpoint.done = set(data.get("done", []))
+        checkpoint.failed = data.get("failed", {})
+        return checkpoint
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": 1,
+                "org": self.org,
+                "members": self.members,
+                "members_complete": self.members_complete,
+                "next_member_page": self.next_member_page,
+                "done": sorted(self.done),
+                "failed": self.failed,
+                "saved_at": time.time(),
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def pending(self) -> List[str]:
+        return [m for m in self.members if m.lower() not in self.done]
+
+
+class JsonlExport:
+    """Append-only JSON Lines output, one user per line, flushed as it goes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def exported_users(self) -> Set[str]:
+        """Users already in the file, so a crash between export and checkpoint
+        does not produce duplicate lines on resume"""
+        users = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    users.add(json.loads(line)["username"].lower())
+                except (ValueError, KeyError):
+                    continue  # a line cut short by the interruption
+        return users
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class OrgCrawler:
+    """Analyse every public member of an organization, resumably
+
+    Members are enumerated page by page, then analysed by `concurrency`
+    workers sharing one client, paced by a QuotaPacer. Every result goes
+    to the JSONL export as soon as it is ready and the checkpoint is
+    saved every `checkpoint_every` users, so a restart with the same paths
+    only does the remaining work. Users that fail for transient reasons
+    are recorded in the checkpoint and retried on the next run.
+    """
+
+    def __init__(self, client, service, checkpoint_path: str, export_path: str,
+                 concurrency: int = 5, pacer: Optional[QuotaPacer] = None,
+                 ranking_index=None, checkpoint_every: int = 10,
+                 user_timeout: float = 120.0,
+                 sections: FrozenSet[str] = ANALYSIS_DEPTHS[DEFAULT_DEPTH]):
+        self.client = client
+        self.service = service
+        self.checkpoint_path = checkpoint_path
+        self.export_path = export_path
+        self.concurrency = max(1, concurrency)
+        self.pacer = pacer or QuotaPacer(client)
+        self.ranking_index = ranking_index
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.user_timeout = user_timeout
+        self.sections = sections
+
+    async def run(self, org: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Crawl `org` (optionally only the first `limit` pending members)"""
+        # Below interactive and comparison traffic for quota and connections
+        with request_priority(Priority.BULK):
+            return await self._run(org, limit)
+
+    async def _run(self, org: str, limit: Optional[int]) -> Dict[str, Any]:
+        checkpoint = CrawlCheckpoint.load(self.checkpoint_path, org)
+        export = JsonlExport(self.export_path)
+        started = time.monotonic()
+        analysed = 0
+        try:
+            await self._enumerate_members(org, checkpoint)
+            checkpoint.done |= export.exported_users()
+            pending = checkpoint.pending[:limit]
+            logger.info(f"Crawling {org}: {len(pending)} of {len(checkpoint.members)} "
+                        f"members left")
+
+            queue: asyncio.Queue = asyncio.Queue()
+            for username in pending:
+                queue.put_nowait(username)
+
+            async def worker() -> None:
+                nonlocal analysed
+                while True:
+                    try:
+                        username = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    await self.pacer.wait()
+                    if await self._crawl_user(username, checkpoint, export):
+                        analysed += 1
+                        if analysed % self.checkpoint_every == 0:
+                            checkpoint.save()
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            checkpoint.save()
+            export.close()
+            if self.ranking_index is not None:
+                self.ranking_index.save()
+
+        return {
+            "org": org,
+            "members": len(checkpoint.members),
+            "done": len(checkpoint.done),
+            "failed": len(checkpoint.failed),
+            "analysed_this_run": analysed,
+            "seconds": round(time.monotonic() - started, 1),
+            "quota_remaining": self.client.quota_remaining,
+        }
+
+    async def _enumerate_members(self, org: str, checkpoint: CrawlCheckpoint) -> None:
+        seen = {m.lower() for m in checkpoint.members}
+        while not checkpoint.members_complete:
+            await self.pacer.wait()
+            page = await self.client.get_org_members(org, checkpoint.next_member_page)
+            for member in page:
+                if member["login"].lower() not in seen:
+                    seen.add(member["login"].lower())
+                    checkpoint.members.append(member["login"])
+            checkpoint.next_member_page += 1
+            checkpoint.members_complete = len(page) < 100
+            checkpoint.save()
+
+    async def _crawl_user(self, username: str, checkpoint: CrawlCheckpoint,
+                          export: JsonlExport) -> bool:
+        """Analyse one member; False if it must be retried on a later run"""
+        key = username.lower()
+        try:
+            profile = await asyncio.wait_for(
+                self.service.get_comprehensive_analysis(username, self.sections),
+                timeout=self.user_timeout)
+        except UserNotFound as e:
+            # Gone since enumeration: final, not worth retrying
+            export.write({"username": username, "success": False, "error": str(e)})
+            checkpoint.done.add(key)
+            checkpoint.failed.pop(key, None)
+            return True
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.warning(f"Crawl: {username} failed, will retry on resume: {error}")
+            checkpoint.failed[key] = error
+            if isinstance(e, (RateLimitExceeded, CircuitOpenError)):
+                # Let the quota window or the circuit cool down before going on
+                await asyncio.sleep(max(self.pacer.delay(), 5.0))
+            return False
+
+        data = profile.model_dump(mode="json")
+        export.write({"username": username, "success": True, "data": data})
+        checkpoint.done.add(key)
+        checkpoint.failed.pop(key, None)
+        if self.ranking_index is not None:
+            self.ranking_index.record(data)
+        return True
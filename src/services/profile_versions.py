@@ -0,0 +1,144 @@
+# src/services/profile_versions.py
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# RFC 6902 operations; only add, remove and replace are ever produced
+Patch = List[Dict[str, Any]]
+
+
+def profile_version(data: Dict[str, Any]) -> str:
+    """Content-derived version id: equal profiles always share one"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+
+def _pointer(path: str, token: Any) -> str:
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> Patch:
+    """JSON Patch turning `old` into `new`
+
+    Objects are compared key by key and arrays index by index (with
+    trailing additions or removals), so a changed star count becomes one
+    `replace` deep inside `repository_analysis` rather than a new list.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: Patch = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, _pointer(path, key)))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for index in range(common):
+            ops.extend(json_diff(old[index], new[index], _pointer(path, index)))
+        for index in range(common, len(new)):
+            ops.append({"op": "add", "path": _pointer(path, index), "value": new[index]})
+        # Highest index first so earlier removals do not shift later ones
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": _pointer(path, index)})
+        return ops
+
+    # type() keeps 1, 1.0 and True apart, which == would not
+    if type(old) is not type(new) or old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """Apply a patch from json_diff to a copy of `document`"""
+    document = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            document = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            index = len(target) if last == "-" else int(last)
+            if op["op"] == "add":
+                target.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op["value"])
+    return document
+
+
+class ProfileVersions:
+    """The last `window` distinct versions of each computed profile
+
+    Entries live in a regular cache under the profile's own cache key, so
+    with CACHE_BACKEND=redis every worker can answer a delta against a
+    version another worker served. A client whose version has fallen out
+    of the window (or expired) simply gets the full document again.
+    """
+
+    def __init__(self, cache, window: int = 5, ttl: int = 24 * 3600):
+        self.cache = cache
+        self.window = max(1, window)
+        self.ttl = ttl
+
+    async def record(self, key: str, data: Dict[str, Any],
+                     version: Optional[str] = None) -> str:
+        """Version id of `data` (computed unless given), remembering it if it is new"""
+        version = version or profile_version(data)
+        versions = await self.cache.get(key) or []
+        if versions and versions[-1]["version"] == version:
+            return version
+        versions = [v for v in versions if v["version"] != version]
+        versions.append({"version": version, "data": data})
+        await self.cache.set(key, versions[-self.window:], ttl=self.ttl)
+        return version
+
+    async def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        for entry in await self.cache.get(key) or []:
+            if entry["version"] == version:
+                return entry["data"]
+        return None
+
+    async def delta(self, key: str, data: Dict[str, Any], since: Optional[str] = None,
+                    version: Optional[str] = None) -> Dict[str, Any]:
+        """Describe `data` relative to the client's `since`
+
+        Returns `{"version", "data"}` for a full document, or
+        `{"version", "base", "patch"}` when `since` is still known and the
+        patch is smaller than the document it replaces.
+
+        A `version` means `data` was recorded when it was stored (see
+        cache_profile), so a cache hit costs no hashing and, unless the
+        client is behind, no lookup. Without one `data` is recorded here.
+        """
+        if version is None:
+            version = await self.record(key, data)
+        if not since:
+            return {"version": version, "data": data}
+        if since == version:
+            return {"version": version, "base": since, "patch": []}
+        base = await self.get(key, since)
+        if base is None:
+            return {"version": version, "data": data}
+        patch = json_diff(base, data)
+        if len(json.dumps(patch)) >= len(json.dumps(data)):
+            return {"version": version, "data": data}
+        return {"version": version, "base": since, "patch": patch}
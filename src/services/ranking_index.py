@@ -0,0 +1,237 @@
+# src/services/ranking_index.py
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+
+logger = logging.getLogger(__name__)
+
+# Scores kept in the index, read from the profile or its metrics
+RANKED_METRICS = (
+    "community_impact",
+    "activity_score",
+    "followers",
+    "total_stars",
+    "total_forks",
+)
+
+GLOBAL_SCOPE = "global"
+
+
+def _language_scope(language: str) -> str:
+    return f"lang:{language.lower()}"
+
+
+class RankingIndex:
+    """Sorted score distributions for percentile and leaderboard queries
+
+    Each (scope, metric) pair keeps a SortedList of (score, username)
+    tuples in ascending order, so inserts and percentiles are logarithmic
+    and top-K is a slice off the end. Scopes are the global population
+    plus one per primary language. Re-analysing a user replaces their
+    previous entry.
+    """
+
+    def __init__(self, path: Optional[str] = None, save_interval: float = 30.0):
+        self.path = path
+        self.save_interval = save_interval
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._sorted: Dict[Tuple[str, str], SortedList] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_saved = 0.0
+
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+
+    def record(self, profile: Dict[str, Any]) -> None:
+        """Add or replace a user's scores from a serialised DeveloperProfile"""
+        username = profile["username"].lower()
+        metrics = profile.get("metrics", {})
+        scores = {}
+        for metric in RANKED_METRICS:
+            value = profile.get(metric, metrics.get(metric))
+            if isinstance(value, (int, float)):
+                scores[metric] = float(value)
+        languages = profile.get("primary_languages") or []
+        entry = {
+            "login": profile["username"],
+            "language": languages[0] if languages else None,
+            "scores": scores,
+            "analyzed_at": time.time(),
+        }
+
+        with self._lock:
+            previous = self._entries.get(username)
+            if previous and all(previous[k] == entry[k] for k in ("login", "language", "scores")):
+                previous["analyzed_at"] = entry["analyzed_at"]
+                return
+            self._replace(username, entry)
+            self._dirty = True
+        self._maybe_save()
+
+    def percentile(self, username: str, metric: str,
+                   language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Where a user sits in the global or per-language distribution"""
+        with self._lock:
+            entry = self._entries.get(username.lower())
+            if not entry or metric not in entry["scores"]:
+                return None
+            scope = _language_scope(language) if language else GLOBAL_SCOPE
+            values = self._sorted.get((scope, metric))
+            if not values:
+                return None
+            score = entry["scores"][metric]
+            below = values.bisect_left((score, ""))
+            above = len(values) - values.bisect_right((score, "\uffff"))
+            total = len(values)
+
+        return {
+            "score": score,
+            "rank": above + 1,
+            "total": total,
+            "percentile": round(below / total * 100, 2),
+            "top_percent": round((above + 1) / total * 100, 2),
+        }
+
+    def rankings(self, username: str) -> Optional[Dict[str, Any]]:
+        """Percentiles for every metric, globally and within the primary language"""
+        with self._lock:
+            entry = self._entries.get(username.lower())
+            if not entry:
+                return None
+            language = entry["language"]
+            result = {
+                "username": entry["login"],
+                "language": language,
+                "global": {},
+                "language_rankings": {},
+            }
+            for metric in entry["scores"]:
+                result["global"][metric] = self.percentile(username, metric)
+                if language:
+                    result["language_rankings"][metric] = self.percentile(
+                        username, metric, language)
+        return result
+
+    def leaderboard(self, metric: str, language: Optional[str] = None,
+                    limit: int = 10) -> List[Dict[str, Any]]:
+        """Top-K users for a metric, highest first"""
+        scope = _language_scope(language) if language else GLOBAL_SCOPE
+        with self._lock:
+            values = self._sorted.get((scope, metric), [])
+            top = values[-limit:][::-1] if limit > 0 else []
+            board = []
+            for position, (score, username) in enumerate(top, start=1):
+                board.append({
+                    "rank": position,
+                    "username": self._entries[username]["login"],
+                    "language": self._entries[username]["language"],
+                    "score": score,
+                })
+        return board
+
+    def size(self, language: Optional[str] = None) -> int:
+        scope = _language_scope(language) if language else GLOBAL_SCOPE
+        with self._lock:
+            return len(self._sorted.get((scope, RANKED_METRICS[0]), []))
+
+    def _scopes(self, entry: Dict[str, Any]) -> List[str]:
+        scopes = [GLOBAL_SCOPE]
+        if entry["language"]:
+            scopes.append(_language_scope(entry["language"]))
+        return scopes
+
+    def _insert(self, username: str, entry: Dict[str, Any]) -> None:
+        for scope in self._scopes(entry):
+            for metric, score in entry["scores"].items():
+                self._sorted.setdefault((scope, metric), SortedList()).add(
+                    (score, username))
+
+    def _remove(self, username: str, entry: Dict[str, Any]) -> None:
+        for scope in self._scopes(entry):
+            for metric, score in entry["scores"].items():
+                values = self._sorted.get((scope, metric))
+                if values is not None:
+                    values.discard((score, username))
+
+    def _replace(self, username: str, entry: Dict[str, Any]) -> None:
+        previous = self._entries.get(username)
+        if previous:
+            self._remove(username, previous)
+        self._entries[username] = entry
+        self._insert(username, entry)
+
+    def _maybe_save(self) -> None:
+        if self.path and time.time() - self._last_saved >= self.save_interval:
+            self.save()
+
+    def save(self) -> None:
+        """Write entries to disk atomically (sorted lists are rebuilt on load)
+
+        Other worker processes write the same file, so it is merged in
+        first: whichever process analysed a user last wins. The file is
+        read before taking the lock so queries are not held up by disk I/O.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+        on_disk = self._read_entries()
+        with self._lock:
+            for username, entry in on_disk.items():
+                current = self._entries.get(username)
+                if current is None or (entry.get("analyzed_at", 0.0)
+                                       > current.get("analyzed_at", 0.0)):
+                    self._replace(username, entry)
+            snapshot = json.dumps({"version": 1, "entries": self._entries})
+            self._dirty = False
+            self._last_saved = time.time()
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save ranking index to {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load ranking index from {self.path}: {e}")
+            return {}
+
+    def load(self) -> None:
+        """Rebuild the index from the file written by save()"""
+        entries = self._read_entries()
+        if not entries:
+            return
+
+        with self._lock:
+            self._entries = entries
+            values: Dict[Tuple[str, str], List[Tuple[float, str]]] = {}
+            for username, entry in entries.items():
+                for scope in self._scopes(entry):
+                    for metric, score in entry["scores"].items():
+                        values.setdefault((scope, metric), []).append((score, username))
+            self._sorted = {key: SortedList(scores) for key, scores in values.items()}
+            self._last_saved = time.time()
+        logger.info(f"Loaded {len(entries)} users into ranking index")
@@ -0,0 +1,185 @@
+# src/services/webhooks.py
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ..client.github_client import (github_cache_key, languages_endpoint, user_endpoint,
+                                    user_repos_endpoint)
+from .comparison_service import profile_cache_keys
+
+
+logger = logging.getLogger(__name__)
+
+# Events we subscribe to; anything else is acknowledged and ignored
+HANDLED_EVENTS = ("ping", "push", "star", "watch", "fork", "repository")
+
+# Repository fields copied from a webhook into the cached /repos listing
+_REPO_FIELDS = ("stargazers_count", "forks_count", "watchers_count", "size", "language",
+                "updated_at", "pushed_at", "description", "has_issues", "has_wiki",
+                "archived", "fork", "open_issues_count")
+
+# Push payloads send these as epoch seconds, the REST API as ISO strings
+_TIMESTAMP_FIELDS = ("updated_at", "pushed_at")
+
+# Listing pages that may hold a repository (see get_user_repositories)
+MAX_LISTING_PAGES = 10
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check X-Hub-Signature-256 (HMAC-SHA256 of the raw body)"""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def _rest_fields(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """The repository fields we cache, in the shape the REST API returns them"""
+    fields = {f: repo[f] for f in _REPO_FIELDS if f in repo}
+    for f in _TIMESTAMP_FIELDS:
+        if isinstance(fields.get(f), (int, float)):
+            fields[f] = datetime.fromtimestamp(fields[f], timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ")
+    return fields
+
+
+def _logins(payload: Dict[str, Any]) -> List[str]:
+    """Accounts a delivery refers to: sender, repository owner and forker"""
+    accounts = (payload.get("sender"), (payload.get("repository") or {}).get("owner"),
+                (payload.get("forkee") or {}).get("owner"))
+    return list(dict.fromkeys(a["login"] for a in accounts
+                              if isinstance(a, dict) and a.get("login")))
+
+
+class _Changes:
+    def __init__(self):
+        self.updated: List[str] = []
+        self.invalidated: List[str] = []
+
+
+class WebhookProcessor:
+    """Keeps cached GitHub payloads and computed profiles in step with webhooks
+
+    Raw payloads are patched in place where the webhook carries the new
+    values (stars, forks, push times, repository metadata) and deleted
+    where it does not (languages after a push, listings after a repository
+    is created or removed). Computed profiles of the affected users are
+    dropped; they are rebuilt from the patched payloads, usually without
+    any GitHub call. Stale-fallback copies are deliberately kept. Every
+    account named in a delivery exists, so it is dropped from the
+    negative cache of users GitHub had answered 404 for.
+    """
+
+    def __init__(self, github_cache, profile_cache, missing_users=None):
+        self.github_cache = github_cache
+        self.profile_cache = profile_cache
+        self.missing_users = missing_users
+
+    async def handle(self, event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        changes = _Changes()
+        action = payload.get("action")
+        repo = payload.get("repository") or {}
+        owner = (repo.get("owner") or {}).get("login")
+
+        if self.missing_users is not None:
+            for login in _logins(payload):
+                await self.missing_users.discard(login)
+
+        if event in ("push", "star", "watch") and owner:
+            await self._patch_repository(changes, owner, repo)
+            if event == "push":
+                # New commits can change the language mix
+                await self._delete(changes, languages_endpoint(owner, repo["name"]))
+            await self._invalidate_profiles(changes, owner)
+
+        elif event == "fork" and owner:
+            await self._patch_repository(changes, owner, repo)
+            await self._invalidate_profiles(changes, owner)
+            forker = ((payload.get("forkee") or {}).get("owner") or {}).get("login")
+            if forker:
+                # The fork is a brand new repository in the forker's listing
+                await self._forget_listing(changes, forker)
+                await self._invalidate_profiles(changes, forker)
+
+        elif event == "repository" and owner:
+            if action == "edited":
+                await self._patch_repository(changes, owner, repo)
+            else:
+                # created, deleted, renamed, transferred, (un)archived, publicized,
+                # privatized: the listing and the public_repos count both change
+                await self._forget_listing(changes, owner)
+                await self._delete(changes, languages_endpoint(owner, repo["name"]))
+                renamed = (payload.get("changes") or {}).get("repository") or {}
+                old_name = (renamed.get("name") or {}).get("from")
+                if old_name:
+                    await self._delete(changes, languages_endpoint(owner, old_name))
+            await self._invalidate_profiles(changes, owner)
+
+        handled = event in HANDLED_EVENTS
+        if handled and event != "ping":
+            logger.info(f"Webhook {event}/{action or '-'} for {owner}: "
+                        f"{len(changes.updated)} updated, {len(changes.invalidated)} invalidated")
+        return {
+            "event": event,
+            "action": action,
+            "handled": handled,
+            "updated": changes.updated,
+            "invalidated": changes.invalidated,
+        }
+
+    async def _patch_repository(self, changes: _Changes, owner: str,
+                                repo: Dict[str, Any]) -> None:
+        """Update the repository in whichever cached listing page holds it
+
+        The page is patched as a copy (a MemoryCache hands out the stored
+        list itself) and written back with the expiry it had, so webhooks
+        never extend how long a listing is trusted. Listings are sorted by
+        `updated_at`, newest first: the page is re-sorted, and a repository
+        that now belongs on an earlier page drops the whole listing.
+        """
+        for page in range(1, MAX_LISTING_PAGES + 1):
+            endpoint = user_repos_endpoint(owner, page)
+            key = github_cache_key(endpoint)
+            listing = await self.github_cache.get(key)
+            if listing is None:
+                return
+            for index, cached in enumerate(listing):
+                same_id = repo.get("id") is not None and cached.get("id") == repo["id"]
+                if same_id or cached.get("name") == repo.get("name"):
+                    patched = {**cached, **_rest_fields(repo)}
+                    listing = listing[:index] + [patched] + listing[index + 1:]
+                    listing.sort(key=lambda r: r.get("updated_at") or "", reverse=True)
+                    moved = patched.get("updated_at") != cached.get("updated_at")
+                    if page > 1 and moved and listing[0] is patched:
+                        await self._forget_listing(changes, owner)
+                        return
+                    ttl = await self.github_cache.ttl(key)
+                    if ttl is None:
+                        return  # expired meanwhile
+                    await self.github_cache.set(key, listing, ttl=ttl)
+                    changes.updated.append(endpoint)
+                    return
+            if len(listing) < 100:
+                return
+
+    async def _forget_listing(self, changes: _Changes, owner: str) -> None:
+        await self._delete(changes, user_endpoint(owner))
+        for page in range(1, MAX_LISTING_PAGES + 1):
+            endpoint = user_repos_endpoint(owner, page)
+            if await self.github_cache.get(github_cache_key(endpoint)) is None:
+                return
+            await self._delete(changes, endpoint)
+
+    async def _delete(self, changes: _Changes, endpoint: str) -> None:
+        key = github_cache_key(endpoint)
+        if await self.github_cache.get(key) is not None:
+            await self.github_cache.delete(key)
+            changes.invalidated.append(endpoint)
+
+    async def _invalidate_profiles(self, changes: _Changes, username: str) -> None:
+        for key in profile_cache_keys(username):
+            if await self.profile_cache.get(key) is not None:
+                await self.profile_cache.delete(key)
+                changes.invalidated.append(key)
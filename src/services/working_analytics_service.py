@@ -1,66 +1,154 @@
 # src/services/working_analytics_service.py
 import asyncio
-from typing import List, Dict, Any
+import logging
+from typing import FrozenSet, Iterable, List, Dict, Any, Optional
 from datetime import datetime
 from collections import Counter
 from ..client.github_client import AsyncGitHubClient
 from ..models import DeveloperProfile, RepositoryAnalysis, SkillLevel
+from .enrichment_planner import EnrichmentPlan, plan_enrichment, rank_repositories
+from .language_aggregation import LanguageAggregate, estimate_code_ratio, language_percentages
+
+
+logger = logging.getLogger(__name__)
+
+# Optional parts of an analysis and what they cost
+#   languages:    /languages calls for the most relevant repositories,
+#                 up to the enrichment budget
+#   repositories: the per-repository `repository_analysis` list
+ANALYSIS_SECTIONS = ("languages", "repositories")
+
+# Each depth adds to the one before: summary is the profile and repository
+# list (2 calls), standard ranks the repositories from that same list at no
+# extra cost, full adds the /languages calls
+ANALYSIS_DEPTHS = {
+    "summary": frozenset(),
+    "standard": frozenset({"repositories"}),
+    "full": frozenset(ANALYSIS_SECTIONS),
+}
+
+DEFAULT_DEPTH = "full"
+
+
+def resolve_sections(depth: Optional[str] = None,
+                     fields: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """Sections to compute for a `depth` level or an explicit `fields` list
+
+    `fields` wins over `depth`; raises ValueError for unknown names and
+    for values that are not a string or a list of strings (JSON bodies).
+    """
+    if fields is not None:
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        if not isinstance(fields, (list, tuple, set, frozenset)) or not all(
+                isinstance(f, str) for f in fields):
+            raise ValueError("fields must be a comma separated string or a list of strings")
+        sections = frozenset(f.strip() for f in fields if f.strip())
+        unknown = sections - set(ANALYSIS_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return sections
+    depth = depth or DEFAULT_DEPTH
+    if not isinstance(depth, str) or depth not in ANALYSIS_DEPTHS:
+        raise ValueError(f"Unknown depth '{depth}'")
+    return ANALYSIS_DEPTHS[depth]
+
+
+def select_sections(data: Dict[str, Any], sections: FrozenSet[str]) -> Dict[str, Any]:
+    """Drop unrequested sections from a serialised profile computed at a higher depth"""
+    data = dict(data)
+    if "repositories" not in sections:
+        data["repository_analysis"] = []
+    elif "languages" not in sections:
+        data["repository_analysis"] = [
+            {**repo, "language_percentages": {}} for repo in data.get("repository_analysis", [])]
+    if "languages" not in sections:
+        data["metrics"] = {k: v for k, v in data.get("metrics", {}).items()
+                           if k not in ("language_breakdown", "enrichment")}
+    return data
 
 
 class WorkingAnalyticsService:
     """Analytics service that definitely works - based on the minimal test"""
 
-    def __init__(self, client: AsyncGitHubClient):
+    def __init__(self, client: AsyncGitHubClient, enrichment_budget: int = 10,
+                 enrichment_candidates: int = 30, repository_limit: int = 10,
+                 repository_pages: int = 1):
         self.client = client
+        self.repository_pages = repository_pages
+        self.enrichment_budget = enrichment_budget
+        self.enrichment_candidates = enrichment_candidates
+        self.repository_limit = repository_limit
 
-    async def get_comprehensive_analysis(self, username: str) -> DeveloperProfile:
-        """Working analysis based on the minimal test approach"""
-        try:
-            print(f"🔍 WORKING: Starting analysis for {username}")
+    async def get_comprehensive_analysis(self, username: str,
+                                         sections: FrozenSet[str] = ANALYSIS_DEPTHS[DEFAULT_DEPTH]
+                                         ) -> DeveloperProfile:
+        """Working analysis based on the minimal test approach
 
+        Only the requested `sections` are fetched and computed; the headline
+        numbers always come from the profile and repository list alone.
+        """
+        try:
             # Get user data and repositories
             user_data = await self.client.get_user_profile(username)
-            repos_data = await self.client.get_user_repositories(username)
+            repos_data = await self.client.get_user_repositories(
+                username, self.repository_pages)
+
+            logger.debug(f"Got {len(repos_data)} repositories for {username}")
 
-            print(
-                f"✅ WORKING: Got {len(repos_data)} repositories for {username}")
+            # Spend the /languages budget on the most relevant repositories
+            repo_languages = {}
+            plan = None
+            if "languages" in sections:
+                plan = await self._plan_enrichment(username, repos_data)
+                # Concurrent; the client's scheduler bounds how many are in flight
+                repos = plan.cached + plan.fetch
+                results = await asyncio.gather(
+                    *(self.client.get_repository_languages(username, repo['name'])
+                      for repo in repos),
+                    return_exceptions=True)
+                for repo, result in zip(repos, results):
+                    if isinstance(result, BaseException):
+                        logger.warning(
+                            f"Could not get languages for {repo['name']}: {result}")
+                    else:
+                        repo_languages[repo['name']] = result
 
-            # Create basic repository analyses
+            # Create basic repository analyses for the most relevant repositories
             repo_analyses = []
-            for repo in repos_data[:10]:  # Limit to 10 repos for performance
-                try:
-                    # Try to get languages, but skip if it fails
-                    languages = {}
+            if "repositories" in sections:
+                for repo in rank_repositories(repos_data, self.repository_limit):
                     try:
-                        languages = await self.client.get_repository_languages(username, repo['name'])
-                    except Exception as lang_error:
-                        print(
-                            f"⚠️  Could not get languages for {repo['name']}: {lang_error}")
-
-                    analysis = RepositoryAnalysis(
-                        name=repo['name'],
-                        stars=repo.get('stargazers_count', 0),
-                        forks=repo.get('forks_count', 0),
-                        language=repo.get('language'),
-                        language_percentages=languages,
-                        last_updated=datetime.fromisoformat(
-                            repo['updated_at'].replace('Z', '+00:00')),
-                        has_issues=repo.get('has_issues', False),
-                        has_wiki=repo.get('has_wiki', False),
-                        is_fork=repo.get('fork', False),
-                        size_kb=repo.get('size', 0)
-                    )
-                    repo_analyses.append(analysis)
-                    print(f"✅ Analyzed repository: {repo['name']}")
-
-                except Exception as e:
-                    print(
-                        f"⚠️  Failed to analyze repo {repo.get('name', 'unknown')}: {e}")
-                    continue
+                        analysis = RepositoryAnalysis(
+                            name=repo['name'],
+                            stars=repo.get('stargazers_count', 0),
+                            forks=repo.get('forks_count', 0),
+                            language=repo.get('language'),
+                            language_percentages=language_percentages(
+                                repo_languages.get(repo['name'], {})),
+                            last_updated=datetime.fromisoformat(
+                                repo['updated_at'].replace('Z', '+00:00')),
+                            has_issues=repo.get('has_issues', False),
+                            has_wiki=repo.get('has_wiki', False),
+                            is_fork=repo.get('fork', False),
+                            size_kb=repo.get('size', 0)
+                        )
+                        repo_analyses.append(analysis)
+
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to analyze repo {repo.get('name', 'unknown')}: {e}")
+                        continue
 
             # Calculate metrics
             metrics = self._calculate_metrics(user_data, repos_data)
-            primary_languages = self._get_primary_languages(repos_data)
+            language_aggregate = self._aggregate_languages(
+                repos_data, repo_languages)
+            if plan is not None:
+                metrics["language_breakdown"] = language_aggregate.shares(10)
+                metrics["enrichment"] = plan.summary(self.enrichment_budget)
+            primary_languages = self._get_primary_languages(
+                repos_data, language_aggregate)
             skill_level = self._calculate_skill_level(metrics)
             activity_score = self._calculate_activity_score(repos_data)
             community_impact = self._calculate_community_impact(metrics)
@@ -83,15 +171,24 @@ class WorkingAnalyticsService:
                 metrics=metrics
             )
 
-            print(f"🎉 WORKING: Successfully created profile for {username}")
             return profile
 
         except Exception as e:
-            print(f"❌ WORKING: Error analyzing {username}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            # The caller decides how loudly to report it
+            logger.debug(f"Analysis of {username} failed: {e}")
             raise
 
+    async def _plan_enrichment(self, username: str,
+                               repos_data: List[Dict[str, Any]]) -> EnrichmentPlan:
+        """Rank repositories and split them into cached, fetch-now and deferred"""
+        candidates = rank_repositories(repos_data, self.enrichment_candidates)
+        hits = await asyncio.gather(
+            *(self.client.cached_repository_languages(username, repo['name'])
+              for repo in candidates))
+        cached = {repo['name'] for repo, hit in zip(candidates, hits) if hit is not None}
+        return plan_enrichment(candidates, self.enrichment_budget,
+                               self.enrichment_candidates, cached)
+
     def _calculate_metrics(self, user_data: Dict[str, Any], repos_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate basic metrics"""
         total_stars = sum(repo.get('stargazers_count', 0)
@@ -108,8 +205,24 @@ class WorkingAnalyticsService:
             "languages_used": len(set(repo.get('language') for repo in repos_data if repo.get('language')))
         }
 
-    def _get_primary_languages(self, repos_data: List[Dict[str, Any]]) -> List[str]:
-        """Get primary programming languages"""
+    def _aggregate_languages(self, repos_data: List[Dict[str, Any]],
+                             repo_languages: Dict[str, Dict[str, int]]) -> LanguageAggregate:
+        """Sum /languages byte counts across all repositories"""
+        aggregate = LanguageAggregate()
+        code_ratio = estimate_code_ratio(repos_data, repo_languages)
+        for repo in repos_data:
+            aggregate.add_repository(
+                repo_languages.get(repo['name']),
+                language=repo.get('language'),
+                estimated_bytes=repo.get('size', 0) * 1024 * code_ratio)
+        return aggregate
+
+    def _get_primary_languages(self, repos_data: List[Dict[str, Any]],
+                               language_aggregate: LanguageAggregate = None) -> List[str]:
+        """Get primary programming languages by share of bytes"""
+        if language_aggregate and language_aggregate.total_bytes:
+            return language_aggregate.top(5)
+
         languages = [repo.get('language')
                      for repo in repos_data if repo.get('language')]
         return [lang for lang, _ in Counter(languages).most_common(5)]
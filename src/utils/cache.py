@@ -1,3 +1,5 @@
+import asyncio
+import json
 import logging
 import time
 from typing import Any, Optional
@@ -36,3 +38,82 @@ class MemoryCache:
         if key in self._storage:
             del self._storage[key]
         return True
+
+    async def ttl(self, key: str) -> Optional[float]:
+        """Seconds until `key` expires, or None if it is not cached"""
+        data = self._storage.get(key)
+        if not data:
+            return None
+        remaining = data['expires'] - time.time()
+        return remaining if remaining > 0 else None
+
+
+class RedisCache:
+    """Redis-backed cache shared by every worker process
+
+    Values are stored as JSON, so only JSON-serialisable payloads (GitHub
+    responses, dumped profiles) should go through it. Redis errors are
+    logged and treated as misses so an outage degrades to uncached calls.
+
+    Calls run on a worker thread so a slow Redis never stalls the event
+    loop; the client's connection pool is thread-safe, which also keeps it
+    usable from the Flask views' per-request loops. `timeout` bounds both
+    connecting and every command.
+    """
+
+    def __init__(self, url: str, namespace: str = "cache", timeout: float = 2.0):
+        import redis
+
+        self.namespace = namespace
+        self._client = redis.Redis.from_url(
+            url, socket_connect_timeout=timeout, socket_timeout=timeout)
+
+    def _key(self, key: str) -> str:
+        return f"gha:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await asyncio.to_thread(self._client.get, self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache get failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        try:
+            await asyncio.to_thread(self._client.set, self._key(key),
+                                    json.dumps(value, default=str), ex=max(1, int(ttl)))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set failed: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self._client.delete, self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache delete failed: {e}")
+        return True
+
+    async def ttl(self, key: str) -> Optional[float]:
+        try:
+            remaining = await asyncio.to_thread(self._client.ttl, self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache ttl failed: {e}")
+            return None
+        # -2: no such key, -1: no expiry (never set by this class)
+        return remaining if remaining and remaining > 0 else None
+
+
+def create_cache(namespace: str, backend: str = "memory", url: Optional[str] = None):
+    """Build the cache configured for this deployment
+
+    `memory` keeps entries per process (development); `redis` shares them
+    between every worker and node pointing at the same server.
+    """
+    if backend == "redis":
+        try:
+            return RedisCache(url, namespace=namespace)
+        except ImportError:
+            logger.warning("redis is not installed, falling back to MemoryCache")
+    return MemoryCache()
@@ -0,0 +1,132 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, ~`error_rate` false positives"""
+
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+
+class NegativeCache:
+    """Usernames GitHub recently answered 404 for
+
+    The exact entries live in a bounded LRU with a short TTL, so a name
+    that gets registered later is only rejected until its entry expires
+    (or until a webhook shows the account exists, see `discard`). A Bloom
+    filter in front lets lookups for the (usual) existing users return
+    without touching the LRU or its lock. The filter cannot forget, so it
+    is rebuilt from the live entries once it has taken twice as many
+    additions as the LRU holds: it is sized for that, which keeps the
+    rebuilds amortised O(1) and the error rate as configured. A stale
+    bit only costs one exact lookup.
+
+    With a shared `store` (a cache from create_cache, e.g. Redis) the
+    entries live there instead, so a 404 seen by one worker saves every
+    worker the request and a discard clears the name everywhere. Callers
+    check only when they were about to ask GitHub anyway, so the extra
+    round trip is never paid on a cache hit.
+    """
+
+    def __init__(self, ttl: int = 600, max_entries: int = 10_000,
+                 error_rate: float = 0.01, store=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.error_rate = error_rate
+        self.store = store
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self.filter_capacity = 2 * max_entries
+        self._filter = BloomFilter(self.filter_capacity, error_rate)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.filter_passes = 0
+
+    async def is_missing(self, username: str) -> bool:
+        key = username.lower()
+        if self.store is not None:
+            missing = bool(await self.store.get(key))
+        else:
+            missing = self._is_missing_locally(key)
+        if missing:
+            with self._lock:
+                self.hits += 1
+        return missing
+
+    async def add(self, username: str) -> None:
+        key = username.lower()
+        if self.store is not None:
+            await self.store.set(key, True, ttl=self.ttl)
+            return
+        with self._lock:
+            self._entries[key] = time.time() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._filter.count >= self.filter_capacity:
+                self._rebuild_filter()
+            self._filter.add(key)
+
+    async def discard(self, username: str) -> None:
+        """Forget `username`, e.g. once a webhook shows the account exists"""
+        key = username.lower()
+        if self.store is not None:
+            await self.store.delete(key)
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _is_missing_locally(self, key: str) -> bool:
+        if key not in self._filter:
+            with self._lock:
+                self.filter_passes += 1
+            return False
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def _rebuild_filter(self) -> None:
+        now = time.time()
+        self._entries = OrderedDict(
+            (key, expires) for key, expires in self._entries.items() if expires > now)
+        self._filter = BloomFilter(self.filter_capacity, self.error_rate)
+        for key in self._entries:
+            self._filter.add(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "filter_passes": self.filter_passes,
+                "filter_bytes": len(self._filter._bits),
+            }
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_lock = threading.Lock()
+
+
+def configure_process_pool(workers: int) -> None:
+    """Set the pool size; 0 runs CPU-bound work inline in the calling process"""
+    global _pool_size
+    shutdown_process_pool()
+    _pool_size = max(0, workers)
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Create the pool on first use, so it is never inherited across a fork"""
+    global _pool
+    if _pool_size <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            # spawn: forking a threaded web worker is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_size,
+                mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Started process pool with {_pool_size} workers")
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def reset_process_pool() -> None:
+    """Forget a pool object inherited from a parent process without touching it"""
+    global _pool
+    _pool = None
+
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a picklable function in the process pool (or inline if disabled)"""
+    pool = get_process_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        logger.warning("Process pool broke, running task inline")
+        shutdown_process_pool()
+        return func(*args, **kwargs)
@@ -0,0 +1,175 @@
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_limit(spec: str) -> Tuple[int, int]:
+    """Parse "10 per minute" / "100/hour" into (amount, period in seconds)"""
+    match = re.match(r"^\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*$", spec)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {spec!r}")
+    return int(match.group(1)), _PERIODS[match.group(2)]
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+
+
+class MemoryRateLimitStorage:
+    """Fixed-window counters in this process (development and tests)"""
+
+    def __init__(self):
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, amount: int, expiry: int) -> int:
+        now = time.time()
+        with self._lock:
+            count, expires = self._counters.get(key, (0, 0.0))
+            if expires <= now:
+                count, expires = 0, now + expiry
+            count += amount
+            self._counters[key] = (count, expires)
+            if len(self._counters) > 10000:
+                self._counters = {k: v for k, v in self._counters.items()
+                                  if v[1] > now}
+            return count
+
+
+class RedisRateLimitStorage:
+    """Fixed-window counters shared by every worker and node"""
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        import redis
+
+        self._client = redis.Redis.from_url(
+            url, socket_connect_timeout=timeout, socket_timeout=timeout)
+
+    def incr(self, key: str, amount: int, expiry: int) -> int:
+        # Keys are per window, so refreshing the expiry on every increment
+        # only keeps a finished window around a little longer
+        pipe = self._client.pipeline()
+        pipe.incrby(f"gha:ratelimit:{key}", amount)
+        pipe.expire(f"gha:ratelimit:{key}", expiry)
+        count, _ = pipe.execute()
+        return int(count)
+
+
+class _Lease:
+    __slots__ = ("window", "tokens", "exhausted", "batch", "claimed_at", "shared_remaining")
+
+    def __init__(self, window: int, amount: int):
+        self.window = window
+        self.tokens = 0
+        self.exhausted = False
+        self.batch = 0
+        self.claimed_at = 0.0
+        # Unclaimed tokens in the shared window as of this worker's last claim
+        self.shared_remaining = amount
+
+
+class RateLimiter:
+    """Shared fixed-window limits with a per-process token lease
+
+    The shared storage holds one counter per (key, window). Instead of
+    incrementing it on every request, a worker claims a batch of tokens
+    at once and spends them locally, so a busy client only pays a round
+    trip to the storage about once every `lease_size` requests. Once the
+    storage says the window is used up, the worker rejects locally until
+    the window rolls over. Tokens are only ever granted out of the shared
+    counter, so the global limit is never exceeded.
+
+    Tokens leased by a worker the client then stops reaching are lost to
+    it for the rest of the window, so batches start at one token and only
+    double while the worker spends each lease within `lease_seconds`, and
+    never exceed `lease_fraction` of what the window has left. A client
+    spread over many workers is therefore rejected at most a few tokens
+    early. `remaining` is the shared count as of the worker's last claim
+    plus its own unspent tokens.
+    """
+
+    def __init__(self, storage, lease_size: int = 10, lease_fraction: float = 0.1,
+                 lease_seconds: float = 1.0):
+        self.storage = storage
+        self.lease_size = max(1, lease_size)
+        self.lease_fraction = lease_fraction
+        self.lease_seconds = lease_seconds
+        self._leases: Dict[Tuple[str, str], _Lease] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, spec: str) -> RateLimitResult:
+        amount, period = parse_limit(spec)
+        now = time.time()
+        window = int(now // period)
+        reset_after = (window + 1) * period - now
+        lease_key = (key, spec)
+
+        with self._lock:
+            lease = self._leases.get(lease_key)
+            if lease is None or lease.window != window:
+                lease = _Lease(window, amount)
+                self._leases[lease_key] = lease
+                self._prune(now)
+            if lease.tokens > 0:
+                lease.tokens -= 1
+                return RateLimitResult(True, amount, lease.shared_remaining + lease.tokens,
+                                       reset_after)
+            if lease.exhausted:
+                return RateLimitResult(False, amount, 0, reset_after)
+            batch = lease.batch * 2 if now - lease.claimed_at < self.lease_seconds else 1
+            batch = max(1, min(batch, self.lease_size,
+                               int(lease.shared_remaining * self.lease_fraction)))
+            lease.batch = batch
+            lease.claimed_at = now
+
+        try:
+            total = self.storage.incr(f"{key}:{spec}:{window}", batch, period + 1)
+        except Exception as e:
+            # Fail open: an unavailable limiter backend must not take the API down
+            logger.warning(f"Rate limit storage unavailable: {e}")
+            return RateLimitResult(True, amount, amount, reset_after)
+
+        granted = max(0, min(batch, amount - (total - batch)))
+        with self._lock:
+            if lease.window != window:
+                # The lease rolled over while we were waiting on the storage
+                return RateLimitResult(granted > 0, amount, 0, reset_after)
+            lease.tokens += granted
+            lease.shared_remaining = max(0, amount - total)
+            if granted < batch:
+                lease.exhausted = True
+            if lease.tokens > 0:
+                lease.tokens -= 1
+                return RateLimitResult(True, amount, lease.shared_remaining + lease.tokens,
+                                       reset_after)
+        return RateLimitResult(False, amount, 0, reset_after)
+
+    def _prune(self, now: float) -> None:
+        if len(self._leases) < 10000:
+            return
+        self._leases = {
+            (key, spec): lease for (key, spec), lease in self._leases.items()
+            if lease.window == int(now // parse_limit(spec)[1])
+        }
+
+
+def create_rate_limit_storage(backend: str = "memory", url: str = None):
+    """Storage for the configured backend: "memory" or "redis" (REDIS_URL)"""
+    if backend == "redis":
+        try:
+            return RedisRateLimitStorage(url)
+        except ImportError:
+            logger.warning("redis is not installed, rate limits are per process")
+    return MemoryRateLimitStorage()
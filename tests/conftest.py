@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Settings are read once at import time: keep the suite self-contained
+os.environ.setdefault("SECRET_KEY", "test-secret-key-0123456789")
+os.environ["RANKING_INDEX_PATH"] = ""
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["CLUSTER_NODES"] = ""
+os.environ["CLUSTER_NODES_FILE"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
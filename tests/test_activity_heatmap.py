@@ -0,0 +1,124 @@
+import asyncio
+from datetime import date
+
+from src.services.activity_heatmap import ActivityBuckets, EventIngestor, event_day
+from src.utils.cache import MemoryCache
+
+
+DAY = date(2026, 6, 30).toordinal()
+
+
+def test_event_day_is_utc():
+    assert event_day("2026-06-30T23:30:00Z") == DAY
+    assert event_day("2026-07-01T01:00:00+02:00") == DAY
+
+
+def test_heatmap_totals_and_streaks():
+    buckets = ActivityBuckets(days=10, end_day=DAY)
+    for offset in (0, 1, 2, 5):
+        buckets.add("PushEvent", DAY - offset)
+    buckets.add("WatchEvent", DAY, count=3)
+
+    heatmap = buckets.heatmap(days=7, today=DAY)
+
+    assert heatmap["start"] == "2026-06-24" and heatmap["end"] == "2026-06-30"
+    assert heatmap["days"] == [0, 1, 0, 0, 1, 1, 4]
+    assert heatmap["total"] == 7 and heatmap["max"] == 4
+    assert heatmap["current_streak"] == 3 and heatmap["longest_streak"] == 3
+    assert heatmap["by_type"] == {"PushEvent": 4, "WatchEvent": 3}
+    assert buckets.heatmap(days=7, event_types=["WatchEvent"], today=DAY)["total"] == 3
+
+
+def test_days_since_the_last_event_are_empty():
+    buckets = ActivityBuckets(days=10, end_day=DAY)
+    buckets.add("PushEvent", DAY)
+
+    heatmap = buckets.heatmap(days=3, today=DAY + 2)
+
+    assert heatmap["days"] == [1, 0, 0]
+    assert heatmap["current_streak"] == 0
+
+
+def test_window_moves_forward_and_drops_old_days():
+    buckets = ActivityBuckets(days=5, end_day=DAY)
+    buckets.add("PushEvent", DAY - 4)
+    buckets.add("PushEvent", DAY)
+    buckets.add("PushEvent", DAY - 10)  # older than the window
+
+    buckets.add("PushEvent", DAY + 2)
+
+    assert buckets.end_day == DAY + 2
+    assert buckets.counts["PushEvent"].tolist() == [0, 0, 1, 0, 1]
+    buckets.advance(DAY + 20)
+    assert not any(buckets.counts["PushEvent"])
+
+
+def test_merge_aligns_days():
+    stored = ActivityBuckets(days=5, end_day=DAY)
+    stored.add("PushEvent", DAY)
+    stored.last_event_id = 10
+    fresh = ActivityBuckets(days=5, end_day=DAY + 1)
+    fresh.add("PushEvent", DAY)
+    fresh.add("IssuesEvent", DAY + 1)
+    fresh.last_event_id = 12
+
+    stored.merge(fresh)
+
+    assert stored.end_day == DAY + 1
+    assert stored.counts["PushEvent"].tolist() == [0, 0, 0, 2, 0]
+    assert stored.counts["IssuesEvent"].tolist() == [0, 0, 0, 0, 1]
+    assert stored.last_event_id == 12
+
+
+def test_serialisation_round_trip():
+    buckets = ActivityBuckets(days=5, end_day=DAY)
+    buckets.add("PushEvent", DAY - 1, count=2)
+    buckets.counts["Empty"] = buckets._empty()
+    buckets.last_event_id = 7
+
+    data = buckets.to_dict()
+    restored = ActivityBuckets.from_dict(data)
+
+    assert "Empty" not in data["counts"]
+    assert restored.to_dict() == data
+    assert restored.heatmap(days=5, today=DAY) == buckets.heatmap(days=5, today=DAY)
+
+
+class _Events:
+    def __init__(self, events):
+        self.events = events
+        self.reads = 0
+
+    async def iter_user_events(self, username, max_pages):
+        self.reads += 1
+        for event in self.events:
+            yield event
+
+
+def _event(event_id, day_offset=0, event_type="PushEvent"):
+    return {"id": str(event_id), "type": event_type,
+            "created_at": date.fromordinal(
+                date.today().toordinal() - day_offset).isoformat() + "T12:00:00Z"}
+
+
+def test_ingestion_counts_each_event_once():
+    client = _Events([_event(3), _event(2, 1), _event(1, 1)])
+    store = MemoryCache()
+    ingestor = EventIngestor(client, store, refresh_seconds=300)
+
+    async def run():
+        first = await ingestor.ingest("octocat")
+        cached = await ingestor.ingest("OctoCat")
+        client.events = [_event(4, event_type="WatchEvent")] + client.events
+        refreshed = await ingestor.ingest("octocat", force=True)
+        return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(run())
+
+    assert first.heatmap(days=7)["total"] == 3
+    assert cached.heatmap(days=7)["total"] == 3
+    assert client.reads == 2
+    heatmap = refreshed.heatmap(days=7)
+    assert heatmap["total"] == 4
+    assert heatmap["by_type"] == {"PushEvent": 3, "WatchEvent": 1}
+    assert refreshed.last_event_id == 4
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.services.working_analytics_service import ANALYSIS_DEPTHS, resolve_sections
+
+
+def test_depths_and_fields():
+    assert resolve_sections() == ANALYSIS_DEPTHS["full"]
+    assert resolve_sections("summary") == frozenset()
+    assert resolve_sections("standard") == frozenset({"repositories"})
+    assert resolve_sections("summary", "languages, repositories") == ANALYSIS_DEPTHS["full"]
+    assert resolve_sections(fields=["languages"]) == frozenset({"languages"})
+    assert resolve_sections(fields="") == frozenset()
+
+
+def test_standard_skips_language_calls():
+    assert "languages" not in ANALYSIS_DEPTHS["standard"]
+    assert ANALYSIS_DEPTHS["summary"] < ANALYSIS_DEPTHS["standard"] < ANALYSIS_DEPTHS["full"]
+
+
+@pytest.mark.parametrize("depth, fields", [
+    ("deep", None),
+    (None, "languages,commits"),
+    (None, 5),
+    (None, {"languages": True}),
+    (None, ["languages", 5]),
+    (["full"], None),
+    (3, None),
+])
+def test_invalid_depth_or_fields(depth, fields):
+    with pytest.raises(ValueError):
+        resolve_sections(depth, fields)
+
+
+@pytest.mark.parametrize("body", [
+    {"usernames": ["octocat", "torvalds"], "fields": 5},
+    {"usernames": ["octocat", "torvalds"], "depth": ["full"]},
+])
+def test_compare_rejects_malformed_sections(body):
+    from backend.routes.handlers import compare_users
+
+    payload, status = asyncio.run(compare_users(body, client=None))
+
+    assert status == 400
+    assert "depths" in payload
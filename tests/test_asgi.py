@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.asgi import create_asgi_app
+
+
+def _call(app, method, path, query=b"", body=b"", headers=()):
+    scope = {"type": "http", "method": method, "path": path, "query_string": query,
+             "headers": [(k.encode(), v.encode()) for k, v in headers],
+             "client": ("203.0.113.7", 5000)}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, body_message = sent
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], response_headers, body_message["body"]
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_asgi_app()
+
+
+def test_get_route(app):
+    status, headers, body = _call(app, "GET", "/")
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert json.loads(body)["endpoints"]["health"] == "/health"
+    assert headers["content-length"] == str(len(body))
+
+
+def test_head_sends_headers_without_body(app):
+    _, get_headers, get_body = _call(app, "GET", "/")
+    status, headers, body = _call(app, "HEAD", "/")
+    assert status == 200
+    assert body == b""
+    assert int(headers["content-length"]) > 0
+    assert headers["content-type"] == get_headers["content-type"]
+
+
+def test_unknown_path_and_wrong_method(app):
+    assert _call(app, "GET", "/nope")[0] == 404
+    status, _, body = _call(app, "GET", "/api/v1/analytics/compare")
+    assert status == 405
+    assert json.loads(body) == {"error": "Method not allowed"}
+    assert _call(app, "HEAD", "/nope")[2] == b""
+
+
+def test_path_and_query_parameters_reach_the_handler(app):
+    status, _, body = _call(app, "GET", "/api/v1/analytics/rankings/nobody-here")
+    assert status == 404
+    assert "nobody-here" in json.loads(body)["error"]
+
+    status, _, body = _call(app, "GET", "/api/v1/analytics/leaderboard",
+                            query=b"metric=bogus")
+    assert status == 400
+    assert json.loads(body)["error"] == "Unknown metric 'bogus'"
+
+
+def test_post_body_is_parsed(app):
+    status, _, body = _call(app, "POST", "/api/v1/analytics/compare", body=b'{"usernames": []}')
+    assert status == 400
+    assert json.loads(body)["error"] == "At least 2 usernames required"
+
+
+def test_preflight_allows_known_origins_only(app):
+    status, headers, body = _call(app, "OPTIONS", "/api/v1/analytics/compare",
+                                  headers=[("origin", "http://localhost:5173")])
+    assert status == 204 and body == b""
+    assert headers["access-control-allow-origin"] == "http://localhost:5173"
+
+    _, headers, _ = _call(app, "OPTIONS", "/", headers=[("origin", "https://evil.example")])
+    assert "access-control-allow-origin" not in headers
+
+
+def test_rate_limit_headers_are_sent(app):
+    _, headers, _ = _call(app, "GET", "/api/v1/analytics/leaderboard")
+    assert headers["x-ratelimit-limit"] == "100"
+    assert int(headers["x-ratelimit-remaining"]) < 100
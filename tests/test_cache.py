@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from src.utils.cache import MemoryCache, RedisCache, create_cache
+
+
+def test_memory_cache_expires_entries():
+    async def run():
+        cache = MemoryCache()
+        await cache.set("fresh", {"a": 1}, ttl=60)
+        await cache.set("expired", {"a": 2}, ttl=-1)
+        return await cache.get("fresh"), await cache.get("expired")
+
+    assert asyncio.run(run()) == ({"a": 1}, None)
+
+
+def test_create_cache_defaults_to_memory():
+    assert isinstance(create_cache("test"), MemoryCache)
+
+
+def test_redis_cache_does_not_block_the_event_loop():
+    cache = RedisCache("redis://127.0.0.1:6379/0", namespace="test")
+
+    def slow_get(key):
+        time.sleep(0.3)
+        return b'{"value": 1}'
+
+    cache._client.get = slow_get
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        value = await cache.get("key")
+        ticker.cancel()
+        return value, ticks
+
+    value, ticks = asyncio.run(run())
+    assert value == {"value": 1}
+    assert ticks > 10
+
+
+def test_unreachable_redis_is_a_fast_miss():
+    cache = RedisCache("redis://10.255.255.1:6379/0", namespace="test", timeout=0.2)
+
+    async def run():
+        started = time.monotonic()
+        value = await cache.get("key")
+        stored = await cache.set("key", {"a": 1})
+        return value, stored, time.monotonic() - started
+
+    value, stored, elapsed = asyncio.run(run())
+    assert value is None and stored is False
+    assert elapsed < 2
@@ -0,0 +1,168 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.client.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.client.github_client import AsyncGitHubClient
+from src.client.resilience import LatencyTracker, RetryBudget
+from src.exceptions import CircuitOpenError, NetworkError, RateLimitExceeded, UserNotFound
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_opens_after_consecutive_failures_and_closes_after_a_trial():
+    breaker = CircuitBreaker(consecutive_failures=3, open_seconds=0.05)
+    for _ in range(2):
+        breaker.record_failure("boom")
+    assert breaker.state == CLOSED
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the trial
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_trial_opens_again():
+    breaker = CircuitBreaker(consecutive_failures=1, open_seconds=0.05)
+    breaker.record_failure("boom")
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure("still down")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_failure_rate_and_slow_calls_trip():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, consecutive_failures=99,
+                             slow_call_seconds=1.0)
+    breaker.record_success(0.1)
+    breaker.record_failure("boom")
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    breaker.record_success(5.0)  # slow, so a failure
+    assert breaker.state == OPEN
+
+
+def test_probe_closes_the_circuit():
+    answers = [False, True]
+    breaker = CircuitBreaker(consecutive_failures=1, open_seconds=0.02,
+                             probe=lambda: answers.pop(0))
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN
+    # With a probe, calls never go through as trials
+    time.sleep(0.03)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert _wait_for(lambda: breaker.state == CLOSED)
+    assert answers == []
+
+
+def _client(handler, breaker):
+    return AsyncGitHubClient(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        breaker=breaker, latency_tracker=LatencyTracker(), retry_budget=RetryBudget())
+
+
+def test_exhausted_quota_trips_until_the_reset():
+    reset = int(time.time()) + 3600
+    sent = []
+
+    def handler(request):
+        sent.append(request.url.path)
+        return httpx.Response(403, headers={"X-RateLimit-Remaining": "0",
+                                            "X-RateLimit-Limit": "60",
+                                            "X-RateLimit-Reset": str(reset)},
+                              json={"message": "API rate limit exceeded"})
+
+    breaker = CircuitBreaker(consecutive_failures=5)
+    client = _client(handler, breaker)
+
+    async def run():
+        with pytest.raises(RateLimitExceeded):
+            await client.get_user_profile("octocat")
+        for name in ("hubot", "monalisa"):
+            with pytest.raises(CircuitOpenError):
+                await client.get_user_profile(name)
+        await client.aclose()
+
+    asyncio.run(run())
+    assert sent == ["/users/octocat"]
+    assert breaker.state == OPEN
+    assert breaker.open_until >= reset - 1
+
+
+def test_secondary_limits_do_not_trip():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return httpx.Response(403, headers={"Retry-After": "0",
+                                                "X-RateLimit-Remaining": "10"},
+                                  json={"message": "secondary rate limit"})
+        return httpx.Response(200, json={"login": "octocat"})
+
+    breaker = CircuitBreaker(consecutive_failures=5)
+    client = _client(handler, breaker)
+    assert asyncio.run(client.get_user_profile("octocat"))["login"] == "octocat"
+    assert breaker.state == CLOSED
+
+
+def test_degraded_mode_serves_the_stale_profile():
+    from backend.routes import handlers
+    from src.services.comparison_service import profile_cache_key
+
+    async def run():
+        await handlers.stale_profile_cache.set(profile_cache_key("stale-user"), {
+            "data": {"username": "stale-user", "followers": 3},
+            "cached_at": "2026-10-01T00:00:00+00:00"}, ttl=60)
+        degraded = await handlers._degraded("stale-user", CircuitOpenError("circuit open"))
+        missing = await handlers._degraded("stale-user", UserNotFound("gone"))
+        unknown = await handlers._degraded("never-seen", NetworkError("down"))
+        return degraded, missing, unknown
+
+    degraded, missing, unknown = asyncio.run(run())
+    payload, status = degraded
+    assert status == 200 and payload["stale"] is True
+    assert payload["data"]["followers"] == 3
+    assert payload["degraded_reason"] == "circuit open"
+    assert missing is None and unknown is None
+
+
+def test_analysis_falls_back_to_the_stale_profile_when_github_is_down():
+    from backend.routes import handlers
+    from src.services.comparison_service import profile_cache_key
+
+    def handler(request):
+        return httpx.Response(502, text="bad gateway")
+
+    breaker = CircuitBreaker(consecutive_failures=1, open_seconds=60)
+    client = _client(handler, breaker)
+
+    async def run():
+        await handlers.stale_profile_cache.set(profile_cache_key("fallback-user"), {
+            "data": {"username": "fallback-user"},
+            "cached_at": "2026-10-01T00:00:00+00:00"}, ttl=60)
+        result = await handlers.analyze_profile("fallback-user", client, {})
+        await client.aclose()
+        return result
+
+    payload, status = asyncio.run(run())[:2]
+    assert status == 200 and payload["stale"] is True
+    assert breaker.state == OPEN
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+from src.services.comparison_service import (ComparisonService, build_comparison_matrix,
+                                             profile_cache_key)
+from src.utils.cache import MemoryCache
+
+
+class _NoAnalysis:
+    """Fails the test if the comparison falls back to analysing locally"""
+
+    async def get_comprehensive_analysis(self, username, sections):
+        raise AssertionError(f"{username} analysed locally")
+
+
+def _profile(login):
+    return {"username": login, "followers": 1, "primary_languages": ["Python"]}
+
+
+def _comparison(remote_profile, stale_cache=None):
+    return ComparisonService(_NoAnalysis(), MemoryCache(), user_timeout=0.05,
+                             stale_cache=stale_cache, remote_profile=remote_profile)
+
+
+async def _slow_owner(username, sections):
+    await asyncio.sleep(5)
+
+
+def test_remote_profile_is_bounded_by_user_timeout():
+    async def run():
+        started = asyncio.get_running_loop().time()
+        result = await _comparison(_slow_owner).compare(["alice", "bob"])
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert elapsed < 1
+    assert [c["success"] for c in result["comparisons"]] == [False, False]
+    assert "timed out" in result["comparisons"][0]["error"]
+
+
+def test_remote_timeout_falls_back_to_stale_profile():
+    async def run():
+        stale = MemoryCache()
+        await stale.set(profile_cache_key("alice"),
+                        {"data": _profile("alice"), "cached_at": "2026-01-01T00:00:00"})
+        return await _comparison(_slow_owner, stale).compare(["alice", "bob"])
+
+    comparisons = asyncio.run(run())["comparisons"]
+
+    assert comparisons[0]["stale"] is True
+    assert comparisons[0]["data"]["username"] == "alice"
+    assert comparisons[1]["success"] is False
+
+
+def test_remote_profiles_are_used():
+    async def owner(username, sections):
+        return _profile(username)
+
+    comparisons = asyncio.run(_comparison(owner).compare(["alice", "bob"]))["comparisons"]
+
+    assert [c["data"]["username"] for c in comparisons] == ["alice", "bob"]
+
+
+class _SlowAnalysis:
+    async def get_comprehensive_analysis(self, username, sections):
+        await asyncio.sleep(5)
+
+
+def test_request_deadline_includes_queueing():
+    comparison = ComparisonService(_SlowAnalysis(), MemoryCache(), concurrency=2,
+                                   user_timeout=0.1, request_timeout=0.3)
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        result = await comparison.compare([f"user{i}" for i in range(30)])
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    # Serially that would be 15 rounds of 0.1 s
+    assert elapsed < 0.6
+    errors = [c["error"] for c in result["comparisons"]]
+    assert all(not c["success"] for c in result["comparisons"])
+    assert sum("deadline" in e for e in errors) >= 20
+    assert any("timed out" in e for e in errors)
+
+
+def test_users_cut_off_by_the_deadline_fall_back_to_stale_profiles():
+    async def run():
+        stale = MemoryCache()
+        await stale.set(profile_cache_key("alice"),
+                        {"data": _profile("alice"), "cached_at": "2026-01-01T00:00:00"})
+        comparison = ComparisonService(_SlowAnalysis(), MemoryCache(), user_timeout=5,
+                                       request_timeout=0.05, stale_cache=stale)
+        return await comparison.compare(["alice", "bob"])
+
+    alice, bob = asyncio.run(run())["comparisons"]
+    assert alice["stale"] is True
+    assert "deadline" in bob["error"]
+
+
+def test_matrix_columns_ranks_and_language_overlap():
+    profiles = [
+        {"username": "a", "followers": 10, "metrics": {"total_stars": 5},
+         "primary_languages": ["Python", "Go"]},
+        {"username": "b", "followers": 30, "metrics": {"total_stars": 5},
+         "primary_languages": ["Go", "Rust", "C"]},
+        {"username": "c", "followers": 10, "primary_languages": []},
+    ]
+    matrix = build_comparison_matrix(profiles)
+
+    assert matrix["users"] == ["a", "b", "c"]
+    assert matrix["values"]["followers"] == [10.0, 30.0, 10.0]
+    assert matrix["values"]["total_stars"] == [5.0, 5.0, 0.0]
+    # Competition ranking: ties share a rank and the next one is skipped
+    assert matrix["ranks"]["followers"] == [2, 1, 2]
+    assert matrix["ranks"]["total_stars"] == [1, 1, 3]
+    assert matrix["shared_languages"] == [[2, 1, 0], [1, 3, 0], [0, 0, 0]]
+    assert matrix["language_jaccard"] == [[1.0, 0.25, 0.0], [0.25, 1.0, 0.0],
+                                          [0.0, 0.0, 0.0]]
+    assert "pairs" not in matrix
+
+
+def test_matrix_size_grows_with_users_not_metrics_per_pair():
+    profiles = [{"username": f"u{i}", "followers": i, "primary_languages": ["Python"]}
+                for i in range(100)]
+    assert len(json.dumps(build_comparison_matrix(profiles))) < 150_000
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from src.client.github_client import AsyncGitHubClient, github_cache_key, languages_endpoint
+from src.client.resilience import LatencyTracker, RetryBudget
+from src.services.enrichment_planner import (FORK_PENALTY, plan_enrichment,
+                                             rank_repositories, repository_relevance)
+from src.services.working_analytics_service import ANALYSIS_DEPTHS, WorkingAnalyticsService
+from src.utils.cache import MemoryCache
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def _repo(name, stars=0, forks=0, size=0, days_ago=None, fork=False):
+    repo = {"name": name, "stargazers_count": stars, "forks_count": forks,
+            "size": size, "fork": fork}
+    if days_ago is not None:
+        repo["pushed_at"] = (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return repo
+
+
+def test_relevance_weighs_popularity_recency_and_forks():
+    assert repository_relevance(_repo("a", stars=100), NOW) > \
+        repository_relevance(_repo("b", stars=10), NOW)
+    assert repository_relevance(_repo("a", days_ago=0), NOW) > \
+        repository_relevance(_repo("b", days_ago=365), NOW)
+    # Recency halves every RECENCY_HALF_LIFE_DAYS
+    assert abs(repository_relevance(_repo("a", days_ago=180), NOW) - 1.5) < 1e-6
+    original = repository_relevance(_repo("a", stars=50, days_ago=10), NOW)
+    fork = repository_relevance(_repo("a", stars=50, days_ago=10, fork=True), NOW)
+    assert abs(fork - original * FORK_PENALTY) < 1e-9
+    assert repository_relevance(_repo("empty"), NOW) == 0.0
+
+
+def test_rank_keeps_the_top_k_best_first():
+    repos = [_repo(f"r{i}", stars=i) for i in range(50)]
+    assert [r["name"] for r in rank_repositories(repos, 3, NOW)] == ["r49", "r48", "r47"]
+    assert len(rank_repositories(repos[:2], 10, NOW)) == 2
+
+
+def test_plan_splits_cached_fetch_and_deferred():
+    repos = [_repo(f"r{i}", stars=i) for i in range(10)]
+    plan = plan_enrichment(repos, budget=2, candidates=6, cached={"r8", "r5", "r0"})
+
+    assert [r["name"] for r in plan.ranked] == ["r9", "r8", "r7", "r6", "r5", "r4"]
+    # Cached repositories are free and never use the budget
+    assert [r["name"] for r in plan.cached] == ["r8", "r5"]
+    assert [r["name"] for r in plan.fetch] == ["r9", "r7"]
+    assert [r["name"] for r in plan.deferred] == ["r6", "r4"]
+    assert plan.summary(2) == {"budget": 2, "fetched": 2, "cached": 2, "deferred": 2}
+
+
+def test_plan_with_no_budget_defers_everything_uncached():
+    repos = [_repo(f"r{i}", stars=i) for i in range(3)]
+    plan = plan_enrichment(repos, budget=0, candidates=3, cached={"r1"})
+    assert [r["name"] for r in plan.cached] == ["r1"]
+    assert plan.fetch == []
+    assert [r["name"] for r in plan.deferred] == ["r2", "r0"]
+
+
+def test_budgeted_language_calls_run_concurrently():
+    repos = [{**_repo(f"r{i}", stars=i, days_ago=i), "updated_at": "2026-10-01T00:00:00Z",
+              "language": "Python"} for i in range(6)]
+    sent = []
+
+    async def handler(request):
+        path = request.url.path
+        sent.append(path)
+        if path.endswith("/languages"):
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"Python": 100})
+        if path.endswith("/repos"):
+            return httpx.Response(200, json=repos)
+        return httpx.Response(200, json={"login": "octocat", "created_at": "2020-01-01T00:00:00Z",
+                                         "public_repos": 6})
+
+    cache = MemoryCache()
+    client = AsyncGitHubClient(
+        cache=cache, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        latency_tracker=LatencyTracker(), retry_budget=RetryBudget())
+    service = WorkingAnalyticsService(client, enrichment_budget=4, enrichment_candidates=6)
+
+    async def run():
+        await cache.set(github_cache_key(languages_endpoint("octocat", "r5")), {"Go": 10})
+        started = time.monotonic()
+        profile = await service.get_comprehensive_analysis("octocat", ANALYSIS_DEPTHS["full"])
+        elapsed = time.monotonic() - started
+        await client.aclose()
+        return profile, elapsed
+
+    profile, elapsed = asyncio.run(run())
+
+    language_calls = [p for p in sent if p.endswith("/languages")]
+    assert sorted(language_calls) == [f"/repos/octocat/r{i}/languages" for i in (1, 2, 3, 4)]
+    assert elapsed < 0.3  # four calls of 0.1 s, not one after another
+    assert profile.metrics["enrichment"] == {"budget": 4, "fetched": 4, "cached": 1,
+                                             "deferred": 1}
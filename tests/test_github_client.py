@@ -0,0 +1,143 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from src.client.github_client import AsyncGitHubClient
+from src.client.resilience import (LatencyTracker, RetryBudget, RetryPolicy, endpoint_class,
+                                   parse_retry_after)
+from src.exceptions import GitHubAPIError
+
+
+def _client(handler, retry_budget=None, latency=None, hedge=False, **policy):
+    policy = {"base_delay": 0.001, **policy}
+    return AsyncGitHubClient(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        retry_policy=RetryPolicy(**policy),
+        retry_budget=retry_budget or RetryBudget(),
+        latency_tracker=latency or LatencyTracker(),
+        hedge=hedge)
+
+
+def _responses(*responses):
+    sent = []
+
+    def handler(request):
+        sent.append(request.url.path)
+        return responses[min(len(sent), len(responses)) - 1]
+
+    return sent, handler
+
+
+def _get(client, username="octocat"):
+    async def run():
+        try:
+            return await client.get_user_profile(username)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_server_errors_are_retried():
+    sent, handler = _responses(httpx.Response(502, text="bad gateway"),
+                               httpx.Response(200, json={"login": "octocat"}))
+    assert _get(_client(handler))["login"] == "octocat"
+    assert len(sent) == 2
+
+
+def test_retries_stop_at_max_retries():
+    sent, handler = _responses(httpx.Response(500, text="boom"))
+    with pytest.raises(GitHubAPIError):
+        _get(_client(handler, max_retries=2))
+    assert len(sent) == 3
+
+
+def test_retry_after_is_honoured_up_to_max_retry_after():
+    sent, handler = _responses(httpx.Response(503, headers={"Retry-After": "0"}),
+                               httpx.Response(200, json={"login": "octocat"}))
+    assert _get(_client(handler))["login"] == "octocat"
+    assert len(sent) == 2
+
+    sent, handler = _responses(httpx.Response(503, headers={"Retry-After": "120"}))
+    started = time.monotonic()
+    with pytest.raises(GitHubAPIError):
+        _get(_client(handler, max_retry_after=30))
+    assert len(sent) == 1
+    assert time.monotonic() - started < 1
+
+
+def test_retries_stop_when_the_budget_is_spent():
+    budget = RetryBudget(ratio=0.0, min_tokens=1.0)
+    sent, handler = _responses(httpx.Response(500, text="boom"))
+    with pytest.raises(GitHubAPIError):
+        _get(_client(handler, retry_budget=budget, max_retries=5))
+    assert len(sent) == 2  # the request and the one retry the budget held
+
+
+def test_client_errors_are_not_retried():
+    sent, handler = _responses(httpx.Response(422, text="unprocessable"))
+    with pytest.raises(GitHubAPIError):
+        _get(_client(handler))
+    assert len(sent) == 1
+
+
+def test_slow_request_is_hedged_after_p95():
+    latency = LatencyTracker(min_samples=5)
+    for _ in range(20):
+        latency.record("users/:user", 0.02)
+    sent = []
+
+    async def handler(request):
+        sent.append(time.monotonic())
+        if len(sent) == 1:
+            await asyncio.sleep(2)
+        return httpx.Response(200, json={"login": "octocat"})
+
+    started = time.monotonic()
+    assert _get(_client(handler, latency=latency, hedge=True))["login"] == "octocat"
+    assert time.monotonic() - started < 1
+    assert len(sent) == 2
+    assert sent[1] - sent[0] >= 0.02
+
+
+def test_no_hedge_without_budget_or_estimate():
+    sent, handler = _responses(httpx.Response(200, json={"login": "octocat"}))
+    _get(_client(handler, hedge=True))  # no samples yet, so no p95
+    assert len(sent) == 1
+
+
+def test_timeouts_follow_p99_within_bounds():
+    latency = LatencyTracker(min_samples=10, min_timeout=1.0, max_timeout=30.0, headroom=2.0)
+    assert latency.timeout_for("users/:user") == 30.0  # not enough samples
+    for seconds in [0.5] * 95 + [4.0] * 5:
+        latency.record("users/:user", seconds)
+    assert latency.timeout_for("users/:user") == 8.0
+    assert latency.percentile("users/:user", 95) == 0.5
+
+    fast = LatencyTracker(min_samples=1, min_timeout=1.0)
+    fast.record("users/:user", 0.01)
+    assert fast.timeout_for("users/:user") == 1.0
+
+
+def test_backoff_has_full_jitter_and_respects_retry_after():
+    policy = RetryPolicy(max_retries=3, base_delay=0.5, max_delay=8.0, max_retry_after=30)
+    delays = [policy.delay(3) for _ in range(200)]
+    assert all(0 <= d <= 4.0 for d in delays) and len(set(delays)) > 100
+    assert policy.delay(4) is None
+    assert policy.delay(1, retry_after=12) == 12
+    assert policy.delay(1, retry_after=31) is None
+
+
+def test_retry_after_parsing():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 55 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_endpoint_classes_share_latency_statistics():
+    assert endpoint_class("/users/octocat") == "users/:user"
+    assert endpoint_class("users/octocat/repos?per_page=100&page=2") == "users/:user/repos"
+    assert endpoint_class("repos/octocat/hello/languages") == "repos/:repo/languages"
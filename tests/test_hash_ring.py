@@ -0,0 +1,54 @@
+from collections import Counter
+
+from src.utils.hash_ring import HashRing
+
+
+NODES = ["http://a", "http://b", "http://c"]
+USERS = [f"user{i}" for i in range(5000)]
+
+
+def test_empty_ring_has_no_owner():
+    assert HashRing().owner("octocat") is None
+
+
+def test_owner_is_stable_and_spread():
+    ring = HashRing(NODES)
+    owners = {user: ring.owner(user) for user in USERS}
+
+    assert owners == {user: HashRing(NODES).owner(user) for user in USERS}
+    spread = Counter(owners.values())
+    assert set(spread) == set(NODES)
+    assert all(count > len(USERS) / 6 for count in spread.values())
+
+
+def test_adding_a_node_only_moves_users_onto_it():
+    ring = HashRing(NODES)
+    before = {user: ring.owner(user) for user in USERS}
+
+    ring.add("http://d")
+
+    moved = [user for user in USERS if ring.owner(user) != before[user]]
+    assert moved
+    assert all(ring.owner(user) == "http://d" for user in moved)
+    assert len(moved) < len(USERS) / 2
+
+
+def test_removing_a_node_only_moves_its_users():
+    ring = HashRing(NODES)
+    before = {user: ring.owner(user) for user in USERS}
+
+    ring.remove("http://b")
+
+    assert ring.nodes == ["http://a", "http://c"]
+    for user in USERS:
+        if before[user] != "http://b":
+            assert ring.owner(user) == before[user]
+        else:
+            assert ring.owner(user) in ("http://a", "http://c")
+
+
+def test_add_and_remove_are_idempotent():
+    ring = HashRing(NODES)
+    ring.add("http://a")
+    ring.remove("http://z")
+    assert ring.nodes == NODES
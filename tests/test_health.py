@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+import backend.sharding
+from backend.app import create_app
+from backend.sharding import Cluster
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def test_cluster_health_before_services_load(client, monkeypatch):
+    cluster = Cluster("http://node-a", ["http://node-a", "http://node-b"])
+    monkeypatch.setattr(backend.sharding, "get_cluster", lambda: cluster)
+    monkeypatch.delitem(sys.modules, "backend.state", raising=False)
+
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "healthy"
+    assert "github" not in body
+    assert body["cluster"]["nodes"] == ["http://node-a", "http://node-b"]
+
+
+def test_open_circuit_degrades_health_without_cluster(client, monkeypatch):
+    from backend import state
+
+    monkeypatch.setattr(state.circuit_breaker, "snapshot", lambda: {"state": "open"})
+
+    response = client.get("/health")
+
+    body = response.get_json()
+    assert body["status"] == "degraded"
+    assert body["github"] == {"state": "open"}
+    assert "cluster" not in body
@@ -0,0 +1,101 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from backend import http_cache
+from backend.http_cache import build_response, etag_matches, negotiate_encoding
+
+
+LARGE = {"items": [{"name": f"repo-{i}", "stars": i} for i in range(200)]}
+
+
+def test_body_etag_and_revalidation():
+    status, headers, body = build_response({"a": 1}, 200, {}, max_age=60)
+    assert status == 200 and json.loads(body) == {"a": 1}
+    assert headers["Cache-Control"] == "public, max-age=60"
+
+    status, headers304, body = build_response(
+        {"a": 1}, 200, {"if-none-match": headers["ETag"]}, max_age=60)
+    assert status == 304 and body == b""
+    assert headers304["ETag"] == headers["ETag"]
+
+
+def test_errors_and_uncacheable_routes_are_not_stored():
+    assert build_response({"error": "x"}, 404, {}, max_age=60)[1]["Cache-Control"] == "no-store"
+    assert "ETag" not in build_response({"a": 1}, 200, {})[1]
+
+
+def test_large_bodies_are_compressed_per_encoding():
+    status, headers, body = build_response(LARGE, 200, {"accept-encoding": "gzip"}, max_age=60)
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"].endswith('-gzip"')
+    assert json.loads(gzip.decompress(body)) == LARGE
+    assert "Content-Encoding" not in build_response(LARGE, 200, {}, max_age=60)[1]
+
+
+def test_version_etag_revalidates_without_serialising(monkeypatch):
+    _, headers, _ = build_response(LARGE, 200, {"accept-encoding": "gzip"}, max_age=60,
+                                   version="v1")
+    _, identity_headers, _ = build_response(LARGE, 200, {}, max_age=60, version="v1")
+
+    def fail(payload):
+        raise AssertionError("serialised a 304")
+
+    monkeypatch.setattr(http_cache, "serialize", fail)
+    for etag in (headers["ETag"], identity_headers["ETag"]):
+        status, headers304, body = build_response(
+            LARGE, 200, {"accept-encoding": "gzip", "if-none-match": etag},
+            max_age=60, version="v1")
+        assert (status, body) == (304, b"")
+        assert headers304["ETag"] == etag
+
+    with pytest.raises(AssertionError):
+        build_response(LARGE, 200, {"if-none-match": headers["ETag"]}, max_age=60,
+                       version="v2")
+
+
+def test_stale_payloads_must_be_revalidated():
+    _, headers, _ = build_response({"stale": True}, 200, {}, max_age=60, version="v1")
+    assert headers["Cache-Control"] == "no-cache"
+
+
+def test_zero_max_age_is_stored_but_always_revalidated():
+    status, headers, _ = build_response({"a": 1}, 200, {}, max_age=0, version="v1")
+    assert headers["Cache-Control"] == "no-cache"
+    assert build_response({"a": 1}, 200, {"if-none-match": headers["ETag"]},
+                          max_age=0, version="v1")[0] == 304
+
+
+def test_etag_matching_and_negotiation():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert negotiate_encoding("gzip;q=0.5, identity") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding(None) is None
+
+
+def test_cached_profile_is_revalidated_by_its_stored_version(monkeypatch):
+    from backend.routes import handlers
+    from backend.state import profile_cache
+    from src.services.comparison_service import FULL_SECTIONS, cache_profile
+
+    profile = {"username": "octocat", "followers": 3, "metrics": {},
+               "repository_analysis": [], "primary_languages": []}
+
+    async def run(headers):
+        payload, status, version = await handlers.analyze_profile("octocat", client=None)
+        return build_response(payload, status, headers, max_age=http_cache.PROFILE_MAX_AGE,
+                              version=version)
+
+    asyncio.run(cache_profile(profile_cache, "octocat", FULL_SECTIONS, profile, ttl=60))
+    status, headers, body = asyncio.run(run({}))
+    assert status == 200 and json.loads(body)["data"] == profile
+    # Kept by the browser but revalidated on every use
+    assert headers["Cache-Control"] == "no-cache" and headers["ETag"]
+
+    monkeypatch.setattr(http_cache, "serialize", lambda payload: pytest.fail("serialised"))
+    status, _, body = asyncio.run(run({"if-none-match": headers["ETag"]}))
+    assert (status, body) == (304, b"")
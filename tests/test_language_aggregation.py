@@ -0,0 +1,33 @@
+import pytest
+
+from src.services.language_aggregation import (LanguageAggregate, estimate_code_ratio,
+                                               language_percentages)
+
+
+def test_percentages_are_sorted_and_rounded():
+    shares = language_percentages({"C": 1, "Python": 2, "Go": 0})
+    assert list(shares) == ["Python", "C", "Go"]
+    assert shares == {"Python": 66.67, "C": 33.33, "Go": 0.0}
+    assert language_percentages({}) == {}
+    assert language_percentages({"Python": 0}) == {}
+
+
+def test_code_ratio_uses_only_fetched_repositories():
+    repos = [{"name": "a", "size": 10}, {"name": "b", "size": 30}, {"name": "c", "size": 0}]
+    languages = {"a": {"Python": 5 * 1024}, "c": {"Go": 99}}
+    assert estimate_code_ratio(repos, languages) == pytest.approx(0.5)
+    assert estimate_code_ratio(repos, {}) == 1.0
+
+
+def test_unfetched_repositories_count_by_estimate():
+    aggregate = LanguageAggregate()
+    aggregate.add_repository({"Python": 600, "Shell": 0})
+    aggregate.add_repository(None, language="Go", estimated_bytes=400)
+    aggregate.add_repository(None, language=None, estimated_bytes=1000)
+    aggregate.add_repository({}, language="Rust", estimated_bytes=0)
+
+    assert aggregate.total_bytes == 1001
+    assert aggregate.shares() == {"Python": 59.94, "Go": 39.96, "Rust": 0.1}
+    assert aggregate.shares(1) == {"Python": 59.94}
+    assert aggregate.top(2) == ["Python", "Go"]
+    assert "Shell" not in aggregate.bytes
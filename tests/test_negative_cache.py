@@ -0,0 +1,112 @@
+import asyncio
+
+from src.services.webhooks import WebhookProcessor
+from src.utils.cache import MemoryCache
+from src.utils.negative_cache import BloomFilter, NegativeCache
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    names = [f"user-{i}" for i in range(1000)]
+    for name in names:
+        bloom.add(name)
+    assert all(name in bloom for name in names)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_filter_is_sized_for_the_entries_it_guards():
+    missing = NegativeCache(max_entries=500)
+    assert missing._filter.capacity == 1000
+
+
+def test_entries_expire_and_can_be_discarded():
+    missing = NegativeCache(ttl=60)
+
+    async def run():
+        await missing.add("Ghost")
+        seen = await missing.is_missing("ghost")
+        await missing.discard("GHOST")
+        return seen, await missing.is_missing("ghost")
+
+    assert asyncio.run(run()) == (True, False)
+
+    expired = NegativeCache(ttl=0)
+    asyncio.run(expired.add("ghost"))
+    assert asyncio.run(expired.is_missing("ghost")) is False
+
+
+def test_lru_and_filter_stay_bounded():
+    missing = NegativeCache(ttl=60, max_entries=10)
+
+    async def run():
+        for i in range(35):
+            await missing.add(f"ghost-{i}")
+        return [await missing.is_missing(f"ghost-{i}") for i in range(35)]
+
+    seen = asyncio.run(run())
+    assert seen == [False] * 25 + [True] * 10
+    assert missing._filter.count <= 20
+
+
+def test_shared_store_is_seen_by_every_worker():
+    store = MemoryCache()
+    first, second = NegativeCache(ttl=60, store=store), NegativeCache(ttl=60, store=store)
+
+    async def run():
+        await first.add("ghost")
+        seen = await second.is_missing("ghost")
+        await second.discard("ghost")
+        return seen, await first.is_missing("ghost")
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_webhooks_clear_accounts_they_mention():
+    missing = NegativeCache(ttl=60)
+    payload = {"action": "created", "sender": {"login": "fan"},
+               "repository": {"name": "repo", "owner": {"login": "octocat"}}}
+
+    async def run():
+        for name in ("fan", "octocat", "ghost"):
+            await missing.add(name)
+        await WebhookProcessor(MemoryCache(), MemoryCache(), missing).handle("star", payload)
+        return [await missing.is_missing(name) for name in ("fan", "octocat", "ghost")]
+
+    assert asyncio.run(run()) == [False, False, True]
+
+
+def test_unknown_users_are_answered_cheaply_and_quietly(caplog):
+    import logging
+
+    import httpx
+
+    from backend.routes import handlers
+    from src.client.github_client import AsyncGitHubClient
+    from src.client.resilience import LatencyTracker, RetryBudget
+
+    sent = []
+
+    def handler(request):
+        sent.append(request.url.path)
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    client = AsyncGitHubClient(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        negative_cache=NegativeCache(ttl=60), latency_tracker=LatencyTracker(),
+        retry_budget=RetryBudget())
+
+    async def run():
+        results = [await handlers.analyze_profile("no-such-user-404", client, {})
+                   for _ in range(3)]
+        await client.aclose()
+        return results
+
+    with caplog.at_level(logging.INFO, logger="backend.routes.handlers"):
+        results = asyncio.run(run())
+
+    assert [status for _, status in results] == [404, 404, 404]
+    assert sent == ["/users/no-such-user-404"]
+    records = [r for r in caplog.records if r.name == "backend.routes.handlers"
+               and "no-such-user-404" in r.getMessage()]
+    assert records and all(r.levelno == logging.INFO and not r.exc_info for r in records)
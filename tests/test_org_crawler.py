@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from src.services.org_crawler import QuotaPacer
+
+
+class _Quota:
+    def __init__(self, remaining, reset_in):
+        self.quota_remaining = remaining
+        self.quota_reset = time.time() + reset_in
+
+
+def test_delay_spreads_users_over_the_window():
+    pacer = QuotaPacer(_Quota(remaining=1200 + 200, reset_in=100), cost_per_user=12)
+    assert 0.9 < pacer.delay() <= 1.0
+
+    assert QuotaPacer(_Quota(None, 0)).delay() == 0.0
+    assert QuotaPacer(_Quota(remaining=150, reset_in=30)).delay() > 30
+
+
+def test_workers_share_one_pace():
+    # 0.05 s between users whatever the number of workers
+    pacer = QuotaPacer(_Quota(remaining=1200 + 200, reset_in=5), cost_per_user=12)
+
+    async def run(workers):
+        starts = []
+
+        async def worker():
+            await pacer.wait()
+            starts.append(time.monotonic())
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return sorted(starts)
+
+    starts = asyncio.run(run(5))
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.04
+    assert starts[-1] - starts[0] >= 0.16
+
+
+def test_spent_quota_pauses_until_reset():
+    pacer = QuotaPacer(_Quota(remaining=150, reset_in=0.05), reserve=200, max_delay=0.01)
+    started = time.monotonic()
+    asyncio.run(pacer.wait())
+    assert time.monotonic() - started >= 0.05
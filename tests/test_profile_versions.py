@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from src.services.profile_versions import (ProfileVersions, apply_patch, json_diff,
+                                           profile_version)
+from src.utils.cache import MemoryCache
+
+
+PROFILE = {
+    "username": "octocat",
+    "metrics": {"followers": 10, "stars": 3.5, "ratio": 1},
+    "repository_analysis": [{"name": "a", "stars": 1}, {"name": "b", "stars": 2}],
+    "languages": {"Python": 60, "C": 40},
+}
+
+
+@pytest.mark.parametrize("new", [
+    PROFILE,
+    {**PROFILE, "metrics": {**PROFILE["metrics"], "followers": 11}},
+    {**PROFILE, "repository_analysis": PROFILE["repository_analysis"] + [{"name": "c"}]},
+    {**PROFILE, "repository_analysis": PROFILE["repository_analysis"][:1]},
+    {**PROFILE, "repository_analysis": []},
+    {**PROFILE, "languages": {"Python": 100}},
+    {**PROFILE, "metrics": {**PROFILE["metrics"], "ratio": 1.0}},
+    {**PROFILE, "metrics": {**PROFILE["metrics"], "ratio": True}},
+    {**PROFILE, "languages": ["Python"]},
+    {**PROFILE, "a/b": 1, "c~d": {"~1": [1, 2]}, "~0/~1": None},
+    [1, 2, 3],
+    "replaced",
+])
+def test_patch_round_trip(new):
+    patch = json_diff(PROFILE, new)
+    patched = apply_patch(PROFILE, patch)
+    assert patched == new
+    assert profile_version(patched) == profile_version(new)
+    assert apply_patch(new, json_diff(new, PROFILE)) == PROFILE
+
+
+def test_escaped_keys_round_trip_both_ways():
+    old = {"a/b": {"c~d": 1}, "~1": [0]}
+    new = {"a/b": {"c~d": 2}, "~1": [0, 1], "/": "x"}
+    patch = json_diff(old, new)
+    assert {"op": "replace", "path": "/a~1b/c~0d", "value": 2} in patch
+    assert apply_patch(old, patch) == new
+
+
+def test_diff_does_not_mutate_its_inputs():
+    new = {**PROFILE, "repository_analysis": []}
+    before = repr(PROFILE)
+    apply_patch(PROFILE, json_diff(PROFILE, new))
+    assert repr(PROFILE) == before
+
+
+def test_version_is_content_derived():
+    assert profile_version(dict(reversed(list(PROFILE.items())))) == profile_version(PROFILE)
+    assert profile_version({**PROFILE, "username": "other"}) != profile_version(PROFILE)
+
+
+class CountingCache(MemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        return await super().get(key)
+
+    async def set(self, key, value, ttl=300):
+        self.calls += 1
+        return await super().set(key, value, ttl)
+
+
+def test_delta_against_a_known_version():
+    versions = ProfileVersions(MemoryCache(), window=2)
+    newer = {**PROFILE, "metrics": {**PROFILE["metrics"], "followers": 11}}
+
+    async def run():
+        old = await versions.record("key", PROFILE)
+        new = await versions.record("key", newer)
+        return old, new, await versions.delta("key", newer, old, new)
+
+    old, new, delta = asyncio.run(run())
+    assert delta["base"] == old and delta["version"] == new
+    assert apply_patch(PROFILE, delta["patch"]) == newer
+
+
+def test_delta_falls_back_to_the_document_outside_the_window():
+    versions = ProfileVersions(MemoryCache(), window=1)
+
+    async def run():
+        old = await versions.record("key", PROFILE)
+        new = await versions.record("key", {**PROFILE, "username": "x"})
+        return old, await versions.delta("key", {**PROFILE, "username": "x"}, old, new)
+
+    old, delta = asyncio.run(run())
+    assert "data" in delta and "patch" not in delta
+
+
+def test_cache_hits_with_a_stored_version_do_no_versions_io():
+    cache = CountingCache()
+    versions = ProfileVersions(cache)
+
+    async def run():
+        version = await versions.record("key", PROFILE)
+        cache.calls = 0
+        full = await versions.delta("key", PROFILE, None, version)
+        current = await versions.delta("key", PROFILE, version, version)
+        return version, full, current
+
+    version, full, current = asyncio.run(run())
+    assert cache.calls == 0
+    assert full == {"version": version, "data": PROFILE}
+    assert current == {"version": version, "base": version, "patch": []}
+
+
+def test_unversioned_data_is_recorded_once():
+    cache = CountingCache()
+    versions = ProfileVersions(cache)
+
+    async def run():
+        first = await versions.delta("key", PROFILE)
+        writes_after_first = cache.calls
+        second = await versions.delta("key", PROFILE)
+        return first, second, writes_after_first
+
+    first, second, calls = asyncio.run(run())
+    assert first["version"] == second["version"] == profile_version(PROFILE)
+    assert calls == 2          # get + set
+    assert cache.calls == 3    # the repeat only reads
@@ -0,0 +1,76 @@
+import json
+
+from src.services.ranking_index import RankingIndex
+
+
+def _profile(username, followers, language="Python"):
+    return {"username": username, "followers": followers,
+            "primary_languages": [language] if language else [],
+            "metrics": {"community_impact": followers / 10}}
+
+
+def test_percentiles_and_leaderboard():
+    index = RankingIndex()
+    for i, name in enumerate(["a", "b", "c", "d"]):
+        index.record(_profile(name, followers=i * 10, language="Go" if i % 2 else "Python"))
+
+    top = index.leaderboard("followers", limit=2)
+    assert [(row["rank"], row["username"], row["score"]) for row in top] == [
+        (1, "d", 30.0), (2, "c", 20.0)]
+    assert [row["username"] for row in index.leaderboard("followers", "go")] == ["d", "b"]
+
+    rankings = index.rankings("C")
+    assert rankings["global"]["followers"] == {
+        "score": 20.0, "rank": 2, "total": 4, "percentile": 50.0, "top_percent": 50.0}
+    assert rankings["language_rankings"]["followers"]["total"] == 2
+    assert index.size() == 4 and index.size("Go") == 2
+
+
+def test_ties_share_a_rank():
+    index = RankingIndex()
+    for name in ["a", "b", "c"]:
+        index.record(_profile(name, followers=5))
+    assert {index.percentile(n, "followers")["rank"] for n in "abc"} == {1}
+
+
+def test_rerecording_replaces_the_previous_entry():
+    index = RankingIndex()
+    index.record(_profile("a", followers=1))
+    index.record(_profile("b", followers=2))
+    index.record(_profile("a", followers=3, language="Rust"))
+
+    assert index.size() == 2
+    assert index.size("python") == 1
+    assert index.leaderboard("followers")[0]["username"] == "a"
+    assert index.rankings("a")["language"] == "Rust"
+    assert index.rankings("unknown") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = RankingIndex(path, save_interval=3600)
+    index.record(_profile("a", followers=1))
+    index.record(_profile("b", followers=2))
+    index.save()
+
+    loaded = RankingIndex(path)
+    assert loaded.size() == 2
+    assert loaded.leaderboard("followers") == index.leaderboard("followers")
+
+
+def test_save_keeps_the_newest_analysis_across_workers(tmp_path):
+    path = str(tmp_path / "index.json")
+    first = RankingIndex(path, save_interval=3600)
+    second = RankingIndex(path, save_interval=3600)
+
+    first.record(_profile("a", followers=1))
+    first.record(_profile("only-first", followers=7))
+    second.record(_profile("a", followers=100))
+    second.save()
+    first.save()
+
+    on_disk = json.loads((tmp_path / "index.json").read_text())["entries"]
+    assert on_disk["a"]["scores"]["followers"] == 100.0
+    assert set(on_disk) == {"a", "only-first"}
+    assert first.percentile("a", "followers")["score"] == 100.0
+    assert first.leaderboard("followers")[0]["username"] == "a"
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from src.utils.rate_limiter import MemoryRateLimitStorage, RateLimiter, parse_limit
+
+
+def test_parse_limit():
+    assert parse_limit("10 per minute") == (10, 60)
+    assert parse_limit("100/hours") == (100, 3600)
+    with pytest.raises(ValueError):
+        parse_limit("often")
+
+
+def _workers(count, **kwargs):
+    storage = MemoryRateLimitStorage()
+    return [RateLimiter(storage, **kwargs) for _ in range(count)]
+
+
+def test_workers_never_exceed_the_shared_limit():
+    workers = _workers(4)
+    allowed = sum(workers[i % 4].hit("client", "50 per hour").allowed for i in range(200))
+    assert allowed == 50
+
+
+def test_client_spread_over_workers_is_barely_under_admitted():
+    rng = random.Random(7)
+    workers = _workers(8)
+    allowed = sum(rng.choice(workers).hit("client", "100 per hour").allowed
+                  for _ in range(300))
+    assert 95 <= allowed <= 100
+
+
+def test_remaining_reflects_the_shared_window():
+    first, second = _workers(2)
+    remaining = [first.hit("client", "100 per hour").remaining for _ in range(5)]
+    assert remaining == [99, 98, 97, 96, 95]
+
+    assert second.hit("client", "100 per hour").remaining <= 94
+
+
+def test_busy_worker_claims_bigger_batches():
+    class CountingStorage(MemoryRateLimitStorage):
+        calls = 0
+
+        def incr(self, key, amount, expiry):
+            self.calls += 1
+            return super().incr(key, amount, expiry)
+
+    storage = CountingStorage()
+    limiter = RateLimiter(storage, lease_size=10)
+    for _ in range(100):
+        assert limiter.hit("client", "1000 per hour").allowed
+    assert storage.calls < 20
+
+
+def test_keys_and_limits_are_independent():
+    limiter, = _workers(1)
+    assert [limiter.hit("a", "2 per minute").allowed for _ in range(3)] == [True, True, False]
+    assert limiter.hit("b", "2 per minute").allowed
+    assert limiter.hit("a", "5 per minute").allowed
+
+
+def test_storage_outage_fails_open():
+    class BrokenStorage:
+        def incr(self, key, amount, expiry):
+            raise ConnectionError("down")
+
+    result = RateLimiter(BrokenStorage()).hit("client", "1 per minute")
+    assert result.allowed and result.remaining == 1
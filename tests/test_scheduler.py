@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.client.circuit_breaker import CircuitBreaker
+from src.client.github_client import AsyncGitHubClient
+from src.client.scheduler import Priority, RequestScheduler, request_priority
+from src.exceptions import CircuitOpenError
+
+
+def _queue(scheduler, priority, count):
+    return [asyncio.ensure_future(scheduler._acquire(priority)) for _ in range(count)]
+
+
+async def _cancel(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_slots_are_shared_by_weight():
+    scheduler = RequestScheduler(max_concurrency=1, recheck_interval=0.01)
+    order = []
+
+    async def request(priority):
+        async with scheduler.slot(priority):
+            order.append(priority)
+            await asyncio.sleep(0)
+
+    async def run():
+        async with scheduler.slot(Priority.INTERACTIVE):
+            tasks = [asyncio.ensure_future(request(p))
+                     for p in [Priority.BULK] * 4 + [Priority.INTERACTIVE] * 4]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    # Weights 8:2, so BULK gets one slot in five while both are queued
+    assert order[:5].count(Priority.INTERACTIVE) == 4
+    assert order[5:] == [Priority.BULK] * 3
+
+
+def test_quota_blocked_is_counted_once_per_request():
+    scheduler = RequestScheduler(max_concurrency=4, recheck_interval=0.01)
+    scheduler.update_quota(remaining=5, limit=100, reset=time.time() + 3600)
+
+    async def run():
+        tasks = _queue(scheduler, Priority.BULK, 3)
+        await asyncio.sleep(0.1)  # several rechecks
+        blocked = scheduler.snapshot()["classes"]["bulk"]
+        await _cancel(tasks)
+        return blocked
+
+    bulk = asyncio.run(run())
+    assert bulk["queued"] == 3
+    assert bulk["quota_blocked"] == 3
+
+
+def test_preempted_is_counted_once_per_request():
+    scheduler = RequestScheduler(max_concurrency=4, latency_slo=1.0, recheck_interval=0.01)
+    now = time.monotonic()
+    scheduler._interactive.extend((now, 5.0) for _ in range(5))
+
+    async def run():
+        tasks = _queue(scheduler, Priority.PREFETCH, 2)
+        await asyncio.sleep(0.1)
+        prefetch = scheduler.snapshot()["classes"]["prefetch"]
+        await _cancel(tasks)
+        return prefetch
+
+    prefetch = asyncio.run(run())
+    assert prefetch["queued"] == 2
+    assert prefetch["preempted"] == 2
+
+
+def test_breaker_is_checked_once_the_slot_is_granted():
+    scheduler = RequestScheduler(max_concurrency=1, recheck_interval=0.01)
+    breaker = CircuitBreaker(consecutive_failures=1, open_seconds=60)
+    sent = []
+
+    def handler(request):
+        sent.append(request.url.path)
+        return httpx.Response(200, json={"login": "octocat"})
+
+    client = AsyncGitHubClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                               breaker=breaker, scheduler=scheduler)
+
+    async def run():
+        async with scheduler.slot(Priority.INTERACTIVE):
+            with request_priority(Priority.INTERACTIVE):
+                queued = asyncio.ensure_future(client.get_user_profile("octocat"))
+            await asyncio.sleep(0.02)
+            breaker.record_failure("GitHub is down")
+        with pytest.raises(CircuitOpenError):
+            await queued
+        await client.aclose()
+
+    asyncio.run(run())
+    assert sent == []
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from backend import sharding
+from backend.sharding import FORWARDED_HEADER, Cluster
+
+
+NODES = ["http://node-a", "http://node-b", "http://node-c"]
+
+
+def _user_owned_by(cluster, node):
+    return next(f"user{i}" for i in range(1000) if cluster.owner(f"user{i}") == node)
+
+
+def test_single_node_is_disabled():
+    assert not Cluster("http://node-a", ["http://node-a"]).enabled
+    assert not Cluster("", NODES).enabled
+
+
+def test_remote_owner_for_sharded_paths_only():
+    cluster = Cluster("http://node-a", NODES, secret="s" * 16)
+    remote = _user_owned_by(cluster, "http://node-b")
+    local = _user_owned_by(cluster, "http://node-a")
+
+    assert cluster.remote_owner(f"/api/v1/analytics/profile/{remote}", {}) == "http://node-b"
+    assert cluster.remote_owner(f"/api/v1/analytics/profile/{local}", {}) is None
+    assert cluster.remote_owner("/api/v1/analytics/leaderboard", {}) is None
+
+
+def test_owner_ignores_username_case():
+    cluster = Cluster("http://node-a", NODES)
+    assert cluster.owner("OctoCat") == cluster.owner("octocat")
+
+
+def test_forwarded_requests_are_served_locally():
+    cluster = Cluster("http://node-a", NODES, secret="s" * 16)
+    peer = Cluster("http://node-b", NODES, secret="s" * 16)
+    stranger = Cluster("http://node-b", NODES, secret="t" * 16)
+    remote = _user_owned_by(cluster, "http://node-b")
+    path = f"/api/v1/analytics/profile/{remote}"
+
+    assert cluster.is_forwarded({FORWARDED_HEADER: peer.token})
+    assert cluster.remote_owner(path, {FORWARDED_HEADER.lower(): peer.token}) is None
+    assert not cluster.is_forwarded({FORWARDED_HEADER: stranger.token})
+    assert cluster.remote_owner(path, {FORWARDED_HEADER: stranger.token}) == "http://node-b"
+
+
+def test_nodes_file_changes_membership(tmp_path):
+    nodes_file = tmp_path / "nodes.txt"
+    nodes_file.write_text("\n".join(NODES[:2]) + "\n")
+    cluster = Cluster("http://node-a", NODES[:2], nodes_file=str(nodes_file))
+    assert cluster.enabled
+    before = {f"user{i}": cluster.owner(f"user{i}") for i in range(1000)}
+
+    nodes_file.write_text("# comment\n" + "\n".join(NODES) + "\n")
+    cluster._checked_at = 0.0
+    assert cluster.enabled
+
+    assert cluster.ring.nodes == NODES
+    for user, owner in before.items():
+        assert cluster.owner(user) in (owner, "http://node-c")
+
+
+def test_remote_profile_is_none_for_own_users():
+    cluster = Cluster("http://node-a", NODES)
+    local = _user_owned_by(cluster, "http://node-a")
+    assert asyncio.run(cluster.remote_profile(local, frozenset())) is None
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_rankings_are_labelled_per_shard(monkeypatch, enabled):
+    from backend.routes import handlers
+
+    nodes = NODES if enabled else NODES[:1]
+    cluster = Cluster("http://node-a", nodes)
+    monkeypatch.setattr(handlers, "get_cluster", lambda: cluster)
+
+    payload, status = handlers.leaderboard({})
+
+    assert status == 200
+    if enabled:
+        assert payload["scope"] == "shard"
+        assert payload["shard"] == "http://node-a"
+    else:
+        assert "scope" not in payload
+
+
+def test_get_cluster_reads_settings():
+    sharding.get_cluster.cache_clear()
+    assert not sharding.get_cluster().enabled
@@ -0,0 +1,29 @@
+import importlib.util
+import os
+
+import pytest
+
+_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "scripts", "check_startup.py")
+_spec = importlib.util.spec_from_file_location("check_startup", _SCRIPT)
+check_startup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_startup)
+
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 1000))
+
+
+@pytest.fixture(scope="module")
+def startup():
+    """Best of three cold starts, each in a fresh interpreter"""
+    runs = [check_startup.measure() for _ in range(3)]
+    return min(runs, key=lambda r: r["import_ms"] + r["boot_ms"])
+
+
+def test_import_and_boot_fit_the_budget(startup):
+    total = startup["import_ms"] + startup["boot_ms"]
+    assert total <= BUDGET_MS, f"startup took {total:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_request_time_modules_stay_lazy(startup):
+    eager = [m for m in check_startup.LAZY_MODULES if m in startup["modules"]]
+    assert eager == []
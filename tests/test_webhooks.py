@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from src.client.github_client import github_cache_key, user_repos_endpoint
+from src.services.comparison_service import profile_cache_key
+from src.services.webhooks import WebhookProcessor, verify_signature
+from src.utils.cache import MemoryCache
+
+
+SECRET = "webhook-secret"
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_verify_signature():
+    body = b'{"zen": "Keep it logically awesome."}'
+    assert verify_signature(SECRET, body, _sign(body))
+    assert not verify_signature(SECRET, body + b" ", _sign(body))
+    assert not verify_signature(SECRET, body, _sign(body, "other-secret"))
+    assert not verify_signature(SECRET, body, _sign(body)[len("sha256="):])
+    assert not verify_signature("", body, _sign(body, ""))
+    assert not verify_signature(SECRET, body, None)
+
+
+def _repo(name, updated_at, stars=0, repo_id=None):
+    return {"id": repo_id or hash(name) % 10**6, "name": name, "updated_at": updated_at,
+            "stargazers_count": stars}
+
+
+def _star(name, updated_at, stars, repo_id=None):
+    repo = _repo(name, updated_at, stars, repo_id)
+    repo["owner"] = {"login": "octocat"}
+    return {"action": "created", "repository": repo}
+
+
+@pytest.fixture
+def caches():
+    return MemoryCache(), MemoryCache()
+
+
+def _listing_key(page=1):
+    return github_cache_key(user_repos_endpoint("octocat", page))
+
+
+def test_patch_copies_the_listing_keeps_its_ttl_and_resorts(caches):
+    github_cache, profile_cache = caches
+    listing = [_repo("newest", "2026-10-02T00:00:00Z"), _repo("older", "2026-09-01T00:00:00Z")]
+
+    async def run():
+        await github_cache.set(_listing_key(), listing, ttl=100)
+        await profile_cache.set(profile_cache_key("octocat"), {"data": {}}, ttl=100)
+        held = await github_cache.get(_listing_key())
+        result = await WebhookProcessor(github_cache, profile_cache).handle(
+            "star", _star("older", "2026-10-19T00:00:00Z", 5, listing[1]["id"]))
+        return held, result, await github_cache.get(_listing_key()), \
+            await github_cache.ttl(_listing_key()), await profile_cache.get(
+                profile_cache_key("octocat"))
+
+    held, result, patched, ttl, profile = asyncio.run(run())
+
+    assert [r["name"] for r in held] == ["newest", "older"]
+    assert held[1]["stargazers_count"] == 0
+    assert [r["name"] for r in patched] == ["older", "newest"]
+    assert patched[0]["stargazers_count"] == 5
+    assert ttl <= 100
+    assert result["updated"] == [user_repos_endpoint("octocat")]
+    assert profile is None
+    assert profile_cache_key("octocat") in result["invalidated"]
+
+
+def test_repository_moving_to_an_earlier_page_drops_the_listing(caches):
+    github_cache, profile_cache = caches
+    page1 = [_repo(f"repo-{i}", "2026-10-01T00:00:00Z") for i in range(100)]
+    page2 = [_repo("stale", "2026-01-01T00:00:00Z")]
+
+    async def run():
+        await github_cache.set(_listing_key(1), page1, ttl=100)
+        await github_cache.set(_listing_key(2), page2, ttl=100)
+        result = await WebhookProcessor(github_cache, profile_cache).handle(
+            "star", _star("stale", "2026-10-19T00:00:00Z", 1, page2[0]["id"]))
+        return result, await github_cache.get(_listing_key(1)), \
+            await github_cache.get(_listing_key(2))
+
+    result, first, second = asyncio.run(run())
+
+    assert first is None and second is None
+    assert result["updated"] == []
+
+
+def test_unknown_events_are_acknowledged(caches):
+    result = asyncio.run(WebhookProcessor(*caches).handle("issues", {"action": "opened"}))
+    assert result["handled"] is False
+
+
+def test_receiver_checks_the_signature(monkeypatch):
+    from backend.routes import handlers
+
+    body = json.dumps({"zen": "Design for failure."}).encode()
+    monkeypatch.setattr(handlers.settings, "GITHUB_WEBHOOK_SECRET", "")
+    assert asyncio.run(handlers.github_webhook({}, body))[1] == 503
+
+    monkeypatch.setattr(handlers.settings, "GITHUB_WEBHOOK_SECRET", SECRET)
+    headers = {"x-github-event": "ping", "x-hub-signature-256": _sign(body, "wrong")}
+    assert asyncio.run(handlers.github_webhook(headers, body))[1] == 401
+
+    headers["x-hub-signature-256"] = _sign(body)
+    payload, status = asyncio.run(handlers.github_webhook(headers, body))
+    assert status == 200 and payload["event"] == "ping"